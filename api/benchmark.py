@@ -0,0 +1,191 @@
+"""Benchmark hot endpoints against generated datasets and catch regressions.
+
+Each scale's dataset is built once with ``generate_dataset`` (and reused,
+migrated to the current schema, while its end date is today), then every
+endpoint in ``ENDPOINTS`` is called through the ASGI app in-process. p50/p95
+latency and the query count from ``X-DB-Queries`` are compared with the stored
+baseline:
+
+    python benchmark.py --update-baseline          # record on a quiet machine
+    python benchmark.py                            # exit 1 on regressions
+    python benchmark.py --scales small medium large --threshold 0.5
+
+An endpoint regresses when its p95 exceeds the baseline by more than
+``--threshold`` (plus ``--slack-ms``, so sub-millisecond endpoints don't
+flap), or when it runs more queries than before. An endpoint or scale
+missing from the baseline fails too, so the check can't pass vacuously.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from cache import response_cache
+from database import (
+    SQLITE_PROFILES, apply_storage_profile, engine_options, get_db, get_read_db, sqlite_pragmas, track_engine, upgrade_db,
+)
+from generate_dataset import SCALES, generate
+from main import app
+
+ENDPOINTS = [
+    "/api/overview/",
+    "/api/habits/stats",
+    "/api/habits/streaks",
+    "/api/habits/heatmap",
+    "/api/fitness/stats",
+    "/api/finance/summary",
+    "/api/finance/trends",
+    "/api/sleep/score",
+    "/api/sleep/stats/weekly",
+    "/api/nutrition/trends",
+    "/api/goals/stats",
+    "/api/subscriptions/stats",
+    "/api/inventory/",
+    "/api/inventory/stats",
+    "/api/search/?q=coffee",
+    # List endpoints
+    "/api/tasks/",
+    "/api/finance/transactions",
+    "/api/nutrition/",
+    "/api/goals/",
+    "/api/subscriptions/",
+    "/api/habits/",
+    "/api/fitness/workouts",
+    "/api/sleep/",
+    "/api/daily/",
+]
+
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+
+def dataset(scale: str, data_dir: Path) -> str:
+    """URL of the scale's dataset, generating it on first use."""
+    end = date.today()
+    path = data_dir / f"{scale}-{end.isoformat()}.db"
+    if not path.exists():
+        print(f"Generating {scale} dataset into {path} ...")
+        data_dir.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        bind = create_engine(f"sqlite:///{partial}")
+        upgrade_db(bind)
+        generate(bind, SCALES[scale], end=end)
+        bind.dispose()
+        partial.rename(path)
+    else:
+        # Bring a dataset generated by an older build up to the current schema
+        bind = create_engine(f"sqlite:///{path}")
+        upgrade_db(bind)
+        bind.dispose()
+    return f"sqlite+aiosqlite:///{path}"
+
+
+async def measure(client: httpx.AsyncClient, path: str, iterations: int, warmup: int) -> dict:
+    latencies, queries = [], 0
+    for i in range(warmup + iterations):
+        response_cache.clear()  # measure the computation, not a cache hit
+        start = time.perf_counter()
+        response = await client.get(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+        if i >= warmup:
+            latencies.append(elapsed)
+            queries = max(queries, int(response.headers.get("x-db-queries", 0)))
+    cuts = statistics.quantiles(latencies, n=20, method="inclusive")
+    return {"p50_ms": round(statistics.median(latencies), 2), "p95_ms": round(cuts[18], 2), "queries": queries}
+
+
+async def run_scale(url: str, iterations: int, warmup: int, profile: str) -> dict:
+    bench_engine = create_async_engine(url, **engine_options(url))
+    apply_storage_profile(bench_engine.sync_engine, sqlite_pragmas(profile, os.getenv("SQLITE_PRAGMAS", "")))
+    track_engine(bench_engine.sync_engine)
+    sessions = async_sessionmaker(bind=bench_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async def get_bench_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = get_bench_db
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return {path: await measure(client, path, iterations, warmup) for path in ENDPOINTS}
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await bench_engine.dispose()
+
+
+def compare(results: dict, baseline: dict, threshold: float, slack_ms: float) -> list[str]:
+    regressions = []
+    for scale, endpoints in results.items():
+        for path, now in endpoints.items():
+            before = baseline.get(scale, {}).get(path)
+            if before is None:
+                regressions.append(f"{scale} {path}: no baseline (record one with --update-baseline)")
+                continue
+            limit = before["p95_ms"] * (1 + threshold) + slack_ms
+            if now["p95_ms"] > limit:
+                regressions.append(f"{scale} {path}: p95 {now['p95_ms']}ms > {limit:.2f}ms (baseline {before['p95_ms']}ms)")
+            if now["queries"] > before["queries"]:
+                regressions.append(f"{scale} {path}: {now['queries']} queries (baseline {before['queries']})")
+    return regressions
+
+
+def report(results: dict, baseline: dict):
+    for scale, endpoints in results.items():
+        print(f"\n{scale}")
+        print(f"  {'endpoint':<32} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'Δp95':>8}")
+        for path, now in endpoints.items():
+            before = baseline.get(scale, {}).get(path)
+            change = f"{(now['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%" if before and before["p95_ms"] else ""
+            print(f"  {path:<32} {now['p50_ms']:>8} {now['p95_ms']:>8} {now['queries']:>8} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=SCALES, default=["small", "medium"])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p95 slowdown as a fraction (default 0.25)")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="Absolute p95 slack in ms (default 2)")
+    parser.add_argument("--profile", choices=SQLITE_PROFILES, default=os.getenv("SQLITE_PROFILE", "durable"),
+                        help="SQLite storage profile (default: SQLITE_PROFILE or durable)")
+    parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "theseus-bench")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results = {
+        scale: asyncio.run(run_scale(dataset(scale, args.data_dir), args.iterations, args.warmup, args.profile))
+        for scale in args.scales
+    }
+    report(results, baseline)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"\n✅ Baseline written to {args.baseline}")
+        return
+    regressions = compare(results, baseline, args.threshold, args.slack_ms)
+    if regressions:
+        print("\n❌ Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Write-invalidated cache for computed responses (stats, charts, summaries).
+
+Read endpoints opt in with ``@cached("sleep")`` and write handlers declare
+what they change with ``@invalidates("sleep")``. A cached response is stored
+as its JSON body, keyed by endpoint, parameters and today's date (so "last 7
+days" views roll over at midnight), and served without touching the database
+until a write to one of its views clears it. Entries are evicted least
+recently used once the cache holds ``RESPONSE_CACHE_MAX_BYTES`` of bodies.
+
+The cache lives in the worker process, so with several uvicorn workers a write
+only clears the worker that served it. Keys therefore also carry the router's
+``table_versions`` ETag (see ``etags.versioned``): a write through any worker
+or process bumps those counters, and the other workers' entries simply stop
+matching and age out. ``RESPONSE_CACHE_TTL`` can still bound an entry's
+lifetime (``RESPONSE_CACHE_MAX_BYTES=0`` disables the cache).
+"""
+
+import json
+import os
+import time
+from collections import Counter, OrderedDict
+from datetime import date
+from functools import wraps
+from typing import Optional
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from etags import table_versions_tag
+
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+TTL = float(os.getenv("RESPONSE_CACHE_TTL", "0"))  # seconds; 0 = until invalidated or the tables change
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int = MAX_BYTES, ttl: float = TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries: OrderedDict[tuple, tuple[bytes, tuple[str, ...], float]] = OrderedDict()
+        self.size = 0
+        # Bumped on every invalidation, so a read that raced a write can't store stale data
+        self.generations: Counter[str] = Counter()
+        self.hits = self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None or (self.ttl and time.monotonic() - entry[2] > self.ttl):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: tuple, body: bytes, views: tuple[str, ...], generation: tuple[int, ...]):
+        if len(body) > self.max_bytes or generation != self.generation(views):
+            return
+        self._discard(key)
+        self.entries[key] = (body, views, time.monotonic())
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self.entries)))
+
+    def generation(self, views: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(self.generations[view] for view in views)
+
+    def invalidate(self, *views: str):
+        for view in views:
+            self.generations[view] += 1
+        for key in [k for k, (_, entry_views, _) in self.entries.items() if set(entry_views) & set(views)]:
+            self._discard(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def _discard(self, key: tuple):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+
+response_cache = ResponseCache()
+
+
+def cached(*views: str):
+    """Serve the endpoint from the cache until one of ``views`` is invalidated."""
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            if not response_cache.max_bytes:
+                return await endpoint(**kwargs)
+            key = (endpoint.__module__, endpoint.__name__, date.today(), table_versions_tag.get(), _params(kwargs))
+            body = response_cache.get(key)
+            if body is not None:
+                return Response(body, media_type="application/json", headers={"X-Cache": "hit"})
+            generation = response_cache.generation(views)
+            body = _render(await endpoint(**kwargs))
+            response_cache.put(key, body, views, generation)
+            return Response(body, media_type="application/json", headers={"X-Cache": "miss"})
+        return wrapper
+    return decorator
+
+
+def invalidates(*views: str):
+    """Clear cached responses for ``views`` once the write handler has run."""
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            try:
+                return await endpoint(**kwargs)
+            finally:
+                response_cache.invalidate(*views)
+        return wrapper
+    return decorator
+
+
+def _render(content) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _params(kwargs: dict) -> tuple:
+    return tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(kwargs.items())
+        if not isinstance(value, AsyncSession)
+    )
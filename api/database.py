@@ -1,29 +1,343 @@
-"""Database setup — SQLite for dev, PostgreSQL for prod."""
+"""Database setup — SQLite for dev, PostgreSQL for prod.
 
+Request handlers use the async engine via ``get_db``, or ``get_read_db`` when
+they only read (a replica or read-only SQLite connections); the sync engine is
+kept for schema migrations and standalone scripts (seeding, maintenance).
+
+All engines report every statement to the ``QueryStats`` of the current
+request, if one is being tracked (see ``instrumentation.py``).
+"""
+
+import logging
 import os
-from sqlalchemy import create_engine
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+logger = logging.getLogger("theseus.db")
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./theseus.db")
 
-# SQLite needs check_same_thread=False
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgresql+psycopg2:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+
+# PRAGMAs run on every new SQLite connection. Both profiles use WAL, so
+# readers never block the writer (or vice versa). "durable" still fsyncs on
+# every commit; "fast" syncs only at checkpoints, so a power cut can lose the
+# last few commits (never corrupt the file) in exchange for much cheaper
+# small writes, and gives the page cache and mmap more room.
+SQLITE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL", "synchronous": "FULL", "cache_size": -16000,  # KiB
+        "mmap_size": 0, "temp_store": "MEMORY", "busy_timeout": 5000,  # ms
+    },
+    "fast": {
+        "journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536,
+        "mmap_size": 256 * 1024 * 1024, "temp_store": "MEMORY", "busy_timeout": 5000,
+    },
+}
+
+
+def sqlite_pragmas(profile: str, overrides: str = "") -> dict:
+    """The profile's PRAGMAs, with ``name=value,...`` overrides applied."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE {profile!r}; expected one of {', '.join(SQLITE_PROFILES)}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for item in filter(None, (part.strip() for part in overrides.split(","))):
+        name, _, value = item.partition("=")
+        pragmas[name.strip()] = value.strip()
+    return pragmas
+
+
+SQLITE_PRAGMAS = sqlite_pragmas(os.getenv("SQLITE_PROFILE", "durable"), os.getenv("SQLITE_PRAGMAS", ""))
+
+
+def apply_storage_profile(bind, pragmas: Optional[dict] = None):
+    """Run ``pragmas`` (default: the configured profile) on each new connection of a SQLite engine."""
+    if bind.dialect.name != "sqlite":
+        return
+    statements = [f"PRAGMA {name} = {value}" for name, value in (pragmas or SQLITE_PRAGMAS).items()]
+
+    @event.listens_for(bind, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+# Pool settings. Each worker process holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections for requests plus SYNC_POOL_SIZE for startup and scripts; see
+# check_connection_budget(). SQLite files use the size, overflow and timeout.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds; stay under server/proxy idle timeouts
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0 disables
+# asyncpg prepares each distinct statement once per connection and reuses it.
+# Set to 0 behind PgBouncer in transaction mode, which can't keep them.
+DB_PREPARED_STATEMENT_CACHE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE", "100"))
+SYNC_POOL_SIZE = 1
+
+
+def engine_options(url: str, pool_size: int = DB_POOL_SIZE, max_overflow: int = DB_MAX_OVERFLOW) -> dict:
+    """``create_engine``/``create_async_engine`` keyword arguments for ``url``."""
+    if url.startswith("sqlite"):
+        if "aiosqlite" not in url:
+            # SQLite needs check_same_thread=False
+            return {"connect_args": {"check_same_thread": False}}
+        if make_url(url).database in (None, "", ":memory:"):
+            return {}
+        # aiosqlite defaults to NullPool, which would reopen the file and rerun the
+        # storage profile's PRAGMAs per request; cache_size and mmap_size only last
+        # as long as the connection, so keep connections open
+        return {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    elif url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def _async_engine_url(url: str):
+    parsed = make_url(url)
+    if parsed.drivername == "postgresql+asyncpg" and "prepared_statement_cache_size" not in parsed.query:
+        parsed = parsed.update_query_dict({"prepared_statement_cache_size": str(DB_PREPARED_STATEMENT_CACHE)})
+    return parsed
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, SYNC_POOL_SIZE, 0))
+async_engine = create_async_engine(_async_engine_url(ASYNC_DATABASE_URL), **engine_options(ASYNC_DATABASE_URL))
+apply_storage_profile(engine)
+apply_storage_profile(async_engine.sync_engine)
+
+# Pure-read endpoints use get_read_db. DATABASE_READ_URL points it at a
+# replica; without one, SQLite reads get their own query_only connections to
+# the same WAL file (readers never block the writer), and other databases
+# read from the primary.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+# After a write, that client's reads stay on the primary this long, so a
+# lagging replica can't hide what it just saved (see ReadYourWritesMiddleware).
+# Replicas only: SQLite read connections share the primary's file.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+LAST_WRITE_COOKIE = "theseus_last_write"
+
+
+def _create_read_engine():
+    if DATABASE_READ_URL:
+        url = _async_url(DATABASE_READ_URL)
+    elif async_engine.dialect.name == "sqlite" and make_url(ASYNC_DATABASE_URL).database not in (None, "", ":memory:"):
+        url = ASYNC_DATABASE_URL
+    else:
+        return async_engine
+    bind = create_async_engine(_async_engine_url(url), **engine_options(url))
+    apply_storage_profile(bind.sync_engine, {**SQLITE_PRAGMAS, "query_only": "ON"})
+    return bind
+
+
+read_engine = _create_read_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False so committed objects can still be serialized without
+# triggering lazy loads (which are not allowed on an AsyncSession).
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+class QueryStats:
+    """Statements run (and time spent in the database) while tracking is on."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.statements: Counter[str] = Counter()
+
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if query_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats.get()
+    if stats is not None and conn.info.get("query_start"):
+        stats.duration += time.perf_counter() - conn.info["query_start"].pop()
+        stats.count += 1
+        stats.statements[statement] += 1
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+def track_engine(bind):
+    """Report statements run on ``bind`` (a sync Engine) to ``query_stats``."""
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+    event.listen(bind, "handle_error", _handle_error)
+
+
+for _engine in {engine, async_engine.sync_engine, read_engine.sync_engine}:
+    track_engine(_engine)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+async def get_read_db(request: Request):
+    """Session for endpoints that only read: the read engine, unless this client just wrote (replicas only)."""
+    sessions = AsyncSessionLocal if DATABASE_READ_URL and _wrote_recently(request) else ReadSessionLocal
+    async with sessions() as db:
+        yield db
+
+
+def _wrote_recently(request: Request) -> bool:
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < READ_YOUR_WRITES_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote, so ``get_read_db`` keeps their reads on the primary.
+
+    Only needed with a replica (DATABASE_READ_URL); SQLite read connections
+    see every commit to the same file straight away.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.max_age = max(1, int(READ_YOUR_WRITES_SECONDS + 0.999))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            return await self.app(scope, receive, send)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+# Apply pending schema revisions on startup. Off by default outside SQLite:
+# there, run `python init_db.py` once before rolling out new workers.
+DB_AUTO_MIGRATE = os.getenv(
+    "DB_AUTO_MIGRATE", "true" if DATABASE_URL.startswith("sqlite") else "false"
+).lower() in ("1", "true", "yes")
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_db(bind=None, revision: str = "head"):
+    """Apply Alembic revisions up to ``revision``."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        command.upgrade(alembic_config(conn), revision)
+
+
+def schema_revision(conn) -> Optional[str]:
+    """The revision stored in ``alembic_version`` (None before the first upgrade)."""
+    return MigrationContext.configure(conn).get_current_revision()
+
+
+def init_db(bind=None):
+    """Check on startup that the schema is at this build's revision.
+
+    Reads the one stored revision instead of reflecting the schema. Pending
+    revisions are applied when DB_AUTO_MIGRATE is on; otherwise startup fails.
+    """
+    bind = bind or engine
+    with bind.connect() as conn:
+        current = schema_revision(conn)
+        if conn.dialect.name == "postgresql":
+            check_connection_budget(conn)
+    scripts = ScriptDirectory.from_config(alembic_config())
+    head = scripts.get_current_head()
+    if current == head:
+        return
+    if current is not None and current not in {script.revision for script in scripts.walk_revisions()}:
+        # Upgraded by a newer build that is rolling out; its revisions must keep older workers running
+        logger.warning("Database schema is at revision %s, newer than this build's %s", current, head)
+        return
+    if not DB_AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at revision {current or '(none)'} but this build needs {head}; "
+            "run `python init_db.py` to upgrade it"
+        )
+    upgrade_db(bind)
+
+
+def check_connection_budget(conn, workers: Optional[int] = None) -> int:
+    """Warn when every worker's full pools would exceed the server's connection limit.
+
+    ``workers`` defaults to WEB_CONCURRENCY (what ``uvicorn --workers`` reads).
+    Returns the number of connections the deployment can open.
+    """
+    workers = workers or int(os.getenv("WEB_CONCURRENCY", "1"))
+    needed = workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW + SYNC_POOL_SIZE)
+    available = int(conn.scalar(text("SHOW max_connections"))) - int(
+        conn.scalar(text("SHOW superuser_reserved_connections"))
+    )
+    if needed > available:
+        logger.warning(
+            "%d workers x (pool %d + overflow %d + %d) = %d connections, but the server allows %d; "
+            "lower DB_POOL_SIZE/DB_MAX_OVERFLOW or the worker count",
+            workers, DB_POOL_SIZE, DB_MAX_OVERFLOW, SYNC_POOL_SIZE, needed, available,
+        )
+    return needed
@@ -0,0 +1,127 @@
+"""Conditional GETs: strong ETags from per-table write counters.
+
+``table_versions`` holds one counter per table, bumped by triggers on every
+insert, update and delete (bulk Core writes and other processes included).
+A router declares the tables its responses are built from:
+
+    router = APIRouter(dependencies=[Depends(versioned(SleepEntry, SleepSettings))])
+
+Before a GET handler runs, the dependency reads those counters in one
+primary-key lookup (on the handler's ``get_read_db`` session, so tag and body
+come from the same database) and hashes them, with today's date, into the ETag. A
+matching ``If-None-Match`` is answered with 304 straight away; otherwise
+``ETagMiddleware`` attaches the tag to the 200 response. The tag is also left
+in ``table_versions_tag`` for the handler, so ``@cached`` responses are keyed
+to the same counters every worker sees.
+"""
+
+import hashlib
+from contextvars import ContextVar
+from datetime import date
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import text, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_read_db
+
+UNTRACKED = {"alembic_version", "search_index", "table_versions"}
+
+# ETag of the current GET, set by ``versioned`` before the handler runs
+table_versions_tag: ContextVar[Optional[str]] = ContextVar("table_versions_tag", default=None)
+
+
+def create_table_versions(conn, tables=None):
+    """Create ``table_versions`` and its triggers (idempotent).
+
+    ``tables`` names the tables to track, by default every model table.
+    """
+    if tables is None:
+        import models  # noqa: F401 — registers every table on Base.metadata
+        from database import Base
+
+        tables = Base.metadata.tables
+    dialect = conn.dialect.name
+    tables = sorted(t for t in tables if t not in UNTRACKED)
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS table_versions "
+        "(table_name VARCHAR(100) PRIMARY KEY, version BIGINT NOT NULL DEFAULT 0)"
+    ))
+    existing = set(conn.scalars(text("SELECT table_name FROM table_versions")))
+    missing = [{"table_name": t} for t in tables if t not in existing]
+    if missing:
+        conn.execute(text("INSERT INTO table_versions (table_name, version) VALUES (:table_name, 0)"), missing)
+
+    if dialect == "postgresql":
+        conn.execute(text(
+            "CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$ BEGIN "
+            "UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME; "
+            "RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        for table in tables:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS table_version_{table} ON {table}"))
+            conn.execute(text(
+                f"CREATE TRIGGER table_version_{table} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+                f"ON {table} FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+            ))
+        return
+    # SQLite only has row-level triggers
+    for table in tables:
+        for name, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS table_version_{table}_{name} AFTER {event} ON {table} BEGIN "
+                f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'; END"
+            ))
+
+
+def versioned(*models):
+    """Dependency answering GETs with 304 while ``models``' tables are unchanged."""
+    tables = sorted(model.__tablename__ for model in models)
+    query = text(
+        "SELECT table_name, version FROM table_versions WHERE table_name IN :tables"
+    ).bindparams(bindparam("tables", expanding=True))
+
+    async def check_etag(request: Request, db: AsyncSession = Depends(get_read_db)):
+        if request.method not in ("GET", "HEAD"):
+            return
+        versions = sorted((await db.execute(query, {"tables": tables})).all())
+        digest = hashlib.sha1(f"{date.today()}:{versions}".encode()).hexdigest()[:20]
+        etag = f'"{digest}"'
+        table_versions_tag.set(etag)
+        if_none_match = _parse_if_none_match(request.headers.get("if-none-match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        request.state.etag = etag
+
+    return check_etag
+
+
+def _parse_if_none_match(header: str) -> set[str]:
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+class ETagMiddleware:
+    """Adds the ETag computed by ``versioned`` to successful responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get("etag")
+                if etag:
+                    # no-cache: browsers keep the body but revalidate with If-None-Match every time
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"etag", etag.encode()),
+                        (b"cache-control", b"no-cache"),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
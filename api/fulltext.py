@@ -0,0 +1,133 @@
+"""Full-text search index over tasks, journal, meals, inventory and transactions.
+
+All searchable rows live in one ``search_index`` table — an FTS5 virtual table
+on SQLite, a table with a weighted ``tsvector`` column and GIN index on
+PostgreSQL. Triggers on the source tables keep it in sync on every write,
+including bulk inserts that bypass the ORM. Each row's id is
+``source id * 8 + module number`` so triggers can find it by primary key.
+"""
+
+import re
+from typing import Optional
+from sqlalchemy import text, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# module -> (number, table, title, body, date, columns whose change triggers a reindex)
+SOURCES = {
+    "tasks": (1, "tasks", "{r}.title", "{r}.description", "{r}.created_at", "title, description"),
+    "journal": (2, "daily_notes", "{r}.highlights", "{r}.note", "{r}.date", "highlights, note, date"),
+    "nutrition": (3, "meal_entries", "{r}.description", "NULL", "{r}.date", "description, date"),
+    "inventory": (4, "inventory_items", "{r}.name", "{r}.notes", "{r}.created_at", "name, notes"),
+    "finance": (5, "transactions", "{r}.description", "{r}.category", "{r}.date", "description, category, date"),
+}
+MODULE_SLOTS = 8
+
+HIGHLIGHT = ("<mark>", "</mark>")
+
+
+def _values(module: str, row: str, dialect: str) -> str:
+    number, _, title, body, day, _ = SOURCES[module]
+    day = day.format(r=row)
+    day = f"substr({day}, 1, 10)" if dialect == "sqlite" else f"CAST({day} AS DATE)"
+    return (
+        f"{row}.id * {MODULE_SLOTS} + {number}, '{module}', {row}.id, {day}, "
+        f"{title.format(r=row)}, {body.format(r=row)}"
+    )
+
+
+def _columns(dialect: str) -> str:
+    return f"({'rowid' if dialect == 'sqlite' else 'id'}, module, ref_id, date, title, body)"
+
+
+def create_search_index(conn):
+    """Create the index and its triggers, then fill it from existing rows."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        _create_postgresql(conn)
+    else:
+        _create_sqlite(conn)
+    for module, (_, table, *_rest) in SOURCES.items():
+        conn.execute(text(
+            f"INSERT INTO search_index {_columns(dialect)} SELECT {_values(module, table, dialect)} FROM {table}"
+        ))
+
+
+def _create_sqlite(conn):
+    conn.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "title, body, module UNINDEXED, ref_id UNINDEXED, date UNINDEXED, "
+        "tokenize = 'porter unicode61 remove_diacritics 2')"
+    ))
+    for module, (number, table, *_, columns) in SOURCES.items():
+        delete = f"DELETE FROM search_index WHERE rowid = OLD.id * {MODULE_SLOTS} + {number};"
+        insert = (
+            f"INSERT INTO search_index {_columns('sqlite')} "
+            f"VALUES ({_values(module, 'NEW', 'sqlite')});"
+        )
+        for name, event, body in (
+            ("ai", "AFTER INSERT", insert),
+            ("ad", "AFTER DELETE", delete),
+            ("au", f"AFTER UPDATE OF {columns}", delete + " " + insert),
+        ):
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS search_{table}_{name} {event} ON {table} BEGIN {body} END"
+            ))
+
+
+def _create_postgresql(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS search_index ("
+        "id BIGINT PRIMARY KEY, module VARCHAR(20) NOT NULL, ref_id INTEGER NOT NULL, "
+        "date DATE, title TEXT, body TEXT, "
+        "document tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED)"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING gin (document)"))
+    for module, (number, table, *_, columns) in SOURCES.items():
+        conn.execute(text(
+            f"CREATE OR REPLACE FUNCTION search_index_{table}() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP <> 'INSERT' THEN DELETE FROM search_index WHERE id = OLD.id * {MODULE_SLOTS} + {number}; END IF; "
+            f"IF TG_OP <> 'DELETE' THEN INSERT INTO search_index {_columns('postgresql')} VALUES ({_values(module, 'NEW', 'postgresql')}); END IF; "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS search_index_{table} ON {table}"))
+        conn.execute(text(
+            f"CREATE TRIGGER search_index_{table} AFTER INSERT OR DELETE OR UPDATE OF {columns} "
+            f"ON {table} FOR EACH ROW EXECUTE FUNCTION search_index_{table}()"
+        ))
+
+
+async def search(db: AsyncSession, q: str, modules: Optional[list[str]], limit: int) -> list:
+    """Ranked matches for ``q`` as ``(module, ref_id, date, title, snippet, score)`` rows.
+
+    Every word must match; the last one also matches as a prefix, so results
+    show up while the user is still typing.
+    """
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        query = " & ".join(words) + ":*"
+        sql = (
+            "SELECT module, ref_id, date, title, "
+            f"ts_headline('english', coalesce(nullif(body, ''), title, ''), query, "
+            f"'StartSel={HIGHLIGHT[0]}, StopSel={HIGHLIGHT[1]}, MaxWords=20, MinWords=8') AS snippet, "
+            "ts_rank(document, query) AS score "
+            "FROM search_index, to_tsquery('english', :query) AS query "
+            "WHERE document @@ query"
+        )
+    else:
+        query = " ".join(f'"{w}"' for w in words) + "*"
+        sql = (
+            "SELECT module, ref_id, date, title, "
+            f"snippet(search_index, -1, '{HIGHLIGHT[0]}', '{HIGHLIGHT[1]}', '…', 12) AS snippet, "
+            "-bm25(search_index, 10.0, 1.0) AS score "
+            "FROM search_index WHERE search_index MATCH :query"
+        )
+    params = {"query": query, "limit": limit}
+    statement = text(sql + (" AND module IN :modules" if modules else "") + " ORDER BY score DESC LIMIT :limit")
+    if modules:
+        statement = statement.bindparams(bindparam("modules", expanding=True))
+        params["modules"] = modules
+    return (await db.execute(statement, params)).all()
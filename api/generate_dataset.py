@@ -0,0 +1,449 @@
+"""Generate a synthetic multi-year dataset for load and scale testing.
+
+Fills every table with plausible data ending on ``--end`` (default today):
+daily sleep, notes, meals and water; habits with streaky logs; workouts with
+progressing exercises; transactions at a monthly rate; plus tasks, goals,
+inventory and subscriptions. Output depends only on the options and
+``--seed``, so pass ``--end`` as well to rebuild an identical fixture.
+
+    python generate_dataset.py --scale medium --database sqlite:///./bench.db
+    python generate_dataset.py --scale large --years 5 --transactions-per-month 2000
+
+Rows go in through bulk Core inserts; the target database must be empty.
+"""
+import argparse
+import json
+import random
+import time as timer
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Optional
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from database import DATABASE_URL, upgrade_db
+from etags import create_table_versions
+from fulltext import SOURCES, create_search_index
+from models import (
+    Task, SleepEntry, MealEntry, HabitEntry, DailyNote, InventoryItem, InventoryItemTag,
+    InventoryCategory, Habit, HabitLog, HabitStreak, SleepSettings, UserSettings, WaterIntake,
+    Workout, Exercise, WorkoutTemplate, Transaction, Budget, Goal, Milestone, Subscription,
+)
+from streaks import islands, summarize_islands
+
+BATCH_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class Scale:
+    years: int
+    habits: int
+    transactions_per_month: int
+    workouts_per_week: int
+    tasks: int
+    inventory_items: int
+
+
+SCALES = {
+    "small": Scale(years=1, habits=5, transactions_per_month=40, workouts_per_week=3, tasks=200, inventory_items=60),
+    "medium": Scale(years=3, habits=12, transactions_per_month=300, workouts_per_week=4, tasks=2_000, inventory_items=500),
+    # ~1M rows
+    "large": Scale(years=10, habits=30, transactions_per_month=6_500, workouts_per_week=5, tasks=20_000, inventory_items=5_000),
+}
+
+WORDS = (
+    "walk coffee friends focus deep work read book call family cook dinner rain sun park gym "
+    "project deadline meeting tired calm stressed grateful music movie train city trip plan "
+    "garden clean email doctor bike run swim code write idea lunch weekend morning evening"
+).split()
+MEALS = {
+    "breakfast": ["Oatmeal with berries", "Rye bread with egg", "Skyr and granola", "Smoothie", "Pancakes"],
+    "lunch": ["Chicken salad", "Leftover curry", "Smørrebrød", "Lentil soup", "Burrito bowl", "Sushi"],
+    "dinner": ["Salmon and potatoes", "Pasta bolognese", "Stir fry", "Pizza", "Chili con carne", "Tacos"],
+    "snack": ["Apple", "Protein bar", "Nuts", "Yoghurt", "Banana", "Dark chocolate"],
+}
+HABITS = [
+    ("Meditate", "mind", "🧘"), ("Read 20 pages", "mind", "📚"), ("Workout", "health", "💪"),
+    ("No sugar", "health", "🍎"), ("Journal", "mind", "✍️"), ("Walk 10k steps", "health", "🚶"),
+    ("Deep work block", "productivity", "🎯"), ("Inbox zero", "productivity", "📥"),
+    ("Stretch", "health", "🤸"), ("Learn Danish", "mind", "🇩🇰"), ("Floss", "health", "🦷"),
+    ("No phone in bed", "other", "📵"),
+]
+EXERCISES = {
+    "Squat": 60, "Bench Press": 50, "Deadlift": 80, "Overhead Press": 30, "Barbell Row": 45,
+    "Pull-up": 0, "Lunge": 20, "Romanian Deadlift": 60, "Dip": 0, "Bicep Curl": 12,
+}
+WORKOUTS = {
+    "strength": ["Push day", "Pull day", "Leg day", "Full body"],
+    "cardio": ["Morning run", "Intervals", "Bike commute", "Swim"],
+    "flexibility": ["Yoga", "Mobility"],
+    "other": ["Climbing", "Football"],
+}
+EXPENSES = {  # category -> (weight, typical amount, merchants)
+    "groceries": (30, 250, ["Netto", "Rema 1000", "Føtex", "Lidl"]),
+    "dining": (15, 180, ["Café", "Pizzeria", "Sushi bar", "Wolt"]),
+    "transport": (15, 60, ["DSB", "Rejsekort", "Shell", "Bycyklen"]),
+    "shopping": (10, 400, ["Amazon", "Zalando", "IKEA", "Elgiganten"]),
+    "entertainment": (8, 150, ["Cinema", "Concert", "Steam", "Bar"]),
+    "health": (7, 200, ["Pharmacy", "Gym", "Dentist"]),
+    "utilities": (5, 600, ["Electricity", "Internet", "Water"]),
+    "rent": (1, 9000, ["Rent"]),
+    "other": (9, 120, ["Gift", "Donation", "Misc"]),
+}
+SUBSCRIPTIONS = [
+    ("Netflix", 129, "monthly", "entertainment"), ("Spotify", 109, "monthly", "entertainment"),
+    ("iCloud", 29, "monthly", "tech"), ("Gym", 299, "monthly", "health"),
+    ("Newspaper", 49, "weekly", "news"), ("Domain", 120, "yearly", "tech"),
+    ("GitHub", 40, "monthly", "tech"), ("Insurance", 2400, "yearly", "insurance"),
+    ("Audible", 99, "monthly", "entertainment"), ("VPN", 399, "yearly", "tech"),
+]
+INVENTORY_CATEGORIES = [
+    ("tech", "#8b7cf6"), ("home", "#fbbf24"), ("health", "#4ade80"), ("kitchen", "#f87171"),
+    ("clothing", "#60a5fa"), ("edc", "#94a3b8"), ("other", "#5a5a66"),
+]
+INVENTORY_TAGS = ["gift", "long-term", "sale", "daily", "travel", "upgrade", "replace", "office"]
+GOAL_CATEGORIES = ["health", "career", "finance", "learning", "personal"]
+
+
+class Generator:
+    def __init__(self, scale: Scale, seed: int, end: date):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.end = end
+        self.start = end - timedelta(days=365 * scale.years - 1)
+        self.epoch = datetime.combine(end, time(23, 59))
+
+    def days(self):
+        day = self.start
+        while day <= self.end:
+            yield day
+            day += timedelta(days=1)
+
+    def stamp(self, day: date, earliest: int = 7, latest: int = 23) -> datetime:
+        return datetime.combine(day, time(self.rng.randint(earliest, latest - 1), self.rng.randint(0, 59)))
+
+    def text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize() + "."
+
+    def tables(self):
+        """(model, rows) pairs in insertion order; ``rows`` are lazy iterables."""
+        return [
+            (SleepSettings, [{"id": 1, "target_hours": 8.0}]),
+            (UserSettings, [
+                {"key": "enabled_modules", "value": json.dumps(
+                    ["tasks", "habits", "sleep", "journal", "inventory", "nutrition", "fitness", "finance"])},
+                {"key": "sleep_target_hours", "value": "8"},
+            ]),
+            (SleepEntry, self.sleep()),
+            (DailyNote, self.notes()),
+            (MealEntry, self.meals()),
+            (WaterIntake, self.water()),
+            (Habit, self.habits()),
+            (HabitLog, self.habit_logs()),
+            (HabitEntry, self.habit_entries()),
+            (Workout, self.workouts()),
+            (Exercise, self.exercises()),
+            (WorkoutTemplate, self.workout_templates()),
+            (Transaction, self.transactions()),
+            (Budget, [{"category": c, "monthly_limit": float(amount * weight * 2)}
+                      for c, (weight, amount, _) in EXPENSES.items() if c != "rent"]),
+            (Task, self.tasks()),
+            (Goal, self.goals()),
+            (Milestone, self.milestones()),
+            (Subscription, self.subscriptions()),
+            (InventoryCategory, [{"name": name, "color": color} for name, color in INVENTORY_CATEGORIES]),
+            (InventoryItem, self.inventory()),
+            (InventoryItemTag, self.inventory_tags()),
+        ]
+
+    def sleep(self):
+        rng = self.rng
+        for day in self.days():
+            if rng.random() > 0.92:
+                continue
+            bedtime = datetime.combine(day - timedelta(days=1), time(22)) + timedelta(minutes=rng.randint(0, 180))
+            hours = round(min(max(rng.gauss(7.2, 0.9), 4.0), 10.5), 2)
+            yield {
+                "date": day, "bedtime": bedtime, "wake_time": bedtime + timedelta(hours=hours),
+                "duration_hours": hours, "quality": min(5, max(1, round(hours - 3 + rng.gauss(0, 0.8)))),
+                "notes": self.text(rng.randint(3, 10)) if rng.random() < 0.1 else None,
+                "created_at": self.stamp(day, 7, 10),
+            }
+
+    def notes(self):
+        rng = self.rng
+        for day in self.days():
+            if rng.random() > 0.7:
+                continue
+            yield {
+                "date": day, "mood": rng.randint(1, 5), "energy": rng.randint(1, 5),
+                "note": self.text(rng.randint(8, 60)),
+                "highlights": ", ".join(rng.sample(WORDS, 3)),
+                "created_at": self.stamp(day, 20, 24),
+            }
+
+    def meals(self):
+        rng = self.rng
+        for day in self.days():
+            for meal_type, odds, calories in (("breakfast", 0.8, 450), ("lunch", 0.9, 650),
+                                               ("dinner", 0.95, 800), ("snack", 0.6, 200)):
+                if rng.random() > odds:
+                    continue
+                kcal = int(rng.gauss(calories, calories / 5))
+                yield {
+                    "date": day, "meal_type": meal_type, "description": rng.choice(MEALS[meal_type]),
+                    "calories": kcal, "protein_g": round(kcal * rng.uniform(0.03, 0.08), 1),
+                    "carbs_g": round(kcal * rng.uniform(0.08, 0.14), 1),
+                    "fat_g": round(kcal * rng.uniform(0.02, 0.05), 1),
+                    "created_at": self.stamp(day),
+                }
+
+    def water(self):
+        for day in self.days():
+            if self.rng.random() < 0.85:
+                yield {"date": day, "glasses": self.rng.randint(2, 12), "target": 8,
+                       "created_at": self.stamp(day, 20, 24)}
+
+    def habits(self):
+        for i in range(self.scale.habits):
+            name, category, icon = HABITS[i % len(HABITS)]
+            if i >= len(HABITS):
+                name = f"{name} #{i // len(HABITS) + 1}"
+            started = self.start + timedelta(days=self.rng.randint(0, 365 * self.scale.years // 3))
+            yield {
+                "id": i + 1, "name": name, "category": category, "icon": icon, "target_frequency": "daily",
+                "active": self.rng.random() < 0.9, "created_at": datetime.combine(started, time(9)),
+            }
+
+    def habit_logs(self):
+        # Per-habit two-state Markov chain, so completions come in streaks
+        rng = self.rng
+        for habit_id in range(1, self.scale.habits + 1):
+            keep, recover = rng.uniform(0.8, 0.97), rng.uniform(0.2, 0.6)
+            done = True
+            for day in self.days():
+                done = rng.random() < (keep if done else recover)
+                if done or rng.random() < 0.05:  # unticked habits sometimes leave a row behind
+                    yield {"habit_id": habit_id, "date": day, "completed": done,
+                           "value": None, "created_at": self.stamp(day)}
+
+    def habit_entries(self):
+        for day in self.days():
+            if self.rng.random() < 0.5:
+                yield {"habit_name": "steps", "date": day, "completed": True,
+                       "value": float(self.rng.randint(2_000, 18_000)), "created_at": self.stamp(day, 21, 24)}
+
+    def workouts(self):
+        rng = self.rng
+        self._workouts = []
+        for week_start in range(0, (self.end - self.start).days + 1, 7):
+            for offset in sorted(rng.sample(range(7), min(self.scale.workouts_per_week, 7))):
+                day = self.start + timedelta(days=week_start + offset)
+                if day > self.end:
+                    continue
+                workout_type = rng.choices(list(WORKOUTS), weights=[5, 3, 1, 1])[0]
+                self._workouts.append((day, workout_type))
+                yield {
+                    "id": len(self._workouts), "date": day, "workout_type": workout_type,
+                    "name": rng.choice(WORKOUTS[workout_type]), "duration_minutes": rng.randint(20, 90),
+                    "notes": self.text(rng.randint(3, 8)) if rng.random() < 0.2 else None,
+                    "created_at": self.stamp(day),
+                }
+
+    def exercises(self):
+        # Weights progress over the whole period so exercise history has a trend
+        rng, total_days = self.rng, (self.end - self.start).days or 1
+        for workout_id, (day, workout_type) in enumerate(self._workouts, start=1):
+            if workout_type != "strength":
+                continue
+            progress = 1 + 0.5 * (day - self.start).days / total_days
+            for name in rng.sample(list(EXERCISES), rng.randint(3, 6)):
+                base = EXERCISES[name]
+                yield {
+                    "workout_id": workout_id, "name": name, "sets": rng.randint(3, 5), "reps": rng.choice([5, 8, 10, 12]),
+                    "weight": round(base * progress * rng.uniform(0.9, 1.1) / 2.5) * 2.5 if base else None,
+                    "created_at": self.stamp(day),
+                }
+
+    def workout_templates(self):
+        for workout_type, names in WORKOUTS.items():
+            exercises = [{"name": n, "sets": 3, "reps": 8} for n in list(EXERCISES)[:4]] if workout_type == "strength" else []
+            yield {"name": names[0], "workout_type": workout_type, "exercises_json": json.dumps(exercises)}
+
+    def transactions(self):
+        rng = self.rng
+        categories = list(EXPENSES)
+        weights = [EXPENSES[c][0] for c in categories]
+        per_day = self.scale.transactions_per_month * 12 / 365
+        for day in self.days():
+            if day.day == 25:
+                yield {"date": day, "amount": float(round(rng.gauss(32_000, 500))), "category": "salary",
+                       "description": "Salary", "transaction_type": "income", "created_at": self.stamp(day)}
+            count = int(per_day) + (rng.random() < per_day % 1)
+            for category in rng.choices(categories, weights=weights, k=count):
+                _, typical, merchants = EXPENSES[category]
+                yield {
+                    "date": day, "amount": round(typical * rng.lognormvariate(0, 0.5), 2), "category": category,
+                    "description": rng.choice(merchants), "transaction_type": "expense",
+                    "created_at": self.stamp(day),
+                }
+
+    def tasks(self):
+        rng, span = self.rng, (self.end - self.start).days
+        for _ in range(self.scale.tasks):
+            created = self.stamp(self.start + timedelta(days=rng.randint(0, span)))
+            age = (self.end - created.date()).days
+            status = "done" if rng.random() < min(0.95, age / 30) else rng.choice(["todo", "todo", "in_progress"])
+            due = created.date() + timedelta(days=rng.randint(0, 21)) if rng.random() < 0.6 else None
+            yield {
+                "title": self.text(rng.randint(2, 6))[:-1], "description": self.text(rng.randint(5, 25)) if rng.random() < 0.5 else None,
+                "status": status, "priority": rng.choice(["low", "medium", "medium", "high", "urgent"]),
+                "due_date": due, "completed_at": created + timedelta(days=rng.randint(0, 14)) if status == "done" else None,
+                "recurring": False, "created_at": created, "updated_at": created,
+            }
+
+    def goals(self):
+        rng, span = self.rng, (self.end - self.start).days
+        self._goals = 6 * self.scale.years
+        for goal_id in range(1, self._goals + 1):
+            created = self.stamp(self.start + timedelta(days=rng.randint(0, span)))
+            status = rng.choice(["active", "completed", "completed", "abandoned"]) if (self.end - created.date()).days > 90 else "active"
+            yield {
+                "id": goal_id, "title": self.text(rng.randint(3, 6))[:-1], "description": self.text(12),
+                "category": rng.choice(GOAL_CATEGORIES), "target_date": created.date() + timedelta(days=rng.randint(30, 365)),
+                "progress_pct": 100 if status == "completed" else rng.randint(0, 90), "status": status,
+                "created_at": created, "updated_at": created,
+            }
+
+    def milestones(self):
+        for goal_id in range(1, self._goals + 1):
+            for order in range(self.rng.randint(2, 5)):
+                completed = self.rng.random() < 0.5
+                yield {
+                    "goal_id": goal_id, "title": self.text(self.rng.randint(2, 5))[:-1], "completed": completed,
+                    "target_date": None, "sort_order": order,
+                    "completed_at": datetime.combine(self.end, time(12)) if completed else None,
+                }
+
+    def subscriptions(self):
+        for name, cost, cycle, category in SUBSCRIPTIONS:
+            yield {
+                "name": name, "cost": float(cost), "billing_cycle": cycle, "category": category,
+                "next_renewal": self.end + timedelta(days=self.rng.randint(1, 30 if cycle != "yearly" else 365)),
+                "active": self.rng.random() < 0.85, "created_at": datetime.combine(self.start, time(12)),
+            }
+
+    def inventory(self):
+        rng, span = self.rng, (self.end - self.start).days
+        for item_id in range(1, self.scale.inventory_items + 1):
+            status = rng.choices(["owned", "wishlist", "ai_suggested"], weights=[6, 3, 1])[0]
+            created = self.stamp(self.start + timedelta(days=rng.randint(0, span)))
+            yield {
+                "id": item_id, "name": self.text(rng.randint(1, 4))[:-1],
+                "category": rng.choice(INVENTORY_CATEGORIES)[0], "status": status,
+                "priority": rng.choice([None, "low", "medium", "high"]) if status != "owned" else None,
+                "price": round(rng.lognormvariate(6, 1), 2), "currency": "DKK",
+                "purchase_date": created.date() if status == "owned" else None,
+                "notes": self.text(rng.randint(4, 16)) if rng.random() < 0.3 else None,
+                "ai_reason": self.text(10) if status == "ai_suggested" else None,
+                "created_at": created, "updated_at": created,
+            }
+
+    def inventory_tags(self):
+        for item_id in range(1, self.scale.inventory_items + 1):
+            for tag in self.rng.sample(INVENTORY_TAGS, self.rng.choice([0, 0, 1, 1, 2, 3])):
+                yield {"item_id": item_id, "tag": tag}
+
+
+def _batches(rows):
+    rows = iter(rows)
+    while batch := list(islice(rows, BATCH_SIZE)):
+        yield batch
+
+
+def generate(bind, scale: Scale, seed: int = 0, end: Optional[date] = None) -> dict[str, int]:
+    """Fill an empty database at ``bind``; returns rows inserted per table."""
+    generator = Generator(scale, seed, end or date.today())
+    counts = {}
+    with bind.begin() as conn:
+        if conn.scalar(select(func.count()).select_from(Transaction)):
+            raise SystemExit("Database is not empty; generate into a fresh database.")
+        # Row-level version and search triggers would fire per generated row;
+        # bump each table once and fill the search index in one pass at the end
+        if conn.dialect.name == "sqlite":
+            for trigger in conn.scalars(text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND (name LIKE 'table_version_%' OR name LIKE 'search_%')"
+            )).all():
+                conn.execute(text(f"DROP TRIGGER {trigger}"))
+        elif conn.dialect.name == "postgresql":
+            for _, table, *_rest in SOURCES.values():
+                conn.execute(text(f"DROP TRIGGER IF EXISTS search_index_{table} ON {table}"))
+        explicit_ids = []
+        for model, rows in generator.tables():
+            counts[model.__tablename__] = 0
+            for batch in _batches(rows):
+                # Pin timestamps the rows leave to column defaults, which would read the clock
+                unset = {c: generator.epoch for c in ("created_at", "updated_at")
+                         if c in model.__table__.c and c not in batch[0]}
+                if unset:
+                    batch = [{**unset, **row} for row in batch]
+                conn.execute(insert(model), batch)
+                counts[model.__tablename__] += len(batch)
+                if "id" in batch[0] and model.__table__ not in explicit_ids:
+                    explicit_ids.append(model.__table__)
+        if conn.dialect.name == "postgresql":
+            # Rows inserted with their own ids leave the SERIAL sequence behind;
+            # move it past them so the API's first insert doesn't reuse an id
+            for table in explicit_ids:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"(SELECT max(id) FROM {table.name}))"
+                ))
+
+        habit_ids = list(range(1, scale.habits + 1))
+        completed_days = select(HabitLog.habit_id, HabitLog.date).where(HabitLog.completed == True).distinct()
+        runs = summarize_islands(conn.execute(islands(completed_days)), habit_ids, generator.end)
+        conn.execute(insert(HabitStreak), [
+            {"habit_id": h, "updated_at": generator.epoch, **run} for h, run in runs.items()
+        ])
+        counts[HabitStreak.__tablename__] = len(runs)
+
+        create_search_index(conn)
+        create_table_versions(conn)
+        conn.execute(text("UPDATE table_versions SET version = version + 1"))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="medium")
+    parser.add_argument("--database", default=DATABASE_URL, help="Target database URL (default: DATABASE_URL)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day of data, YYYY-MM-DD (default: today)")
+    parser.add_argument("--years", type=int)
+    parser.add_argument("--habits", type=int)
+    parser.add_argument("--transactions-per-month", type=int)
+    parser.add_argument("--workouts-per-week", type=int)
+    parser.add_argument("--tasks", type=int)
+    parser.add_argument("--inventory-items", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        name: getattr(args, name) for name in Scale.__dataclass_fields__ if getattr(args, name) is not None
+    }
+    scale = replace(SCALES[args.scale], **overrides)
+
+    bind = create_engine(args.database)
+    upgrade_db(bind)
+    started = timer.perf_counter()
+    counts = generate(bind, scale, args.seed, args.end)
+    elapsed = timer.perf_counter() - started
+    for table, count in counts.items():
+        print(f"  {table:<24} {count:>10,}")
+    print(f"✅ Generated {sum(counts.values()):,} rows in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,29 @@
-"""Initialize the database tables."""
-from database import init_db
-# Import all models so they're registered with Base
-from models import (
-    Task, SleepEntry, MealEntry, HabitEntry, DailyNote,
-    InventoryItem, InventoryCategory
-)
+"""Create or upgrade the database schema.
+
+Run before rolling out new workers; outside SQLite they refuse to start on an
+outdated schema (see DB_AUTO_MIGRATE in database.py):
+
+    python init_db.py                   # upgrade to the latest revision
+    python init_db.py --revision 0001   # upgrade to a given revision
+    python init_db.py --current         # print the stored revision
+
+``alembic`` works too (``alembic history``, ``alembic revision --autogenerate``).
+"""
+import argparse
+import logging
+
+from database import engine, schema_revision, upgrade_db
 
 if __name__ == "__main__":
-    init_db()
-    print("✅ Database initialized")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--revision", default="head", help="Target revision (default: head)")
+    parser.add_argument("--current", action="store_true", help="Print the stored revision and exit")
+    args = parser.parse_args()
+
+    if not args.current:
+        logging.basicConfig(format="%(message)s")
+        logging.getLogger("alembic").setLevel(logging.INFO)
+        upgrade_db(engine, args.revision)
+    with engine.connect() as conn:
+        revision = schema_revision(conn)
+    print(f"✅ Database schema at revision {revision or '(none)'}")
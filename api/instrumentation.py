@@ -0,0 +1,85 @@
+"""Per-request SQL instrumentation.
+
+``QueryStatsMiddleware`` tracks every statement a request runs (via the
+engine hooks in ``database.py``) and reports it in response headers:
+
+    X-DB-Queries: 4
+    Server-Timing: db;dur=3.1;desc="4 queries", app;dur=7.9
+
+It also logs a warning when one statement shape repeats within a request —
+the signature of an N+1 loop.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from database import QueryStats, query_stats
+
+logger = logging.getLogger("theseus.sql")
+
+# Same statement this many times in one request is reported as a likely N+1
+REPEAT_WARN_THRESHOLD = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", "10"))
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                elapsed = (time.perf_counter() - start) * 1000
+                timing = f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", app;dur={elapsed:.1f}'
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            query_stats.reset(token)
+            _warn_repeats(scope, stats)
+
+
+def _warn_repeats(scope, stats: QueryStats):
+    for statement, count in stats.statements.items():
+        if count >= REPEAT_WARN_THRESHOLD:
+            logger.warning(
+                "Possible N+1: %s %s ran the same statement %d times: %s",
+                scope["method"], scope["path"], count, " ".join(statement.split())[:200],
+            )
+
+
+@contextmanager
+def track_queries():
+    """Collect ``QueryStats`` for the statements run inside the block."""
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+def assert_query_budget(response, budget: int):
+    """Fail if the request behind ``response`` ran more than ``budget`` statements.
+
+    For use with a test client against the app, e.g.
+    ``assert_query_budget(client.get("/api/overview/"), 8)``.
+    """
+    used = int(response.headers["x-db-queries"])
+    assert used <= budget, (
+        f"{response.request.method} {response.request.url.path} ran {used} queries "
+        f"(budget {budget}); Server-Timing: {response.headers.get('server-timing')}"
+    )
@@ -0,0 +1,194 @@
+"""Simulate many dashboard clients hitting a running API at once.
+
+Each virtual client loops over a weighted mix of page loads (the parallel
+GETs a page fires on mount) and small writes (habit toggles, meal logs, water
+increments) until ``--duration`` runs out. The report covers throughput, tail
+latency per scenario and errors. With ``--serve`` the harness also starts
+uvicorn itself and counts ``database is locked`` errors in its log:
+
+    python loadtest.py --serve sqlite:////tmp/theseus-bench/medium-2026-01-01.db --concurrency 50
+    python loadtest.py --url http://127.0.0.1:4810 --duration 60
+
+Point it at a scratch database (see ``generate_dataset.py``); it writes.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Optional
+
+import httpx
+
+PAGES = {
+    "dashboard": ["/api/overview/"],
+    "habits_page": ["/api/habits/", "/api/habits/streaks", "/api/habits/heatmap", "/api/habits/stats"],
+    "sleep_page": ["/api/sleep/", "/api/sleep/score", "/api/sleep/chart-data", "/api/sleep/stats/weekly"],
+    "finance_page": ["/api/finance/summary", "/api/finance/trends", "/api/finance/transactions", "/api/finance/budgets"],
+    "nutrition_page": ["/api/nutrition/", "/api/nutrition/daily-totals", "/api/nutrition/water"],
+}
+# As SQLAlchemy reports it: once per failed statement, unlike the raw driver error
+LOCKED_ERROR = "OperationalError) database is locked"
+
+# scenario -> relative weight
+MIX = {
+    "dashboard": 35,
+    "habits_page": 12,
+    "sleep_page": 8,
+    "finance_page": 8,
+    "nutrition_page": 7,
+    "habit_toggle": 15,
+    "meal_log": 5,
+    "water_increment": 10,
+}
+
+
+class Client:
+    def __init__(self, http: httpx.AsyncClient, rng: random.Random, habit_ids: list[int]):
+        self.http = http
+        self.rng = rng
+        self.habit_ids = habit_ids
+
+    async def run(self, scenario: str):
+        if scenario in PAGES:
+            responses = await asyncio.gather(*(self.http.get(path) for path in PAGES[scenario]))
+        else:
+            responses = [await getattr(self, scenario)()]
+        return responses
+
+    async def habit_toggle(self):
+        day = date.today() - timedelta(days=self.rng.randint(0, 6))
+        return await self.http.post(
+            f"/api/habits/{self.rng.choice(self.habit_ids)}/log",
+            json={"date": day.isoformat(), "completed": self.rng.random() < 0.7},
+        )
+
+    async def meal_log(self):
+        return await self.http.post("/api/nutrition/", json={
+            "date": date.today().isoformat(), "meal_type": self.rng.choice(["breakfast", "lunch", "dinner", "snack"]),
+            "description": "Load test meal", "calories": self.rng.randint(100, 900),
+        })
+
+    async def water_increment(self):
+        # Read-modify-write, like the water widget
+        current = await self.http.get("/api/nutrition/water")
+        glasses = current.json().get("glasses", 0) if current.status_code == 200 else 0
+        return await self.http.post("/api/nutrition/water", json={"date": date.today().isoformat(), "glasses": glasses + 1})
+
+
+async def client_loop(client: Client, deadline: float, samples: dict, errors: Counter):
+    scenarios, weights = list(MIX), list(MIX.values())
+    while time.perf_counter() < deadline:
+        scenario = client.rng.choices(scenarios, weights=weights)[0]
+        start = time.perf_counter()
+        try:
+            responses = await client.run(scenario)
+        except httpx.HTTPError as e:
+            errors[f"{scenario}: {type(e).__name__}"] += 1
+            continue
+        samples[scenario].append((time.perf_counter() - start) * 1000)
+        for response in responses:
+            if response.status_code >= 400:
+                errors[f"{scenario}: HTTP {response.status_code}"] += 1
+
+
+async def run(url: str, concurrency: int, duration: float, seed: int) -> tuple[dict, Counter, float]:
+    limits = httpx.Limits(max_connections=concurrency * 4)
+    # One connection pool, but a client (so a cookie jar) per virtual client;
+    # the clients aren't closed themselves, as that would close the shared pool
+    async with httpx.AsyncHTTPTransport(limits=limits) as transport:
+        def browser() -> httpx.AsyncClient:
+            return httpx.AsyncClient(base_url=url, transport=transport, timeout=30)
+
+        habits = (await browser().get("/api/habits/")).json()
+        habit_ids = [h["id"] for h in habits]
+        if not habit_ids:
+            raise SystemExit("No habits in the target database; generate a dataset first.")
+
+        samples, errors = defaultdict(list), Counter()
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            client_loop(Client(browser(), random.Random(seed + i), habit_ids), deadline, samples, errors)
+            for i in range(concurrency)
+        ))
+        return samples, errors, time.perf_counter() - started
+
+
+def report(samples: dict, errors: Counter, elapsed: float, locked: Optional[int]):
+    total = sum(len(s) for s in samples.values())
+    print(f"\n{total:,} scenarios in {elapsed:.1f}s — {total / elapsed:.1f}/s")
+    print(f"  {'scenario':<16} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for scenario in MIX:
+        latencies = samples.get(scenario)
+        if not latencies:
+            continue
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        print(f"  {scenario:<16} {len(latencies):>7} {statistics.median(latencies):>8.1f} "
+              f"{cuts[94]:>8.1f} {cuts[98]:>8.1f} {max(latencies):>8.1f}")
+    if errors:
+        print(f"\nErrors ({sum(errors.values())}):")
+        for kind, count in errors.most_common():
+            print(f"  {kind:<40} {count:>6}")
+    if locked is not None:
+        print(f"\n'database is locked' errors in server log: {locked}")
+
+
+def serve(database_url: str, port: int, workers: int, log):
+    env = {**os.environ, "DATABASE_URL": database_url}
+    env.pop("ASYNC_DATABASE_URL", None)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--no-access-log"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/ping").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            break
+        time.sleep(0.2)
+    server.terminate()
+    log.seek(0)
+    raise SystemExit(f"uvicorn did not start:\n{log.read()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:4810")
+    parser.add_argument("--serve", metavar="DATABASE_URL", help="Start uvicorn against this database first")
+    parser.add_argument("--port", type=int, default=4811, help="Port for --serve (default 4811)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --serve")
+    parser.add_argument("--concurrency", type=int, default=20, help="Simulated clients")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.serve:
+        samples, errors, elapsed = asyncio.run(run(args.url, args.concurrency, args.duration, args.seed))
+        report(samples, errors, elapsed, None)
+        return
+
+    with tempfile.TemporaryFile("w+") as log:
+        server = serve(args.serve, args.port, args.workers, log)
+        try:
+            samples, errors, elapsed = asyncio.run(
+                run(f"http://127.0.0.1:{args.port}", args.concurrency, args.duration, args.seed)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        log.seek(0)
+        report(samples, errors, elapsed, log.read().count(LOCKED_ERROR))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,23 @@
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from database import init_db
-from routers import tasks, sleep, daily, health, inventory, habits, settings, nutrition, fitness, finance, goals, subscriptions
+from database import DATABASE_READ_URL, ReadYourWritesMiddleware, init_db, async_engine, read_engine
+from etags import ETagMiddleware
+from instrumentation import QueryStatsMiddleware
+from metrics import MetricsMiddleware, instrument_pool, metrics
+from routers import tasks, sleep, daily, health, inventory, habits, settings, nutrition, fitness, finance, goals, subscriptions, overview, search
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize database tables on startup
+    # Check the schema revision (applying pending migrations if DB_AUTO_MIGRATE)
     init_db()
     yield
+    await async_engine.dispose()
+    await read_engine.dispose()
 
 
 app = FastAPI(
@@ -28,7 +34,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-DB-Queries"],
 )
+app.add_middleware(ETagMiddleware)
+if DATABASE_READ_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+instrument_pool(async_engine.sync_engine)
+if read_engine is not async_engine:
+    instrument_pool(read_engine.sync_engine, "read")
 
 app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
 app.include_router(sleep.router, prefix="/api/sleep", tags=["sleep"])
@@ -42,8 +57,15 @@ app.include_router(fitness.router, prefix="/api/fitness", tags=["fitness"])
 app.include_router(finance.router, prefix="/api/finance", tags=["finance"])
 app.include_router(goals.router, prefix="/api/goals", tags=["goals"])
 app.include_router(subscriptions.router, prefix="/api/subscriptions", tags=["subscriptions"])
+app.include_router(overview.router, prefix="/api/overview", tags=["overview"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 
 
 @app.get("/api/ping")
 async def ping():
     return {"status": "ok", "app": "theseus", "version": "0.1.0"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,201 @@
+"""Prometheus-style metrics, collected in-process and served at ``/metrics``.
+
+Per-route series are created once, the first time a route is hit, and cached
+on the route object itself; a request then only bumps a few integers and
+floats, so collection can stay on in production.
+"""
+
+import os
+import resource
+import time
+from bisect import bisect_left
+from typing import Optional
+
+# Upper bounds in seconds; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+START_TIME = time.time()
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = "") -> list[str]:
+        sep = "," if labels else ""
+        lines, cumulative = [], 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class RouteSeries:
+    __slots__ = ("labels", "latency", "status_counts")
+
+    def __init__(self, method: str, route: str):
+        self.labels = f'method="{method}",route="{route}"'
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.status_counts = [0] * 6  # index = status // 100
+
+
+class PoolSeries:
+    __slots__ = ("labels", "pool", "wait")
+
+    def __init__(self, name: str, pool):
+        self.labels = f'pool="{name}"'
+        self.pool = pool
+        self.wait = Histogram(POOL_WAIT_BUCKETS)
+
+
+class Metrics:
+    def __init__(self):
+        self.in_flight = 0
+        self.routes: dict[tuple[str, str], RouteSeries] = {}
+        self.pools: dict[str, PoolSeries] = {}
+
+    def series(self, scope) -> RouteSeries:
+        # Cache on the route so the lookup costs one attribute read per request
+        route = scope.get("route")
+        cache = getattr(route, "_metrics_series", None) if route is not None else None
+        if cache is not None and scope["method"] in cache:
+            return cache[scope["method"]]
+
+        template = getattr(route, "path", None) or "unmatched"
+        key = (scope["method"], template)
+        series = self.routes.get(key)
+        if series is None:
+            series = self.routes[key] = RouteSeries(*key)
+        if route is not None:
+            if cache is None:
+                cache = {}
+                route._metrics_series = cache
+            cache[scope["method"]] = series
+        return series
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        routes = sorted(self.routes.values(), key=lambda s: s.labels)
+        for s in routes:
+            lines += s.latency.render("http_request_duration_seconds", s.labels)
+        lines += [
+            "# HELP http_responses_total Responses by route template and status class.",
+            "# TYPE http_responses_total counter",
+        ]
+        for s in routes:
+            for status_class, n in enumerate(s.status_counts):
+                if n:
+                    lines.append(f'http_responses_total{{{s.labels},status="{status_class}xx"}} {n}')
+        lines += [
+            "# HELP db_pool_checkout_wait_seconds Time spent waiting for a database connection.",
+            "# TYPE db_pool_checkout_wait_seconds histogram",
+        ]
+        for p in self.pools.values():
+            lines += p.wait.render("db_pool_checkout_wait_seconds", p.labels)
+        lines += [
+            *self._pool_gauges(),
+            "# HELP process_resident_memory_bytes Resident set size.",
+            "# TYPE process_resident_memory_bytes gauge",
+            f"process_resident_memory_bytes {_rss_bytes()}",
+            "# HELP process_start_time_seconds Start time since the Unix epoch.",
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {START_TIME}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _pool_gauges(self) -> list[str]:
+        # Only queue pools keep connections; a NullPool (in-memory SQLite) has nothing to report
+        pools = [p for p in self.pools.values() if hasattr(p.pool, "checkedout")]
+        if not pools:
+            return []
+        return [
+            "# HELP db_pool_size Connections the pool keeps open.",
+            "# TYPE db_pool_size gauge",
+            *(f"db_pool_size{{{p.labels}}} {p.pool.size()}" for p in pools),
+            "# HELP db_pool_checked_out Connections currently in use.",
+            "# TYPE db_pool_checked_out gauge",
+            *(f"db_pool_checked_out{{{p.labels}}} {p.pool.checkedout()}" for p in pools),
+            "# HELP db_pool_overflow Connections open beyond db_pool_size.",
+            "# TYPE db_pool_overflow gauge",
+            *(f"db_pool_overflow{{{p.labels}}} {max(p.pool.overflow(), 0)}" for p in pools),
+        ]
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_capturing_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_capturing_status)
+        finally:
+            metrics.in_flight -= 1
+            series = metrics.series(scope)
+            series.latency.observe(time.perf_counter() - start)
+            series.status_counts[min(status // 100, 5)] += 1
+
+
+def instrument_pool(engine, name: str = "primary"):
+    """Time how long ``engine`` takes to hand out a pooled connection, and report its pool.
+
+    Its series are labelled ``pool="<name>"``.
+    """
+    pool = engine.pool
+    series = metrics.pools[name] = PoolSeries(name, pool)
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            series.wait.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
@@ -0,0 +1,47 @@
+"""Alembic environment.
+
+Revisions run on the connection ``database.upgrade_db`` hands over, or, from
+the ``alembic`` command line, on the sync engine for DATABASE_URL.
+Autogenerate compares model tables only; the search index, table versions and
+their triggers are raw SQL managed by the revisions themselves.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+import models  # noqa: F401 — registers every table on Base.metadata
+from database import Base, engine
+
+config = context.config
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return name in Base.metadata.tables
+    return True
+
+
+def run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=Base.metadata,
+        include_name=include_name,
+        render_as_batch=True,  # SQLite can't ALTER most constraints in place
+        compare_type=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    raise SystemExit("Revisions inspect the database as they run; offline (--sql) mode is not supported.")
+
+connection = config.attributes.get("connection")
+if connection is not None:
+    run_migrations(connection)
+else:
+    if config.config_file_name:
+        fileConfig(config.config_file_name, disable_existing_loggers=False)
+    with engine.connect() as connection:
+        run_migrations(connection)
+        connection.commit()
@@ -0,0 +1,586 @@
+"""Baseline: the schema as the last create_all/migrations.py build left it.
+
+Fresh databases get every table and index, the search index and the table
+version triggers. Databases from before Alembic (they have a
+``schema_migrations`` table) get whatever that build's startup would still
+have added: missing tables, then the legacy steps they haven't run.
+
+The tables, the search index and trigger DDL and the tag splitter are
+snapshots, not the models or ``fulltext``/``etags``, so later changes to
+those can't change what this revision does.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+import functools
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateIndex
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# InventoryItem.priority_rank, as the queries render it
+INVENTORY_PRIORITY_RANK = (
+    "CASE coalesce(priority, 'low') WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 ELSE 4 END"
+)
+
+
+@functools.cache
+def _snapshot() -> sa.MetaData:
+    # Built on first use, so loading this file (every startup) stays cheap
+    metadata = sa.MetaData()
+    sa.Table(
+        "budgets",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("monthly_limit", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("category"),
+        sa.Index("ix_budgets_id", "id"),
+    )
+
+    sa.Table(
+        "daily_notes",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("mood", sa.Integer(), nullable=True),
+        sa.Column("energy", sa.Integer(), nullable=True),
+        sa.Column("note", sa.Text(), nullable=True),
+        sa.Column("highlights", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_daily_notes_date", "date", unique=True),
+        sa.Index("ix_daily_notes_id", "id"),
+    )
+
+    sa.Table(
+        "goals",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("target_date", sa.Date(), nullable=True),
+        sa.Column("progress_pct", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_goals_created_id", "created_at", "id"),
+        sa.Index("ix_goals_id", "id"),
+    )
+
+    sa.Table(
+        "habit_entries",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("habit_name", sa.String(length=200), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=True),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_habit_entries_date", "date"),
+        sa.Index("ix_habit_entries_habit_name", "habit_name"),
+        sa.Index("ix_habit_entries_id", "id"),
+    )
+
+    sa.Table(
+        "habit_logs",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=True),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_habit_logs_date", "date"),
+        sa.Index("ix_habit_logs_id", "id"),
+        sa.Index("ux_habit_logs_habit_date", "habit_id", "date", unique=True),
+    )
+
+    sa.Table(
+        "habit_streaks",
+        metadata,
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("run_start", sa.Date(), nullable=True),
+        sa.Column("run_length", sa.Integer(), nullable=True),
+        sa.Column("last_completed", sa.Date(), nullable=True),
+        sa.Column("longest_streak", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("habit_id"),
+    )
+
+    sa.Table(
+        "habits",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("icon", sa.String(length=50), nullable=True),
+        sa.Column("target_frequency", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_habits_id", "id"),
+    )
+
+    sa.Table(
+        "inventory_categories",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("color", sa.String(length=7), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+        sa.Index("ix_inventory_categories_id", "id"),
+    )
+
+    sa.Table(
+        "inventory_items",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=500), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("priority", sa.String(length=20), nullable=True),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("currency", sa.String(length=10), nullable=True),
+        sa.Column("purchase_date", sa.Date(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("ai_reason", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_inventory_items_id", "id"),
+        sa.Index(
+            "ix_inventory_items_status_priority",
+            "status",
+            sa.text(f"({INVENTORY_PRIORITY_RANK})"),
+            sa.text("created_at DESC"),
+            sa.text("id DESC"),
+        ),
+    )
+
+    sa.Table(
+        "meal_entries",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("meal_type", sa.String(length=20), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("calories", sa.Integer(), nullable=True),
+        sa.Column("protein_g", sa.Float(), nullable=True),
+        sa.Column("carbs_g", sa.Float(), nullable=True),
+        sa.Column("fat_g", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_meal_entries_date", "date"),
+        sa.Index("ix_meal_entries_date_id", "date", "id"),
+        sa.Index("ix_meal_entries_id", "id"),
+    )
+
+    sa.Table(
+        "milestones",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("goal_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=True),
+        sa.Column("target_date", sa.Date(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("sort_order", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_milestones_goal_id", "goal_id"),
+        sa.Index("ix_milestones_id", "id"),
+    )
+
+    sa.Table(
+        "sleep_entries",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("bedtime", sa.DateTime(), nullable=True),
+        sa.Column("wake_time", sa.DateTime(), nullable=True),
+        sa.Column("duration_hours", sa.Float(), nullable=True),
+        sa.Column("quality", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_sleep_entries_date", "date", unique=True),
+        sa.Index("ix_sleep_entries_id", "id"),
+    )
+
+    sa.Table(
+        "sleep_settings",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("target_hours", sa.Float(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_sleep_settings_id", "id"),
+    )
+
+    sa.Table(
+        "subscriptions",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("cost", sa.Float(), nullable=False),
+        sa.Column("billing_cycle", sa.String(length=20), nullable=False),
+        sa.Column("next_renewal", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_subscriptions_active_renewal", "active", "next_renewal"),
+        sa.Index("ix_subscriptions_id", "id"),
+        sa.Index("ix_subscriptions_name_id", "name", "id"),
+    )
+
+    sa.Table(
+        "tasks",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("priority", sa.String(length=20), nullable=True),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("recurring", sa.Boolean(), nullable=True),
+        sa.Column("recurring_pattern", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_tasks_created_id", "created_at", "id"),
+        sa.Index("ix_tasks_id", "id"),
+        sa.Index("ix_tasks_status_completed", "status", "completed_at"),
+        sa.Index("ix_tasks_status_created_id", "status", "created_at", "id"),
+        sa.Index("ix_tasks_status_due", "status", "due_date"),
+    )
+
+    sa.Table(
+        "transactions",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("transaction_type", sa.String(length=20), nullable=False),
+        sa.Column("import_hash", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_transactions_category_date_id", "category", "date", "id"),
+        sa.Index("ix_transactions_date_id", "date", "id"),
+        sa.Index("ix_transactions_date_type_category", "date", "transaction_type", "category", "amount"),
+        sa.Index("ix_transactions_id", "id"),
+        sa.Index("ix_transactions_import_hash", "import_hash", unique=True),
+    )
+
+    sa.Table(
+        "user_settings",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=100), nullable=False),
+        sa.Column("value", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_user_settings_id", "id"),
+        sa.Index("ix_user_settings_key", "key", unique=True),
+    )
+
+    sa.Table(
+        "water_intake",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("glasses", sa.Integer(), nullable=False),
+        sa.Column("target", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_water_intake_date", "date"),
+        sa.Index("ix_water_intake_id", "id"),
+    )
+
+    sa.Table(
+        "workout_templates",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("workout_type", sa.String(length=20), nullable=False),
+        sa.Column("exercises_json", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_workout_templates_id", "id"),
+    )
+
+    sa.Table(
+        "workouts",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("workout_type", sa.String(length=20), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_workouts_date", "date"),
+        sa.Index("ix_workouts_id", "id"),
+    )
+
+    sa.Table(
+        "exercises",
+        metadata,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("workout_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["workout_id"], ["workouts.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.Index("ix_exercises_id", "id"),
+        sa.Index("ix_exercises_name", "name"),
+        sa.Index("ix_exercises_workout_id", "workout_id"),
+    )
+
+    sa.Table(
+        "inventory_item_tags",
+        metadata,
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("tag", sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(["item_id"], ["inventory_items.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("item_id", "tag"),
+        sa.Index("ix_inventory_item_tags_tag_item", "tag", "item_id"),
+    )
+    return metadata
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {column["name"] for column in sa.inspect(conn).get_columns(table)}
+
+
+def _create_indexes(conn, *names: str):
+    for table in _snapshot().tables.values():
+        for index in table.indexes:
+            if index.name in names:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _transaction_import_hash(conn):
+    if "import_hash" not in _columns(conn, "transactions"):
+        conn.execute(sa.text("ALTER TABLE transactions ADD COLUMN import_hash VARCHAR(64)"))
+    _create_indexes(conn, "ix_transactions_import_hash")
+
+
+def _split_tags(value: str) -> list[str]:
+    # models.split_tags as of this revision
+    return list(dict.fromkeys(t.strip().lower() for t in value.split(",") if t.strip()))
+
+
+def _inventory_tags(conn):
+    # Copy the old comma-separated column into inventory_item_tags. The column
+    # itself is left in place (unused) so older builds can still read the DB.
+    if "tags" not in _columns(conn, "inventory_items"):
+        return
+    rows = conn.execute(sa.text("SELECT id, tags FROM inventory_items WHERE tags IS NOT NULL"))
+    links = [{"item_id": item_id, "tag": tag} for item_id, tags in rows for tag in _split_tags(tags)]
+    if links:
+        conn.execute(sa.text("INSERT INTO inventory_item_tags (item_id, tag) VALUES (:item_id, :tag)"), links)
+
+
+def _inventory_priority_index(conn):
+    _create_indexes(conn, "ix_inventory_items_status_priority")
+
+
+# fulltext.SOURCES as of this revision: module -> (number, table, title, body,
+# date, columns whose change triggers a reindex). Row ids are id * 8 + number.
+SEARCH_SOURCES = {
+    "tasks": (1, "tasks", "{r}.title", "{r}.description", "{r}.created_at", "title, description"),
+    "journal": (2, "daily_notes", "{r}.highlights", "{r}.note", "{r}.date", "highlights, note, date"),
+    "nutrition": (3, "meal_entries", "{r}.description", "NULL", "{r}.date", "description, date"),
+    "inventory": (4, "inventory_items", "{r}.name", "{r}.notes", "{r}.created_at", "name, notes"),
+    "finance": (5, "transactions", "{r}.description", "{r}.category", "{r}.date", "description, category, date"),
+}
+
+
+def _search_values(module: str, row: str, dialect: str) -> str:
+    number, _, title, body, day, _ = SEARCH_SOURCES[module]
+    day = day.format(r=row)
+    day = f"substr({day}, 1, 10)" if dialect == "sqlite" else f"CAST({day} AS DATE)"
+    return f"{row}.id * 8 + {number}, '{module}', {row}.id, {day}, {title.format(r=row)}, {body.format(r=row)}"
+
+
+def _search_columns(dialect: str) -> str:
+    return f"({'rowid' if dialect == 'sqlite' else 'id'}, module, ref_id, date, title, body)"
+
+
+def _search_index(conn):
+    # fulltext.create_search_index as of this revision: the index, its
+    # triggers, then every existing row
+    dialect = conn.dialect.name
+    columns = _search_columns(dialect)
+    if dialect == "postgresql":
+        conn.execute(sa.text(
+            "CREATE TABLE IF NOT EXISTS search_index ("
+            "id BIGINT PRIMARY KEY, module VARCHAR(20) NOT NULL, ref_id INTEGER NOT NULL, "
+            "date DATE, title TEXT, body TEXT, "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED)"
+        ))
+        conn.execute(sa.text(
+            "CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING gin (document)"
+        ))
+        for module, (number, table, *_, watched) in SEARCH_SOURCES.items():
+            conn.execute(sa.text(
+                f"CREATE OR REPLACE FUNCTION search_index_{table}() RETURNS trigger AS $$ BEGIN "
+                f"IF TG_OP <> 'INSERT' THEN DELETE FROM search_index WHERE id = OLD.id * 8 + {number}; END IF; "
+                f"IF TG_OP <> 'DELETE' THEN INSERT INTO search_index {columns} "
+                f"VALUES ({_search_values(module, 'NEW', dialect)}); END IF; "
+                f"RETURN NULL; END $$ LANGUAGE plpgsql"
+            ))
+            conn.execute(sa.text(f"DROP TRIGGER IF EXISTS search_index_{table} ON {table}"))
+            conn.execute(sa.text(
+                f"CREATE TRIGGER search_index_{table} AFTER INSERT OR DELETE OR UPDATE OF {watched} "
+                f"ON {table} FOR EACH ROW EXECUTE FUNCTION search_index_{table}()"
+            ))
+    else:
+        conn.execute(sa.text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "title, body, module UNINDEXED, ref_id UNINDEXED, date UNINDEXED, "
+            "tokenize = 'porter unicode61 remove_diacritics 2')"
+        ))
+        for module, (number, table, *_, watched) in SEARCH_SOURCES.items():
+            delete = f"DELETE FROM search_index WHERE rowid = OLD.id * 8 + {number};"
+            insert = f"INSERT INTO search_index {columns} VALUES ({_search_values(module, 'NEW', dialect)});"
+            for name, event, body in (
+                ("ai", "AFTER INSERT", insert),
+                ("ad", "AFTER DELETE", delete),
+                ("au", f"AFTER UPDATE OF {watched}", delete + " " + insert),
+            ):
+                conn.execute(sa.text(
+                    f"CREATE TRIGGER IF NOT EXISTS search_{table}_{name} {event} ON {table} BEGIN {body} END"
+                ))
+    for module, (_, table, *_rest) in SEARCH_SOURCES.items():
+        conn.execute(sa.text(
+            f"INSERT INTO search_index {columns} SELECT {_search_values(module, table, dialect)} FROM {table}"
+        ))
+
+
+def _list_pagination_indexes(conn):
+    _create_indexes(
+        conn,
+        "ix_tasks_created_id",
+        "ix_tasks_status_created_id",
+        "ix_meal_entries_date_id",
+        "ix_transactions_date_id",
+        "ix_goals_created_id",
+        "ix_subscriptions_name_id",
+    )
+
+
+def _table_versions(conn):
+    # etags.create_table_versions as of this revision (idempotent)
+    tables = sorted(_snapshot().tables)
+    conn.execute(sa.text(
+        "CREATE TABLE IF NOT EXISTS table_versions "
+        "(table_name VARCHAR(100) PRIMARY KEY, version BIGINT NOT NULL DEFAULT 0)"
+    ))
+    existing = set(conn.scalars(sa.text("SELECT table_name FROM table_versions")))
+    missing = [{"table_name": t} for t in tables if t not in existing]
+    if missing:
+        conn.execute(sa.text("INSERT INTO table_versions (table_name, version) VALUES (:table_name, 0)"), missing)
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(sa.text(
+            "CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$ BEGIN "
+            "UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME; "
+            "RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        for table in tables:
+            conn.execute(sa.text(f"DROP TRIGGER IF EXISTS table_version_{table} ON {table}"))
+            conn.execute(sa.text(
+                f"CREATE TRIGGER table_version_{table} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+                f"ON {table} FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+            ))
+        return
+    # SQLite only has row-level triggers
+    for table in tables:
+        for name, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+            conn.execute(sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS table_version_{table}_{name} AFTER {event} ON {table} BEGIN "
+                f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'; END"
+            ))
+
+
+def _query_shape_indexes(conn):
+    # Keep one log per habit and day before enforcing it: a completed one if
+    # any (what streaks and the heatmap already counted), else the newest
+    conn.execute(sa.text(
+        "DELETE FROM habit_logs WHERE id IN (SELECT id FROM ("
+        "SELECT id, ROW_NUMBER() OVER (PARTITION BY habit_id, date "
+        "ORDER BY CASE WHEN completed THEN 1 ELSE 0 END DESC, id DESC) AS position "
+        "FROM habit_logs) ranked WHERE position > 1)"
+    ))
+    _create_indexes(
+        conn,
+        "ux_habit_logs_habit_date",
+        "ix_tasks_status_due",
+        "ix_tasks_status_completed",
+        "ix_exercises_name",
+        "ix_transactions_date_type_category",
+        "ix_transactions_category_date_id",
+        "ix_subscriptions_active_renewal",
+    )
+    # Prefixes of the composite indexes above (or of ix_transactions_date_id)
+    for index in ("ix_habit_logs_habit_id", "ix_transactions_date"):
+        conn.execute(sa.text(f"DROP INDEX IF EXISTS {index}"))
+
+
+# The steps migrations.py used to run, in order (0006 created table_versions,
+# which upgrade() now always ensures). Each is safe on a fresh database, where
+# create_all has already built the snapshot above.
+LEGACY_STEPS = [
+    ("0001_transaction_import_hash", _transaction_import_hash),
+    ("0002_inventory_tags", _inventory_tags),
+    ("0003_inventory_priority_index", _inventory_priority_index),
+    ("0004_search_index", _search_index),
+    ("0005_list_pagination_indexes", _list_pagination_indexes),
+    ("0007_query_shape_indexes", _query_shape_indexes),
+]
+
+
+def upgrade():
+    conn = op.get_bind()
+    applied = set()
+    if sa.inspect(conn).has_table("schema_migrations"):
+        applied = set(conn.scalars(sa.text("SELECT name FROM schema_migrations")))
+    _snapshot().create_all(conn)  # checkfirst: only tables a pre-Alembic database lacks
+    for name, step in LEGACY_STEPS:
+        if name not in applied:
+            step(conn)
+    # Idempotent; also adds triggers to tables create_all just made
+    _table_versions(conn)
+    conn.execute(sa.text("DROP TABLE IF EXISTS schema_migrations"))
+
+
+def downgrade():
+    raise NotImplementedError("The baseline can't be downgraded; restore a backup instead.")
@@ -0,0 +1,29 @@
+"""Serve open-task lookups from a partial index on due_date.
+
+Overdue and overview queries filter on ``status != 'done'``. Tasks may
+carry any status string, so the predicate stays as it is and
+``ix_tasks_status_due`` gives way to an index of open tasks only.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+OPEN = sa.text("status != 'done'")
+
+
+def upgrade():
+    op.create_index("ix_tasks_open_due", "tasks", ["due_date"], sqlite_where=OPEN, postgresql_where=OPEN)
+    op.drop_index("ix_tasks_status_due", table_name="tasks")
+
+
+def downgrade():
+    op.create_index("ix_tasks_status_due", "tasks", ["status", "due_date"])
+    op.drop_index("ix_tasks_open_due", table_name="tasks")
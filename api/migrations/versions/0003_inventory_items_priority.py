@@ -0,0 +1,33 @@
+"""Index the unfiltered inventory listing in its natural order.
+
+``ix_inventory_items_status_priority`` only serves the listing when it is
+filtered by status; without a filter the list scanned and sorted the table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# InventoryItem.priority_rank, as the queries render it
+INVENTORY_PRIORITY_RANK = (
+    "CASE coalesce(priority, 'low') WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 ELSE 4 END"
+)
+
+
+def upgrade():
+    op.create_index(
+        "ix_inventory_items_priority",
+        "inventory_items",
+        [sa.text(f"({INVENTORY_PRIORITY_RANK})"), sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_inventory_items_priority", table_name="inventory_items")
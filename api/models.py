@@ -1,7 +1,11 @@
 """SQLAlchemy models for Theseus."""
 
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, Text, Enum, ForeignKey, Index
+from sqlalchemy import case, func, literal_column
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql.expression import Grouping
+from sqlalchemy.orm import relationship
 from database import Base
 import enum
 
@@ -34,6 +38,25 @@ class Task(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @hybrid_property
+    def is_open(self):
+        """Anything not done, whatever status the client stored."""
+        return self.status != TaskStatus.done.value
+
+    @is_open.inplace.expression
+    @classmethod
+    def _is_open_expression(cls):
+        # Literal (not bound), so queries match the partial index below
+        return cls.status != literal_column(f"'{TaskStatus.done.value}'")
+
+
+# Keyset pagination of the task list, newest first (optionally per status)
+Index("ix_tasks_created_id", Task.created_at, Task.id)
+Index("ix_tasks_status_created_id", Task.status, Task.created_at, Task.id)
+# Open tasks by due date and today's completions (overview, overdue)
+Index("ix_tasks_open_due", Task.due_date, sqlite_where=Task.is_open, postgresql_where=Task.is_open)
+Index("ix_tasks_status_completed", Task.status, Task.completed_at)
+
 
 class SleepEntry(Base):
     __tablename__ = "sleep_entries"
@@ -63,6 +86,9 @@ class MealEntry(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+Index("ix_meal_entries_date_id", MealEntry.date, MealEntry.id)
+
+
 class HabitEntry(Base):
     __tablename__ = "habit_entries"
 
@@ -88,6 +114,9 @@ class DailyNote(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+INVENTORY_PRIORITY_RANK = {"high": 1, "medium": 2, "low": 3}  # no priority sorts as low, unknown last
+
+
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
 
@@ -101,10 +130,77 @@ class InventoryItem(Base):
     purchase_date = Column(Date, nullable=True)
     notes = Column(Text, nullable=True)
     ai_reason = Column(Text, nullable=True)  # why AI suggested it
-    tags = Column(Text, nullable=True)  # comma-separated tags
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    tag_links = relationship(
+        "InventoryItemTag", cascade="all, delete-orphan", lazy="selectin", passive_deletes=True
+    )
+
+    @hybrid_property
+    def priority_rank(self):
+        return INVENTORY_PRIORITY_RANK.get(self.priority or "low", len(INVENTORY_PRIORITY_RANK) + 1)
+
+    @priority_rank.inplace.expression
+    @classmethod
+    def _priority_rank_expression(cls):
+        # Literal (not bound) values, so queries match the expression index below
+        return case(
+            {literal_column(f"'{p}'"): literal_column(str(r), Integer) for p, r in INVENTORY_PRIORITY_RANK.items()},
+            value=func.coalesce(cls.priority, literal_column("'low'")),
+            else_=literal_column(str(len(INVENTORY_PRIORITY_RANK) + 1), Integer),
+        )
+
+    @property
+    def tags(self):
+        """Comma-separated tags, as the API has always exposed them."""
+        return ", ".join(sorted(link.tag for link in self.tag_links)) or None
+
+    @tags.setter
+    def tags(self, value):
+        wanted = set(split_tags(value))
+        current = {link.tag for link in self.tag_links}
+        if wanted == current:
+            return
+        self.tag_links = [link for link in self.tag_links if link.tag in wanted] + [
+            InventoryItemTag(tag=tag) for tag in sorted(wanted - current)
+        ]
+        # Tags live in their own table, so the row itself may not change
+        self.updated_at = datetime.utcnow()
+
+
+def split_tags(value) -> list[str]:
+    """Normalize a comma-separated tag string (or list) into unique lowercase tags."""
+    if not value:
+        return []
+    parts = value.split(",") if isinstance(value, str) else value
+    return list(dict.fromkeys(t.strip().lower() for t in parts if t.strip()))
+
+
+# Serve the listing, all items or per status, in its natural order: priority, newest first
+Index(
+    "ix_inventory_items_status_priority",
+    InventoryItem.status,
+    Grouping(InventoryItem.priority_rank),  # PostgreSQL requires expression keys in parentheses
+    InventoryItem.created_at.desc(),
+    InventoryItem.id.desc(),
+)
+Index(
+    "ix_inventory_items_priority",
+    Grouping(InventoryItem.priority_rank),
+    InventoryItem.created_at.desc(),
+    InventoryItem.id.desc(),
+)
+
+
+class InventoryItemTag(Base):
+    __tablename__ = "inventory_item_tags"
+    # (tag, item_id) serves tag filters and facets as index-only lookups
+    __table_args__ = (Index("ix_inventory_item_tags_tag_item", "tag", "item_id"),)
+
+    item_id = Column(Integer, ForeignKey("inventory_items.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+
 
 class InventoryCategory(Base):
     __tablename__ = "inventory_categories"
@@ -131,13 +227,28 @@ class HabitLog(Base):
     __tablename__ = "habit_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    habit_id = Column(Integer, nullable=False, index=True)
+    habit_id = Column(Integer, nullable=False)
     date = Column(Date, nullable=False, index=True)
     completed = Column(Boolean, default=False)
     value = Column(Float, nullable=True)  # optional quantifiable value
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+# One log per habit per day; also serves every per-habit lookup by date
+Index("ux_habit_logs_habit_date", HabitLog.habit_id, HabitLog.date, unique=True)
+
+
+class HabitStreak(Base):
+    __tablename__ = "habit_streaks"
+
+    habit_id = Column(Integer, primary_key=True)
+    run_start = Column(Date, nullable=True)  # first day of the latest run
+    run_length = Column(Integer, default=0)
+    last_completed = Column(Date, nullable=True)  # last day of the latest run
+    longest_streak = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class SleepSettings(Base):
     __tablename__ = "sleep_settings"
 
@@ -176,18 +287,25 @@ class Workout(Base):
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Load with selectinload(); passive_deletes leaves exercise cleanup to the router
+    exercises = relationship(
+        "Exercise", back_populates="workout", order_by="Exercise.id", passive_deletes=True
+    )
+
 
 class Exercise(Base):
     __tablename__ = "exercises"
 
     id = Column(Integer, primary_key=True, index=True)
-    workout_id = Column(Integer, nullable=False, index=True)
-    name = Column(String(200), nullable=False)
+    workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False, index=True)
+    name = Column(String(200), nullable=False, index=True)  # exercise history
     sets = Column(Integer, nullable=False)
     reps = Column(Integer, nullable=False)
     weight = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    workout = relationship("Workout", back_populates="exercises")
+
 
 class WorkoutTemplate(Base):
     __tablename__ = "workout_templates"
@@ -202,14 +320,25 @@ class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     amount = Column(Float, nullable=False)
     category = Column(String(50), nullable=False)
     description = Column(Text, nullable=True)
     transaction_type = Column(String(20), nullable=False)
+    import_hash = Column(String(64), nullable=True, unique=True, index=True)  # set by CSV import, for dedupe
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+Index("ix_transactions_date_id", Transaction.date, Transaction.id)
+# Covers the summary and trends aggregates: date range, grouped by type and category
+Index(
+    "ix_transactions_date_type_category",
+    Transaction.date, Transaction.transaction_type, Transaction.category, Transaction.amount,
+)
+# Listing one category, newest first
+Index("ix_transactions_category_date_id", Transaction.category, Transaction.date, Transaction.id)
+
+
 class Budget(Base):
     __tablename__ = "budgets"
 
@@ -233,6 +362,9 @@ class Goal(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+Index("ix_goals_created_id", Goal.created_at, Goal.id)
+
+
 class Milestone(Base):
     __tablename__ = "milestones"
 
@@ -257,3 +389,8 @@ class Subscription(Base):
     active = Column(Boolean, default=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+Index("ix_subscriptions_name_id", Subscription.name, Subscription.id)
+# Upcoming renewals of active subscriptions
+Index("ix_subscriptions_active_renewal", Subscription.active, Subscription.next_renewal)
@@ -0,0 +1,116 @@
+"""Keyset (cursor) pagination shared by list endpoints.
+
+A page is ordered by a fixed list of sort keys ending in a unique column. The
+cursor is the sort-key values of the last row served, so the next page is a
+``WHERE (keys) > (cursor)`` seek on the index backing that order rather than
+an OFFSET scan. Sort keys must be non-null.
+
+Routers take ``PageParams`` (and ``DateRange`` where rows have a natural
+date) as dependencies and hand them to ``paginate``.
+"""
+
+import base64
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Generic, Optional, TypeVar
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import and_, or_, DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; null on the last page
+
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(50, ge=1, le=200),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+class DateRange:
+    def __init__(
+        self,
+        from_: Optional[date] = Query(None, alias="from", description="Inclusive lower bound"),
+        to: Optional[date] = Query(None, description="Inclusive upper bound"),
+    ):
+        if from_ and to and from_ > to:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        self.from_ = from_
+        self.to = to
+
+    def apply(self, query: Select, column) -> Select:
+        """Bound ``column`` (a Date or DateTime column) to the requested days."""
+        is_datetime = isinstance(column.type, DateTime)
+        if self.from_:
+            start = datetime.combine(self.from_, time.min) if is_datetime else self.from_
+            query = query.where(column >= start)
+        if self.to:
+            end = self.to + timedelta(days=1)
+            query = query.where(column < (datetime.combine(end, time.min) if is_datetime else end))
+        return query
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    model,
+    order: list[tuple[str, bool]],
+    page: PageParams,
+) -> Page:
+    """Serve one page of ``query``.
+
+    ``order`` lists ``(attribute, descending)`` pairs on ``model``; the last
+    one must be unique (normally the primary key).
+    """
+    keys = [(getattr(model, name), desc) for name, desc in order]
+    if page.cursor:
+        query = query.where(_after(keys, _decode(page.cursor, keys)))
+    query = query.order_by(*(key.desc() if desc else key.asc() for key, desc in keys))
+
+    rows = (await db.scalars(query.limit(page.limit + 1))).all()
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = _encode([getattr(rows[-1], name) for name, _ in order])
+    return Page(items=rows, next_cursor=next_cursor)
+
+
+def _after(keys, values):
+    """Rows strictly after ``values`` in the (mixed-direction) key order."""
+    clauses = []
+    for i, (key, desc) in enumerate(keys):
+        ties = [k == v for (k, _), v in zip(keys[:i], values)]
+        clauses.append(and_(*ties, key < values[i] if desc else key > values[i]))
+    return or_(*clauses)
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, keys) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return [_load(value, key) for value, (key, _) in zip(values, keys)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _load(value, key):
+    python_type = key.type.python_type
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
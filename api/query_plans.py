@@ -0,0 +1,151 @@
+"""Check that hot endpoints' queries are served by indexes.
+
+Every request in ``CHECKS`` is sent through the ASGI app against a copy of a
+generated dataset (see ``benchmark.dataset``). Each statement it runs is
+then replayed with ``EXPLAIN QUERY PLAN``, and the check fails when a plan
+scans a whole table that the request doesn't list as an allowed scan:
+
+    python query_plans.py                   # exit 1 on table scans
+    python query_plans.py --scale large -v  # print every plan
+
+SQLite only (the development database); PostgreSQL's planner prefers
+sequential scans on small tables, so its plans say little about indexes.
+"""
+import argparse
+import asyncio
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from benchmark import dataset
+from cache import response_cache
+from database import Base, get_db, get_read_db
+from generate_dataset import SCALES
+from main import app
+
+TODAY = time.strftime("%Y-%m-%d")
+
+# (method, path, JSON body, tables a full scan is expected on). habits is a
+# short list that's always read whole, sleep_settings a single row.
+CHECKS = [
+    ("GET", "/api/overview/", None, {"habits", "sleep_settings"}),
+    ("GET", "/api/habits/", None, {"habits"}),
+    ("GET", "/api/habits/heatmap", None, set()),
+    ("GET", "/api/habits/streaks", None, {"habits"}),
+    ("GET", "/api/habits/stats", None, {"habits"}),
+    ("GET", "/api/habits/1/logs", None, set()),
+    ("POST", "/api/habits/1/log", {"date": TODAY, "completed": True}, set()),
+    ("GET", "/api/fitness/workouts", None, set()),
+    ("GET", "/api/fitness/stats", None, set()),
+    ("GET", "/api/fitness/exercises/Squat/history", None, set()),
+    ("GET", "/api/finance/transactions", None, set()),
+    ("GET", "/api/finance/transactions?category=groceries", None, set()),
+    ("GET", "/api/finance/summary", None, set()),
+    ("GET", "/api/finance/trends", None, set()),
+    ("GET", "/api/sleep/score", None, {"sleep_settings"}),
+    ("GET", "/api/sleep/stats/weekly", None, set()),
+    ("GET", "/api/nutrition/trends", None, set()),
+    ("GET", "/api/subscriptions/?active=true", None, set()),
+    ("GET", "/api/subscriptions/stats", None, set()),
+    # Whole-table aggregates by design
+    ("GET", "/api/goals/stats", None, {"goals"}),
+    ("GET", "/api/inventory/stats", None, {"inventory_items"}),
+    ("GET", "/api/inventory/", None, set()),
+    ("GET", "/api/tasks/", None, set()),
+    ("GET", "/api/tasks/overdue", None, set()),
+    ("GET", "/api/search/?q=coffee", None, set()),
+]
+
+# "SCAN habit_logs" is a full table scan; "SCAN habit_logs USING INDEX ..." walks an index
+TABLE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+async def capture(url: str) -> list[tuple[str, str, set, list]]:
+    """Run every check, returning the statements (and parameters) each one executed."""
+    bind = create_async_engine(url)
+    sessions = async_sessionmaker(bind=bind, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    async def get_check_db():
+        async with sessions() as db:
+            yield db
+
+    event.listen(bind.sync_engine, "before_cursor_execute", record)
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = get_check_db
+    captured = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://plans") as client:
+            for method, path, body, allowed in CHECKS:
+                response_cache.clear()  # a cache hit runs no queries
+                statements.clear()
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+                captured.append((method, path, allowed, list(statements)))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await bind.dispose()
+    return captured
+
+
+def table_scans(plan: list[str]) -> set[str]:
+    scans = set()
+    for detail in plan:
+        match = TABLE_SCAN.match(detail)
+        if match and match.group(1) in Base.metadata.tables:
+            scans.add(match.group(1))
+    return scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "theseus-bench")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every statement and its plan")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # The checks write (habit log), so work on a copy of the shared dataset
+        path = Path(scratch) / "plans.db"
+        shutil.copy(make_url(dataset(args.scale, args.data_dir)).database, path)
+        bind = create_engine(f"sqlite:///{path}")
+        captured = asyncio.run(capture(f"sqlite+aiosqlite:///{path}"))
+
+        failures = []
+        with bind.connect() as conn:
+            for method, path_, allowed, statements in captured:
+                print(f"{method} {path_}: {len(statements)} statements")
+                for statement, parameters in statements:
+                    plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                    scans = table_scans(plan) - allowed
+                    if args.verbose or scans:
+                        print(f"  {' '.join(statement.split())[:160]}")
+                        for detail in plan:
+                            print(f"    {detail}")
+                    if scans:
+                        failures.append(f"{method} {path_}: full scan of {', '.join(sorted(scans))}")
+        bind.dispose()
+
+    if failures:
+        print("\n❌ Table scans:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\n✅ Every hot query uses an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Rebuild persisted habit streak state from the full log history.
+
+Streak state is kept up to date by the API; run this to repair drift after
+editing habit_logs directly, or to backfill habits logged before it existed.
+"""
+import asyncio
+
+from database import AsyncSessionLocal, async_engine, init_db, read_engine
+from routers.habits import rebuild_streaks
+
+
+async def main():
+    try:
+        async with AsyncSessionLocal() as db:
+            states = await rebuild_streaks(db)
+            await db.commit()
+    finally:
+        # Pooled aiosqlite connections keep their threads (and the process) alive
+        await async_engine.dispose()
+        await read_engine.dispose()
+    print(f"✅ Rebuilt streak state for {len(states)} habits")
+
+
+if __name__ == "__main__":
+    init_db()
+    asyncio.run(main())
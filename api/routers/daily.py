@@ -3,13 +3,15 @@
 from datetime import datetime, date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_db, get_read_db
+from etags import versioned
 from models import DailyNote
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(DailyNote))])
 
 
 class DailyCreate(BaseModel):
@@ -48,42 +50,41 @@ class TrendEntry(BaseModel):
 
 # Static routes must come BEFORE parameterized routes
 @router.get("/", response_model=list[DailyResponse])
-async def list_daily(limit: int = 30, db: Session = Depends(get_db)):
-    return (
-        db.query(DailyNote)
+async def list_daily(limit: int = 30, db: AsyncSession = Depends(get_read_db)):
+    result = await db.scalars(
+        select(DailyNote)
         .order_by(DailyNote.date.desc())
         .limit(limit)
-        .all()
     )
+    return result.all()
 
 
 @router.post("/", response_model=DailyResponse, status_code=201)
-async def create_daily(entry: DailyCreate, db: Session = Depends(get_db)):
+async def create_daily(entry: DailyCreate, db: AsyncSession = Depends(get_db)):
     db_entry = DailyNote(**entry.model_dump())
     db.add(db_entry)
-    db.commit()
-    db.refresh(db_entry)
+    await db.commit()
+    await db.refresh(db_entry)
     return db_entry
 
 
 @router.get("/today", response_model=Optional[DailyResponse])
-async def get_today(db: Session = Depends(get_db)):
-    entry = db.query(DailyNote).filter(DailyNote.date == date.today()).first()
+async def get_today(db: AsyncSession = Depends(get_read_db)):
+    entry = await db.scalar(select(DailyNote).where(DailyNote.date == date.today()))
     if not entry:
         return None
     return entry
 
 
 @router.get("/trends", response_model=list[TrendEntry])
-async def get_trends(days: int = 30, db: Session = Depends(get_db)):
+async def get_trends(days: int = 30, db: AsyncSession = Depends(get_read_db)):
     """Get mood and energy trends for charting."""
     start_date = date.today() - timedelta(days=days)
-    entries = (
-        db.query(DailyNote)
-        .filter(DailyNote.date >= start_date)
+    entries = (await db.scalars(
+        select(DailyNote)
+        .where(DailyNote.date >= start_date)
         .order_by(DailyNote.date.asc())
-        .all()
-    )
+    )).all()
 
     return [
         TrendEntry(
@@ -97,16 +98,16 @@ async def get_trends(days: int = 30, db: Session = Depends(get_db)):
 
 # Parameterized routes MUST come after static routes
 @router.get("/{entry_date}", response_model=DailyResponse)
-async def get_daily(entry_date: date, db: Session = Depends(get_db)):
-    entry = db.query(DailyNote).filter(DailyNote.date == entry_date).first()
+async def get_daily(entry_date: date, db: AsyncSession = Depends(get_read_db)):
+    entry = await db.scalar(select(DailyNote).where(DailyNote.date == entry_date))
     if not entry:
         raise HTTPException(status_code=404, detail="Daily entry not found")
     return entry
 
 
 @router.patch("/{entry_date}", response_model=DailyResponse)
-async def update_daily(entry_date: date, update: DailyUpdate, db: Session = Depends(get_db)):
-    entry = db.query(DailyNote).filter(DailyNote.date == entry_date).first()
+async def update_daily(entry_date: date, update: DailyUpdate, db: AsyncSession = Depends(get_db)):
+    entry = await db.scalar(select(DailyNote).where(DailyNote.date == entry_date))
     if not entry:
         raise HTTPException(status_code=404, detail="Daily entry not found")
 
@@ -114,6 +115,6 @@ async def update_daily(entry_date: date, update: DailyUpdate, db: Session = Depe
     for key, value in update_data.items():
         setattr(entry, key, value)
 
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
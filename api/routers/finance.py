@@ -1,16 +1,24 @@
 """Finance tracking endpoints — transactions and budgets."""
 
+import codecs
+import csv
+import hashlib
 from datetime import datetime, date
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql, sqlite
 from pydantic import BaseModel
 
-from database import get_db
+from cache import cached, invalidates
+from database import get_db, get_read_db
+from etags import versioned
 from models import Transaction, Budget
+from sqlfuncs import year_month
+from pagination import Page, PageParams, DateRange, paginate
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(Transaction, Budget))])
 
 
 # Pydantic models
@@ -45,6 +53,14 @@ class MonthlyTrend(BaseModel):
     month: str
     income: float
     expenses: float
+    by_category: dict[str, float] = {}  # expenses per category
+
+
+class ImportResult(BaseModel):
+    rows: int
+    imported: int
+    duplicates: int
+    errors: list[str]  # first few rejected rows, "row N: reason"
 
 
 class BudgetCreate(BaseModel):
@@ -68,80 +84,162 @@ class BudgetResponse(BaseModel):
 
 # Transaction endpoints
 @router.post("/transactions", response_model=TransactionResponse, status_code=201)
-async def create_transaction(txn: TransactionCreate, db: Session = Depends(get_db)):
+@invalidates("finance")
+async def create_transaction(txn: TransactionCreate, db: AsyncSession = Depends(get_db)):
     db_txn = Transaction(**txn.model_dump())
     db.add(db_txn)
-    db.commit()
-    db.refresh(db_txn)
+    await db.commit()
+    await db.refresh(db_txn)
     return db_txn
 
 
-@router.get("/transactions", response_model=list[TransactionResponse])
+@router.get("/transactions", response_model=Page[TransactionResponse])
 async def list_transactions(
     month: Optional[str] = None,  # YYYY-MM
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    dates: DateRange = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Transaction)
+    query = dates.apply(select(Transaction), Transaction.date)
 
     if month:
-        try:
-            year, mon = month.split("-")
-            query = query.filter(
-                extract("year", Transaction.date) == int(year),
-                extract("month", Transaction.date) == int(mon),
-            )
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+        start, end = _month_range(month)
+        query = query.where(Transaction.date >= start, Transaction.date < end)
 
     if category:
-        query = query.filter(Transaction.category == category)
+        query = query.where(Transaction.category == category)
+
+    return await paginate(db, query, Transaction, [("date", True), ("id", True)], page)
+
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 20
+
+
+@router.post("/transactions/import", response_model=ImportResult)
+@invalidates("finance")
+async def import_transactions(
+    request: Request,
+    date_column: str = "date",
+    amount_column: str = "amount",
+    description_column: Optional[str] = "description",
+    category_column: Optional[str] = None,
+    type_column: Optional[str] = None,  # income/expense; otherwise taken from the amount's sign
+    default_category: str = "uncategorized",
+    date_format: str = "%Y-%m-%d",
+    delimiter: str = ",",
+    decimal: str = ".",
+    encoding: str = "utf-8-sig",
+    db: AsyncSession = Depends(get_db),
+):
+    """Import a bank-statement CSV sent as the raw request body.
+
+    The body is parsed as it streams in and inserted in batches within one
+    transaction. Rows are deduplicated on a hash of (date, amount,
+    description), so re-importing an overlapping statement is a no-op for
+    rows already present.
+    """
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        raise HTTPException(status_code=400, detail=f"Unknown encoding: {encoding}")
+
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    statement = (
+        insert(Transaction)
+        .on_conflict_do_nothing(index_elements=[Transaction.import_hash])
+        .returning(Transaction.id)
+    )
 
-    return query.order_by(Transaction.date.desc()).all()
+    result = ImportResult(rows=0, imported=0, duplicates=0, errors=[])
+    occurrences: dict[tuple, int] = {}
+    batch: list[dict] = []
+
+    async def flush():
+        inserted = len((await db.execute(statement, batch)).all())
+        result.imported += inserted
+        result.duplicates += len(batch) - inserted
+        batch.clear()
+
+    records = _csv_records(request.stream(), encoding, delimiter)
+    header = await anext(records, None)
+    if header is None:
+        raise HTTPException(status_code=400, detail="Empty CSV")
+    columns = {name.strip(): i for i, name in enumerate(header)}
+    mapping = {
+        "date": date_column,
+        "amount": amount_column,
+        "description": description_column,
+        "category": category_column,
+        "transaction_type": type_column,
+    }
+    missing = [name for name in mapping.values() if name and name not in columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing CSV columns: {', '.join(missing)}")
+    index = {field: columns[name] for field, name in mapping.items() if name}
+
+    async for row in records:
+        if not any(cell.strip() for cell in row):
+            continue
+        result.rows += 1
+        try:
+            values = _parse_import_row(row, index, date_format, decimal, default_category)
+        except (ValueError, IndexError) as e:
+            if len(result.errors) < IMPORT_MAX_ERRORS:
+                result.errors.append(f"row {result.rows}: {e}")
+            continue
+
+        # Identical rows within one file are kept apart by their occurrence count
+        key = (values["date"], values["amount"], values["transaction_type"], values["description"])
+        occurrences[key] = occurrences.get(key, 0) + 1
+        values["import_hash"] = hashlib.sha256(
+            "|".join(map(str, key + (occurrences[key],))).encode()
+        ).hexdigest()
+
+        batch.append(values)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+    await db.commit()
+    return result
 
 
 @router.delete("/transactions/{txn_id}", status_code=204)
-async def delete_transaction(txn_id: int, db: Session = Depends(get_db)):
-    txn = db.query(Transaction).filter(Transaction.id == txn_id).first()
+@invalidates("finance")
+async def delete_transaction(txn_id: int, db: AsyncSession = Depends(get_db)):
+    txn = await db.get(Transaction, txn_id)
     if not txn:
         raise HTTPException(status_code=404, detail="Transaction not found")
-    db.delete(txn)
-    db.commit()
+    await db.delete(txn)
+    await db.commit()
 
 
 @router.get("/summary", response_model=MonthlySummary)
+@cached("finance")
 async def get_summary(
     month: Optional[str] = None,  # YYYY-MM
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Transaction)
-
-    if month:
-        try:
-            year, mon = month.split("-")
-            query = query.filter(
-                extract("year", Transaction.date) == int(year),
-                extract("month", Transaction.date) == int(mon),
-            )
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
-    else:
-        # Default to current month
-        today = date.today()
-        query = query.filter(
-            extract("year", Transaction.date) == today.year,
-            extract("month", Transaction.date) == today.month,
-        )
-
-    transactions = query.all()
+    # Default to current month
+    start, end = _month_range(month or date.today().strftime("%Y-%m"))
 
-    income = sum(t.amount for t in transactions if t.transaction_type == "income")
-    expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
+    rows = await db.execute(
+        select(Transaction.transaction_type, Transaction.category, func.sum(Transaction.amount))
+        .where(Transaction.date >= start, Transaction.date < end)
+        .group_by(Transaction.transaction_type, Transaction.category)
+    )
 
+    income = expenses = 0.0
     by_category: dict[str, float] = {}
-    for t in transactions:
-        if t.transaction_type == "expense":
-            by_category[t.category] = by_category.get(t.category, 0) + t.amount
+    for transaction_type, category, total in rows:
+        if transaction_type == "income":
+            income += total
+        elif transaction_type == "expense":
+            expenses += total
+            by_category[category] = total
 
     return MonthlySummary(
         income=round(income, 2),
@@ -152,65 +250,130 @@ async def get_summary(
 
 
 @router.get("/trends", response_model=list[MonthlyTrend])
-async def get_trends(months: int = 6, db: Session = Depends(get_db)):
-    """Get monthly income/expenses over the last N months."""
+@cached("finance")
+async def get_trends(months: int = 6, db: AsyncSession = Depends(get_read_db)):
+    """Get monthly income/expenses (and expenses per category) over the last N months."""
     today = date.today()
 
-    result = []
-    for i in range(months - 1, -1, -1):
-        # Calculate target month
-        year = today.year
-        month = today.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-
-        transactions = (
-            db.query(Transaction)
-            .filter(
-                extract("year", Transaction.date) == year,
-                extract("month", Transaction.date) == month,
-            )
-            .all()
-        )
-
-        income = sum(t.amount for t in transactions if t.transaction_type == "income")
-        expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
-
-        result.append(
-            MonthlyTrend(
-                month=f"{year}-{month:02d}",
-                income=round(income, 2),
-                expenses=round(expenses, 2),
-            )
-        )
+    # Month keys for the window, oldest first
+    year = today.year
+    month = today.month - (months - 1)
+    while month <= 0:
+        month += 12
+        year -= 1
+    keys = []
+    for _ in range(months):
+        keys.append(f"{year}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    if not keys:
+        return []
+
+    result = {key: MonthlyTrend(month=key, income=0.0, expenses=0.0, by_category={}) for key in keys}
+    start, _ = _month_range(keys[0])
+    _, end = _month_range(keys[-1])
+
+    bucket = year_month(Transaction.date)
+    rows = await db.execute(
+        select(bucket, Transaction.transaction_type, Transaction.category, func.sum(Transaction.amount))
+        .where(Transaction.date >= start, Transaction.date < end)
+        .group_by(bucket, Transaction.transaction_type, Transaction.category)
+    )
 
-    return result
+    for key, transaction_type, category, total in rows:
+        trend = result[key]
+        if transaction_type == "income":
+            trend.income += total
+        elif transaction_type == "expense":
+            trend.expenses += total
+            trend.by_category[category] = round(total, 2)
+
+    for trend in result.values():
+        trend.income = round(trend.income, 2)
+        trend.expenses = round(trend.expenses, 2)
+    return list(result.values())
+
+
+async def _csv_records(stream, encoding: str, delimiter: str):
+    """Yield CSV rows from an async byte stream without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = record = ""
+    async for chunk in stream:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            record += line + "\n"
+            # An odd number of quotes means a quoted field spans lines
+            if record.count('"') % 2 == 0:
+                yield next(csv.reader([record], delimiter=delimiter), [])
+                record = ""
+    record += pending + decoder.decode(b"", final=True)
+    if record.strip():
+        yield next(csv.reader([record], delimiter=delimiter), [])
+
+
+def _parse_import_row(row: list[str], index: dict[str, int], date_format: str,
+                      decimal: str, default_category: str) -> dict:
+    raw_amount = row[index["amount"]].strip().replace(" ", "")
+    if decimal == ",":
+        raw_amount = raw_amount.replace(".", "").replace(",", ".")
+    else:
+        raw_amount = raw_amount.replace(",", "")
+    amount = round(float(raw_amount), 2)
+
+    if "transaction_type" in index:
+        transaction_type = row[index["transaction_type"]].strip().lower()
+        if transaction_type not in ("income", "expense"):
+            raise ValueError(f"invalid transaction type {transaction_type!r}")
+    else:
+        transaction_type = "expense" if amount < 0 else "income"
+
+    description = row[index["description"]].strip() if "description" in index else ""
+    category = row[index["category"]].strip() if "category" in index else ""
+    return {
+        "date": datetime.strptime(row[index["date"]].strip(), date_format).date(),
+        "amount": abs(amount),
+        "transaction_type": transaction_type,
+        "description": description or None,
+        "category": category or default_category,
+    }
+
+
+def _month_range(month: str) -> tuple[date, date]:
+    """Half-open [first day, first day of next month) range for a YYYY-MM string."""
+    try:
+        year, mon = (int(part) for part in month.split("-"))
+        start = date(year, mon, 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+    end = date(year + 1, 1, 1) if mon == 12 else date(year, mon + 1, 1)
+    return start, end
 
 
 # Budget endpoints
 @router.post("/budgets", response_model=BudgetResponse, status_code=201)
-async def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
+@invalidates("finance")
+async def create_budget(budget: BudgetCreate, db: AsyncSession = Depends(get_db)):
     # Check for duplicate category
-    existing = db.query(Budget).filter(Budget.category == budget.category).first()
+    existing = await db.scalar(select(Budget).where(Budget.category == budget.category))
     if existing:
         raise HTTPException(status_code=400, detail="Budget for this category already exists")
 
     db_budget = Budget(**budget.model_dump())
     db.add(db_budget)
-    db.commit()
-    db.refresh(db_budget)
+    await db.commit()
+    await db.refresh(db_budget)
     return db_budget
 
 
 @router.get("/budgets", response_model=list[BudgetResponse])
-async def list_budgets(db: Session = Depends(get_db)):
-    return db.query(Budget).order_by(Budget.category).all()
+async def list_budgets(db: AsyncSession = Depends(get_read_db)):
+    result = await db.scalars(select(Budget).order_by(Budget.category))
+    return result.all()
 
 
 @router.put("/budgets/{budget_id}", response_model=BudgetResponse)
-async def update_budget(budget_id: int, update: BudgetUpdate, db: Session = Depends(get_db)):
-    budget = db.query(Budget).filter(Budget.id == budget_id).first()
+@invalidates("finance")
+async def update_budget(budget_id: int, update: BudgetUpdate, db: AsyncSession = Depends(get_db)):
+    budget = await db.get(Budget, budget_id)
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
 
@@ -218,15 +381,16 @@ async def update_budget(budget_id: int, update: BudgetUpdate, db: Session = Depe
     for key, value in update_data.items():
         setattr(budget, key, value)
 
-    db.commit()
-    db.refresh(budget)
+    await db.commit()
+    await db.refresh(budget)
     return budget
 
 
 @router.delete("/budgets/{budget_id}", status_code=204)
-async def delete_budget(budget_id: int, db: Session = Depends(get_db)):
-    budget = db.query(Budget).filter(Budget.id == budget_id).first()
+@invalidates("finance")
+async def delete_budget(budget_id: int, db: AsyncSession = Depends(get_db)):
+    budget = await db.get(Budget, budget_id)
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
-    db.delete(budget)
-    db.commit()
+    await db.delete(budget)
+    await db.commit()
@@ -2,15 +2,19 @@
 
 from datetime import datetime, date, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, func, literal
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_db, get_read_db
+from etags import versioned
 from models import Workout, Exercise, WorkoutTemplate
+from streaks import islands, fold_islands
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(Workout, Exercise, WorkoutTemplate))])
 
 
 # Pydantic models
@@ -70,10 +74,18 @@ class WorkoutTemplateResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PeriodCount(BaseModel):
+    period: str  # week start (YYYY-MM-DD) or month (YYYY-MM)
+    count: int
+
+
 class FitnessStats(BaseModel):
     total_workouts: int
     this_week: int
     streak: int
+    longest_streak: int
+    weekly: list[PeriodCount]
+    monthly: list[PeriodCount]
 
 
 class ExerciseHistory(BaseModel):
@@ -85,107 +97,65 @@ class ExerciseHistory(BaseModel):
 
 # Workout endpoints
 @router.post("/workouts", response_model=WorkoutResponse, status_code=201)
-async def create_workout(workout: WorkoutCreate, db: Session = Depends(get_db)):
-    # Create workout
+async def create_workout(workout: WorkoutCreate, db: AsyncSession = Depends(get_db)):
+    # Workout and exercises go in one transaction; the exercises are a
+    # single multi-row INSERT ... RETURNING
     workout_data = workout.model_dump(exclude={"exercises"})
     db_workout = Workout(**workout_data)
     db.add(db_workout)
-    db.commit()
-    db.refresh(db_workout)
+    await db.flush()
 
-    # Create exercises
     exercises = []
-    for ex in workout.exercises:
-        db_exercise = Exercise(workout_id=db_workout.id, **ex.model_dump())
-        db.add(db_exercise)
-        exercises.append(db_exercise)
-
-    if exercises:
-        db.commit()
-        for ex in exercises:
-            db.refresh(ex)
-
-    # Build response
-    response = WorkoutResponse(
-        id=db_workout.id,
-        date=db_workout.date,
-        workout_type=db_workout.workout_type,
-        name=db_workout.name,
-        duration_minutes=db_workout.duration_minutes,
-        notes=db_workout.notes,
-        created_at=db_workout.created_at,
-        exercises=[ExerciseResponse.model_validate(ex) for ex in exercises],
-    )
-    return response
+    if workout.exercises:
+        exercises = (await db.scalars(
+            insert(Exercise).returning(Exercise, sort_by_parameter_order=True),
+            [{"workout_id": db_workout.id, **ex.model_dump()} for ex in workout.exercises],
+        )).all()
+    set_committed_value(db_workout, "exercises", list(exercises))
+
+    await db.commit()
+    return db_workout
 
 
 @router.get("/workouts", response_model=list[WorkoutResponse])
-async def list_workouts(limit: int = 20, db: Session = Depends(get_db)):
-    workouts = (
-        db.query(Workout)
+async def list_workouts(limit: int = 20, db: AsyncSession = Depends(get_read_db)):
+    result = await db.scalars(
+        select(Workout)
+        .options(selectinload(Workout.exercises))
         .order_by(Workout.date.desc(), Workout.created_at.desc())
         .limit(limit)
-        .all()
     )
-
-    result = []
-    for w in workouts:
-        exercises = db.query(Exercise).filter(Exercise.workout_id == w.id).all()
-        result.append(
-            WorkoutResponse(
-                id=w.id,
-                date=w.date,
-                workout_type=w.workout_type,
-                name=w.name,
-                duration_minutes=w.duration_minutes,
-                notes=w.notes,
-                created_at=w.created_at,
-                exercises=[ExerciseResponse.model_validate(ex) for ex in exercises],
-            )
-        )
-    return result
+    return result.all()
 
 
 @router.get("/workouts/{workout_id}", response_model=WorkoutResponse)
-async def get_workout(workout_id: int, db: Session = Depends(get_db)):
-    workout = db.query(Workout).filter(Workout.id == workout_id).first()
+async def get_workout(workout_id: int, db: AsyncSession = Depends(get_read_db)):
+    workout = await db.get(Workout, workout_id, options=[selectinload(Workout.exercises)])
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
-
-    exercises = db.query(Exercise).filter(Exercise.workout_id == workout.id).all()
-    return WorkoutResponse(
-        id=workout.id,
-        date=workout.date,
-        workout_type=workout.workout_type,
-        name=workout.name,
-        duration_minutes=workout.duration_minutes,
-        notes=workout.notes,
-        created_at=workout.created_at,
-        exercises=[ExerciseResponse.model_validate(ex) for ex in exercises],
-    )
+    return workout
 
 
 @router.delete("/workouts/{workout_id}", status_code=204)
-async def delete_workout(workout_id: int, db: Session = Depends(get_db)):
-    workout = db.query(Workout).filter(Workout.id == workout_id).first()
+async def delete_workout(workout_id: int, db: AsyncSession = Depends(get_db)):
+    workout = await db.get(Workout, workout_id)
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
 
-    db.query(Exercise).filter(Exercise.workout_id == workout_id).delete()
-    db.delete(workout)
-    db.commit()
+    await db.execute(delete(Exercise).where(Exercise.workout_id == workout_id))
+    await db.delete(workout)
+    await db.commit()
 
 
 @router.get("/exercises/{name}/history", response_model=list[ExerciseHistory])
-async def get_exercise_history(name: str, db: Session = Depends(get_db)):
+async def get_exercise_history(name: str, db: AsyncSession = Depends(get_read_db)):
     """Get history for a specific exercise name (weight over time)."""
-    results = (
-        db.query(Exercise, Workout.date)
+    results = (await db.execute(
+        select(Exercise, Workout.date)
         .join(Workout, Exercise.workout_id == Workout.id)
-        .filter(Exercise.name == name)
+        .where(Exercise.name == name)
         .order_by(Workout.date.asc())
-        .all()
-    )
+    )).all()
 
     return [
         ExerciseHistory(
@@ -200,56 +170,76 @@ async def get_exercise_history(name: str, db: Session = Depends(get_db)):
 
 # Template endpoints
 @router.get("/templates", response_model=list[WorkoutTemplateResponse])
-async def list_templates(db: Session = Depends(get_db)):
-    return db.query(WorkoutTemplate).all()
+async def list_templates(db: AsyncSession = Depends(get_read_db)):
+    result = await db.scalars(select(WorkoutTemplate))
+    return result.all()
 
 
 @router.post("/templates", response_model=WorkoutTemplateResponse, status_code=201)
-async def create_template(template: WorkoutTemplateCreate, db: Session = Depends(get_db)):
+async def create_template(template: WorkoutTemplateCreate, db: AsyncSession = Depends(get_db)):
     db_template = WorkoutTemplate(**template.model_dump())
     db.add(db_template)
-    db.commit()
-    db.refresh(db_template)
+    await db.commit()
+    await db.refresh(db_template)
     return db_template
 
 
 @router.delete("/templates/{template_id}", status_code=204)
-async def delete_template(template_id: int, db: Session = Depends(get_db)):
-    template = db.query(WorkoutTemplate).filter(WorkoutTemplate.id == template_id).first()
+async def delete_template(template_id: int, db: AsyncSession = Depends(get_db)):
+    template = await db.get(WorkoutTemplate, template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
-    db.delete(template)
-    db.commit()
+    await db.delete(template)
+    await db.commit()
 
 
 # Stats endpoint
 @router.get("/stats", response_model=FitnessStats)
-async def get_stats(db: Session = Depends(get_db)):
-    total_workouts = db.query(Workout).count()
-
-    # This week (Monday to today)
+async def get_stats(
+    weeks: int = Query(12, ge=1, le=104),
+    months: int = Query(12, ge=1, le=60),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Totals, streaks and weekly/monthly workout counts in three queries."""
     today = date.today()
     monday = today - timedelta(days=today.weekday())
-    this_week = db.query(Workout).filter(Workout.date >= monday).count()
-
-    # Calculate streak: consecutive days with workouts ending today or yesterday
-    streak = 0
-    check_date = today
-    # Allow for today not having a workout yet
-    has_today = db.query(Workout).filter(Workout.date == today).count() > 0
-    if not has_today:
-        check_date = today - timedelta(days=1)
-
-    while True:
-        count = db.query(Workout).filter(Workout.date == check_date).count()
-        if count > 0:
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
-            break
+    first_week = monday - timedelta(weeks=weeks - 1)
+    first_month = _shift_month(today.replace(day=1), -(months - 1))
+
+    total_workouts = await db.scalar(select(func.count()).select_from(Workout))
+
+    # Per-day counts over the charting window, bucketed below
+    per_day = (await db.execute(
+        select(Workout.date, func.count())
+        .where(Workout.date >= min(first_week, first_month), Workout.date <= today)
+        .group_by(Workout.date)
+    )).all()
+
+    weekly = {first_week + timedelta(weeks=i): 0 for i in range(weeks)}
+    monthly = {_shift_month(first_month, i): 0 for i in range(months)}
+    for day, count in per_day:
+        week = day - timedelta(days=day.weekday())
+        if week in weekly:
+            weekly[week] += count
+        month = day.replace(day=1)
+        if month in monthly:
+            monthly[month] += count
+
+    # Streaks: one row per run of consecutive workout days
+    days = select(literal(0), Workout.date).distinct()
+    streaks = fold_islands(await db.execute(islands(days)), [0])[0]
 
     return FitnessStats(
         total_workouts=total_workouts,
-        this_week=this_week,
-        streak=streak,
+        this_week=weekly.get(monday, 0),
+        streak=streaks["current_streak"],
+        longest_streak=streaks["longest_streak"],
+        weekly=[PeriodCount(period=w.isoformat(), count=n) for w, n in weekly.items()],
+        monthly=[PeriodCount(period=m.strftime("%Y-%m"), count=n) for m, n in monthly.items()],
     )
+
+
+def _shift_month(first_of_month: date, offset: int) -> date:
+    """Move a first-of-month date by ``offset`` months."""
+    index = first_of_month.year * 12 + first_of_month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
@@ -3,13 +3,17 @@
 from datetime import datetime, date
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from database import get_db
+from cache import cached, invalidates
+from database import get_db, get_read_db
+from etags import versioned
 from models import Goal, Milestone
+from pagination import Page, PageParams, DateRange, paginate
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(Goal, Milestone))])
 
 
 # Pydantic models
@@ -83,8 +87,9 @@ class GoalStats(BaseModel):
 
 # Goal endpoints
 @router.get("/stats", response_model=GoalStats)
-async def get_stats(db: Session = Depends(get_db)):
-    goals = db.query(Goal).all()
+@cached("goals")
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
+    goals = (await db.scalars(select(Goal))).all()
     total = len(goals)
     completed = sum(1 for g in goals if g.status == "completed")
     active = sum(1 for g in goals if g.status == "active")
@@ -102,40 +107,43 @@ async def get_stats(db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=GoalResponse, status_code=201)
-async def create_goal(goal: GoalCreate, db: Session = Depends(get_db)):
+@invalidates("goals")
+async def create_goal(goal: GoalCreate, db: AsyncSession = Depends(get_db)):
     db_goal = Goal(**goal.model_dump())
     db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    await db.commit()
+    await db.refresh(db_goal)
     return db_goal
 
 
-@router.get("/", response_model=list[GoalResponse])
+@router.get("/", response_model=Page[GoalResponse])
 async def list_goals(
     status: Optional[str] = None,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    created: DateRange = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Goal)
+    """Newest first; from/to bound the creation date."""
+    query = created.apply(select(Goal), Goal.created_at)
     if status:
-        query = query.filter(Goal.status == status)
+        query = query.where(Goal.status == status)
     if category:
-        query = query.filter(Goal.category == category)
-    return query.order_by(Goal.created_at.desc()).all()
+        query = query.where(Goal.category == category)
+    return await paginate(db, query, Goal, [("created_at", True), ("id", True)], page)
 
 
 @router.get("/{goal_id}", response_model=GoalWithMilestones)
-async def get_goal(goal_id: int, db: Session = Depends(get_db)):
-    goal = db.query(Goal).filter(Goal.id == goal_id).first()
+async def get_goal(goal_id: int, db: AsyncSession = Depends(get_read_db)):
+    goal = await db.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    milestones = (
-        db.query(Milestone)
-        .filter(Milestone.goal_id == goal_id)
+    milestones = (await db.scalars(
+        select(Milestone)
+        .where(Milestone.goal_id == goal_id)
         .order_by(Milestone.sort_order)
-        .all()
-    )
+    )).all()
 
     return GoalWithMilestones(
         id=goal.id,
@@ -152,8 +160,9 @@ async def get_goal(goal_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{goal_id}", response_model=GoalResponse)
-async def update_goal(goal_id: int, update: GoalUpdate, db: Session = Depends(get_db)):
-    goal = db.query(Goal).filter(Goal.id == goal_id).first()
+@invalidates("goals")
+async def update_goal(goal_id: int, update: GoalUpdate, db: AsyncSession = Depends(get_db)):
+    goal = await db.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
@@ -161,47 +170,49 @@ async def update_goal(goal_id: int, update: GoalUpdate, db: Session = Depends(ge
     for key, value in update_data.items():
         setattr(goal, key, value)
 
-    db.commit()
-    db.refresh(goal)
+    await db.commit()
+    await db.refresh(goal)
     return goal
 
 
 @router.delete("/{goal_id}", status_code=204)
-async def delete_goal(goal_id: int, db: Session = Depends(get_db)):
-    goal = db.query(Goal).filter(Goal.id == goal_id).first()
+@invalidates("goals")
+async def delete_goal(goal_id: int, db: AsyncSession = Depends(get_db)):
+    goal = await db.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    db.query(Milestone).filter(Milestone.goal_id == goal_id).delete()
-    db.delete(goal)
-    db.commit()
+    await db.execute(delete(Milestone).where(Milestone.goal_id == goal_id))
+    await db.delete(goal)
+    await db.commit()
 
 
 # Milestone endpoints
 @router.post("/{goal_id}/milestones", response_model=MilestoneResponse, status_code=201)
-async def create_milestone(goal_id: int, milestone: MilestoneCreate, db: Session = Depends(get_db)):
-    goal = db.query(Goal).filter(Goal.id == goal_id).first()
+@invalidates("goals")
+async def create_milestone(goal_id: int, milestone: MilestoneCreate, db: AsyncSession = Depends(get_db)):
+    goal = await db.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
     db_milestone = Milestone(goal_id=goal_id, **milestone.model_dump())
     db.add(db_milestone)
-    db.commit()
-    db.refresh(db_milestone)
+    await db.commit()
+    await db.refresh(db_milestone)
     return db_milestone
 
 
 @router.put("/{goal_id}/milestones/{milestone_id}", response_model=MilestoneResponse)
+@invalidates("goals")
 async def update_milestone(
     goal_id: int,
     milestone_id: int,
     update: MilestoneUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    milestone = (
-        db.query(Milestone)
-        .filter(Milestone.id == milestone_id, Milestone.goal_id == goal_id)
-        .first()
+    milestone = await db.scalar(
+        select(Milestone)
+        .where(Milestone.id == milestone_id, Milestone.goal_id == goal_id)
     )
     if not milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
@@ -217,19 +228,19 @@ async def update_milestone(
     for key, value in update_data.items():
         setattr(milestone, key, value)
 
-    db.commit()
-    db.refresh(milestone)
+    await db.commit()
+    await db.refresh(milestone)
     return milestone
 
 
 @router.delete("/{goal_id}/milestones/{milestone_id}", status_code=204)
-async def delete_milestone(goal_id: int, milestone_id: int, db: Session = Depends(get_db)):
-    milestone = (
-        db.query(Milestone)
-        .filter(Milestone.id == milestone_id, Milestone.goal_id == goal_id)
-        .first()
+@invalidates("goals")
+async def delete_milestone(goal_id: int, milestone_id: int, db: AsyncSession = Depends(get_db)):
+    milestone = await db.scalar(
+        select(Milestone)
+        .where(Milestone.id == milestone_id, Milestone.goal_id == goal_id)
     )
     if not milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
-    db.delete(milestone)
-    db.commit()
+    await db.delete(milestone)
+    await db.commit()
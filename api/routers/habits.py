@@ -3,14 +3,18 @@
 from datetime import datetime, date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, case
+from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel
 
-from database import get_db
-from models import Habit, HabitLog
+from cache import cached, invalidates
+from database import get_db, get_read_db
+from etags import versioned
+from models import Habit, HabitLog, HabitStreak
+from streaks import islands, fold_islands, summarize_islands, current_streak
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(Habit, HabitLog, HabitStreak))])
 
 
 # Pydantic models
@@ -83,60 +87,74 @@ class HabitStats(BaseModel):
 async def list_habits(
     category: Optional[str] = None,
     active: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Habit)
+    query = select(Habit)
     if category:
-        query = query.filter(Habit.category == category)
+        query = query.where(Habit.category == category)
     if active is not None:
-        query = query.filter(Habit.active == active)
-    return query.order_by(Habit.created_at.desc()).all()
+        query = query.where(Habit.active == active)
+    result = await db.scalars(query.order_by(Habit.created_at.desc()))
+    return result.all()
 
 
 @router.post("/", response_model=HabitResponse, status_code=201)
-async def create_habit(habit: HabitCreate, db: Session = Depends(get_db)):
+@invalidates("habits")
+async def create_habit(habit: HabitCreate, db: AsyncSession = Depends(get_db)):
     db_habit = Habit(**habit.model_dump())
     db.add(db_habit)
-    db.commit()
-    db.refresh(db_habit)
+    await db.flush()
+    db.add(HabitStreak(habit_id=db_habit.id))
+    await db.commit()
+    await db.refresh(db_habit)
     return db_habit
 
 
 @router.get("/heatmap", response_model=list[HeatmapEntry])
-async def get_heatmap(days: int = 365, db: Session = Depends(get_db)):
+@cached("habits")
+async def get_heatmap(days: int = 365, db: AsyncSession = Depends(get_read_db)):
     """Get completion data for heatmap visualization (all habits combined)."""
     start_date = date.today() - timedelta(days=days)
 
     # Query daily completion counts
-    results = (
-        db.query(
+    results = (await db.execute(
+        select(
             HabitLog.date,
             func.count(HabitLog.id).label("count")
         )
-        .filter(HabitLog.date >= start_date, HabitLog.completed == True)
+        .where(HabitLog.date >= start_date, HabitLog.completed == True)
         .group_by(HabitLog.date)
         .order_by(HabitLog.date)
-        .all()
-    )
+    )).all()
 
     return [HeatmapEntry(date=r.date, count=r.count) for r in results]
 
 
-@router.get("/stats", response_model=HabitStats)
-async def get_stats(db: Session = Depends(get_db)):
-    """Get overall habit statistics."""
-    total_habits = db.query(Habit).count()
-    active_habits = db.query(Habit).filter(Habit.active == True).count()
+@router.get("/streaks", response_model=list[StreakResponse])
+async def list_streaks(active: Optional[bool] = None, db: AsyncSession = Depends(get_read_db)):
+    """Get current and longest streaks for all habits in one query."""
+    query = select(Habit.id)
+    if active is not None:
+        query = query.where(Habit.active == active)
+    habit_ids = (await db.scalars(query.order_by(Habit.created_at.desc()))).all()
+
+    streaks = await calculate_streaks(db, habit_ids)
+    return [StreakResponse(habit_id=habit_id, **streaks[habit_id]) for habit_id in habit_ids]
 
-    # Calculate completion rates
-    today = date.today()
-    seven_days_ago = today - timedelta(days=7)
-    thirty_days_ago = today - timedelta(days=30)
 
-    # Get active habits for expected completions
-    active_habit_ids = [h.id for h in db.query(Habit).filter(Habit.active == True).all()]
+@router.get("/stats", response_model=HabitStats)
+@cached("habits")
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
+    """Get overall habit statistics."""
+    counts = (await db.execute(
+        select(
+            func.count(Habit.id),
+            func.count(case((Habit.active == True, 1))),
+        )
+    )).one()
+    total_habits, active_habits = counts
 
-    if not active_habit_ids:
+    if not active_habits:
         return HabitStats(
             total_habits=total_habits,
             active_habits=active_habits,
@@ -145,51 +163,51 @@ async def get_stats(db: Session = Depends(get_db)):
             active_streaks=0
         )
 
-    # 7-day completion rate
-    completions_7d = db.query(HabitLog).filter(
-        HabitLog.date >= seven_days_ago,
-        HabitLog.completed == True,
-        HabitLog.habit_id.in_(active_habit_ids)
-    ).count()
-    expected_7d = len(active_habit_ids) * 7
-    rate_7d = round((completions_7d / expected_7d) * 100, 1) if expected_7d > 0 else None
-
-    # 30-day completion rate
-    completions_30d = db.query(HabitLog).filter(
-        HabitLog.date >= thirty_days_ago,
-        HabitLog.completed == True,
-        HabitLog.habit_id.in_(active_habit_ids)
-    ).count()
-    expected_30d = len(active_habit_ids) * 30
-    rate_30d = round((completions_30d / expected_30d) * 100, 1) if expected_30d > 0 else None
-
-    # Count active streaks (habits with completion yesterday or today)
-    active_streaks = 0
-    for habit_id in active_habit_ids:
-        streak = _calculate_streak(db, habit_id)
-        if streak["current_streak"] > 0:
-            active_streaks += 1
+    today = date.today()
+    seven_days_ago = today - timedelta(days=7)
+    thirty_days_ago = today - timedelta(days=30)
+
+    # Completions of active habits in both windows, plus how many habits were
+    # completed today or yesterday (i.e. have a running streak), in one pass
+    completions = (await db.execute(
+        select(
+            func.count(case((HabitLog.date >= seven_days_ago, 1))),
+            func.count(),
+            func.count(func.distinct(case(
+                (HabitLog.date.between(today - timedelta(days=1), today), HabitLog.habit_id)
+            ))),
+        )
+        .select_from(HabitLog)
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .where(
+            Habit.active == True,
+            HabitLog.completed == True,
+            HabitLog.date >= thirty_days_ago,
+        )
+    )).one()
+    completions_7d, completions_30d, active_streaks = completions
 
     return HabitStats(
         total_habits=total_habits,
         active_habits=active_habits,
-        completion_rate_7d=rate_7d,
-        completion_rate_30d=rate_30d,
+        completion_rate_7d=round((completions_7d / (active_habits * 7)) * 100, 1),
+        completion_rate_30d=round((completions_30d / (active_habits * 30)) * 100, 1),
         active_streaks=active_streaks
     )
 
 
 @router.get("/{habit_id}", response_model=HabitResponse)
-async def get_habit(habit_id: int, db: Session = Depends(get_db)):
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+async def get_habit(habit_id: int, db: AsyncSession = Depends(get_read_db)):
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     return habit
 
 
 @router.patch("/{habit_id}", response_model=HabitResponse)
-async def update_habit(habit_id: int, update: HabitUpdate, db: Session = Depends(get_db)):
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+@invalidates("habits")
+async def update_habit(habit_id: int, update: HabitUpdate, db: AsyncSession = Depends(get_db)):
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
 
@@ -197,136 +215,205 @@ async def update_habit(habit_id: int, update: HabitUpdate, db: Session = Depends
     for key, value in update_data.items():
         setattr(habit, key, value)
 
-    db.commit()
-    db.refresh(habit)
+    await db.commit()
+    await db.refresh(habit)
     return habit
 
 
 @router.delete("/{habit_id}", status_code=204)
-async def delete_habit(habit_id: int, db: Session = Depends(get_db)):
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+@invalidates("habits")
+async def delete_habit(habit_id: int, db: AsyncSession = Depends(get_db)):
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
 
     # Also delete associated logs
-    db.query(HabitLog).filter(HabitLog.habit_id == habit_id).delete()
-    db.delete(habit)
-    db.commit()
+    await db.execute(delete(HabitLog).where(HabitLog.habit_id == habit_id))
+    await db.execute(delete(HabitStreak).where(HabitStreak.habit_id == habit_id))
+    await db.delete(habit)
+    await db.commit()
 
 
 @router.post("/{habit_id}/log", response_model=HabitLogResponse, status_code=201)
-async def log_habit(habit_id: int, log: HabitLogCreate, db: Session = Depends(get_db)):
+@invalidates("habits")
+async def log_habit(habit_id: int, log: HabitLogCreate, db: AsyncSession = Depends(get_db)):
     """Log completion for a habit on a specific date."""
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
 
+    try:
+        db_log = await _save_log(db, habit_id, log)
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request logged the same day first; apply this one as an update
+        await db.rollback()
+        db_log = await _save_log(db, habit_id, log)
+        await db.commit()
+    await db.refresh(db_log)
+    return db_log
+
+
+async def _save_log(db: AsyncSession, habit_id: int, log: HabitLogCreate) -> HabitLog:
     # Check if log already exists for this date
-    existing = db.query(HabitLog).filter(
-        HabitLog.habit_id == habit_id,
-        HabitLog.date == log.date
-    ).first()
+    existing = await db.scalar(
+        select(HabitLog).where(
+            HabitLog.habit_id == habit_id,
+            HabitLog.date == log.date
+        )
+    )
 
     if existing:
         # Update existing log
+        was_completed = bool(existing.completed)
         existing.completed = log.completed
         existing.value = log.value
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    # Create new log
-    db_log = HabitLog(
-        habit_id=habit_id,
-        date=log.date,
-        completed=log.completed,
-        value=log.value
-    )
-    db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
+        db_log = existing
+    else:
+        was_completed = False
+        db_log = HabitLog(
+            habit_id=habit_id,
+            date=log.date,
+            completed=log.completed,
+            value=log.value
+        )
+        db.add(db_log)
+
+    await _update_streak(db, habit_id, log.date, was_completed, log.completed)
     return db_log
 
 
 @router.get("/{habit_id}/streak", response_model=StreakResponse)
-async def get_streak(habit_id: int, db: Session = Depends(get_db)):
+async def get_streak(habit_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get current and longest streak for a habit."""
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
 
-    streak_data = _calculate_streak(db, habit_id)
-    return StreakResponse(
-        habit_id=habit_id,
-        current_streak=streak_data["current_streak"],
-        longest_streak=streak_data["longest_streak"]
-    )
+    streaks = await calculate_streaks(db, [habit_id])
+    return StreakResponse(habit_id=habit_id, **streaks[habit_id])
 
 
 @router.get("/{habit_id}/logs", response_model=list[HabitLogResponse])
 async def get_habit_logs(
     habit_id: int,
     days: int = 30,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get logs for a specific habit."""
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
 
     start_date = date.today() - timedelta(days=days)
-    return (
-        db.query(HabitLog)
-        .filter(HabitLog.habit_id == habit_id, HabitLog.date >= start_date)
-        .order_by(HabitLog.date.desc())
-        .all()
-    )
-
-
-def _calculate_streak(db: Session, habit_id: int) -> dict:
-    """Calculate current and longest streak for a habit."""
-    # Get all completed logs ordered by date descending
-    logs = (
-        db.query(HabitLog)
-        .filter(HabitLog.habit_id == habit_id, HabitLog.completed == True)
+    result = await db.scalars(
+        select(HabitLog)
+        .where(HabitLog.habit_id == habit_id, HabitLog.date >= start_date)
         .order_by(HabitLog.date.desc())
-        .all()
     )
+    return result.all()
+
+
+async def calculate_streaks(db: AsyncSession, habit_ids: list[int]) -> dict[int, dict]:
+    """Read current and longest streaks for several habits from streak state.
+
+    Habits with no stored state yet (logged before it existed) fall back to a
+    gaps-and-islands pass over their history; ``rebuild_streaks.py`` persists it.
+    """
+    if not habit_ids:
+        return {}
+
+    states = (await db.scalars(
+        select(HabitStreak).where(HabitStreak.habit_id.in_(habit_ids))
+    )).all()
+    streaks = {
+        s.habit_id: {
+            "current_streak": current_streak(s.run_start, s.last_completed),
+            "longest_streak": s.longest_streak,
+        }
+        for s in states
+    }
 
-    if not logs:
-        return {"current_streak": 0, "longest_streak": 0}
-
-    completed_dates = set(log.date for log in logs)
+    missing = [habit_id for habit_id in habit_ids if habit_id not in streaks]
+    if missing:
+        rows = await db.execute(islands(_completed_days(missing)))
+        streaks.update(fold_islands(rows, missing))
+    return streaks
+
+
+async def rebuild_streaks(db: AsyncSession, habit_ids: Optional[list[int]] = None) -> dict[int, HabitStreak]:
+    """Recompute stored streak state from the full log history.
+
+    Covers all habits when ``habit_ids`` is None. The caller commits.
+    """
+    if habit_ids is None:
+        habit_ids = (await db.scalars(select(Habit.id))).all()
+    if not habit_ids:
+        return {}
+
+    rows = await db.execute(islands(_completed_days(habit_ids)))
+    runs = summarize_islands(rows, habit_ids)
+    states = {
+        s.habit_id: s
+        for s in (await db.scalars(
+            select(HabitStreak).where(HabitStreak.habit_id.in_(habit_ids))
+        )).all()
+    }
+    for habit_id, run in runs.items():
+        state = states.get(habit_id)
+        if state is None:
+            state = states[habit_id] = HabitStreak(habit_id=habit_id)
+            db.add(state)
+        for key, value in run.items():
+            setattr(state, key, value)
+    return states
+
+
+async def _update_streak(db: AsyncSession, habit_id: int, day: date, was_completed: bool, completed: bool):
+    """Apply a single log change to the habit's stored streak state."""
+    if was_completed == completed:
+        return
+
+    state = await db.get(HabitStreak, habit_id)
     today = date.today()
-
-    # Calculate current streak
-    current_streak = 0
-    check_date = today
-
-    # Allow for today not being logged yet - start from yesterday if today not completed
-    if today not in completed_dates:
-        check_date = today - timedelta(days=1)
-
-    while check_date in completed_dates:
-        current_streak += 1
-        check_date -= timedelta(days=1)
-
-    # Calculate longest streak
-    if not completed_dates:
-        return {"current_streak": 0, "longest_streak": 0}
-
-    sorted_dates = sorted(completed_dates)
-    longest_streak = 1
-    current_count = 1
-
-    for i in range(1, len(sorted_dates)):
-        if sorted_dates[i] - sorted_dates[i-1] == timedelta(days=1):
-            current_count += 1
-            longest_streak = max(longest_streak, current_count)
+    # Fast path: a new completion at the end of the history extends the
+    # latest run or starts a new one
+    if (
+        state is not None
+        and completed
+        and day <= today
+        and (state.last_completed is None or day > state.last_completed)
+        and not await _completed_after(db, habit_id, day)
+    ):
+        if state.last_completed == day - timedelta(days=1):
+            state.run_length += 1
         else:
-            current_count = 1
+            state.run_start = day
+            state.run_length = 1
+        state.last_completed = day
+        state.longest_streak = max(state.longest_streak, state.run_length)
+        return
+
+    # Back-dated, future-dated, followed by a later log or un-completed:
+    # recompute this habit only
+    await db.flush()
+    await rebuild_streaks(db, [habit_id])
+
+
+async def _completed_after(db: AsyncSession, habit_id: int, day: date) -> bool:
+    """Whether a completion is already logged after ``day`` (e.g. future-dated)."""
+    return await db.scalar(
+        select(
+            select(HabitLog.id)
+            .where(HabitLog.habit_id == habit_id, HabitLog.date > day, HabitLog.completed == True)
+            .exists()
+        )
+    )
 
-    return {
-        "current_streak": current_streak,
-        "longest_streak": max(longest_streak, current_streak)
-    }
+
+def _completed_days(habit_ids: list[int]):
+    return (
+        select(HabitLog.habit_id, HabitLog.date)
+        .where(HabitLog.habit_id.in_(habit_ids), HabitLog.completed == True)
+        .distinct()
+    )
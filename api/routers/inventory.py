@@ -2,15 +2,18 @@
 
 from datetime import datetime, date
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case
 from pydantic import BaseModel
 
-from database import get_db
-from models import InventoryItem, InventoryCategory
+from cache import cached, invalidates
+from database import get_db, get_read_db
+from etags import versioned
+from models import InventoryItem, InventoryCategory, InventoryItemTag, split_tags
+from pagination import Page, PageParams, paginate
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(InventoryItem, InventoryCategory, InventoryItemTag))])
 
 
 # Pydantic models
@@ -82,53 +85,62 @@ class InventoryStats(BaseModel):
     wishlist_count: int
     ai_suggested_count: int
     total_wishlist_value: Optional[float]
+    total_owned_value: Optional[float]
     categories_used: int
+    by_category: dict[str, int]  # item count per category
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
 
 
 # Item endpoints
-@router.get("/", response_model=list[InventoryItemResponse])
+# Priority (high -> low), then newest first; matches ix_inventory_items_priority
+# (ix_inventory_items_status_priority with a status filter)
+ITEM_ORDER = [("priority_rank", False), ("created_at", True), ("id", True)]
+
+
+@router.get("/", response_model=Page[InventoryItemResponse])
 async def list_items(
     status: Optional[str] = None,
     category: Optional[str] = None,
-    tag: Optional[str] = None,
-    db: Session = Depends(get_db),
+    tag: Optional[list[str]] = Query(None),  # repeat or comma-separate for several
+    tag_mode: str = Query("all", pattern="^(all|any)$"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(InventoryItem)
+    query = select(InventoryItem)
     
     if status:
-        query = query.filter(InventoryItem.status == status)
+        query = query.where(InventoryItem.status == status)
     if category:
-        query = query.filter(InventoryItem.category == category)
-    if tag:
-        query = query.filter(InventoryItem.tags.like(f"%{tag}%"))
-    
-    # Order by priority (high -> low) then created_at
-    priority_order = {"high": 1, "medium": 2, "low": 3}
-    items = query.order_by(InventoryItem.created_at.desc()).all()
+        query = query.where(InventoryItem.category == category)
+    tags = split_tags([t for value in tag or [] for t in value.split(",")])
+    if tags:
+        query = query.where(InventoryItem.id.in_(_tagged_item_ids(tags, tag_mode)))
     
-    # Sort with priority consideration
-    return sorted(items, key=lambda x: (
-        priority_order.get(x.priority or "low", 4),
-        -x.created_at.timestamp()
-    ))
+    return await paginate(db, query, InventoryItem, ITEM_ORDER, page)
 
 
 @router.post("/", response_model=InventoryItemResponse, status_code=201)
-async def create_item(item: InventoryItemCreate, db: Session = Depends(get_db)):
+@invalidates("inventory")
+async def create_item(item: InventoryItemCreate, db: AsyncSession = Depends(get_db)):
     db_item = InventoryItem(**item.model_dump())
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 
 @router.patch("/{item_id}", response_model=InventoryItemResponse)
+@invalidates("inventory")
 async def update_item(
     item_id: int,
     update: InventoryItemUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+    item = await db.get(InventoryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
@@ -136,87 +148,117 @@ async def update_item(
     for key, value in update_data.items():
         setattr(item, key, value)
 
-    db.commit()
-    db.refresh(item)
+    await db.commit()
+    await db.refresh(item)
     return item
 
 
 @router.delete("/{item_id}", status_code=204)
-async def delete_item(item_id: int, db: Session = Depends(get_db)):
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+@invalidates("inventory")
+async def delete_item(item_id: int, db: AsyncSession = Depends(get_db)):
+    item = await db.get(InventoryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
 
 
 @router.get("/stats", response_model=InventoryStats)
-async def get_stats(db: Session = Depends(get_db)):
-    total_owned = db.query(InventoryItem).filter(
-        InventoryItem.status == "owned"
-    ).count()
-    
-    wishlist_count = db.query(InventoryItem).filter(
-        InventoryItem.status == "wishlist"
-    ).count()
-    
-    ai_suggested_count = db.query(InventoryItem).filter(
-        InventoryItem.status == "ai_suggested"
-    ).count()
-    
-    # Calculate total wishlist value
-    wishlist_value_result = db.query(
-        func.sum(InventoryItem.price)
-    ).filter(
-        InventoryItem.status == "wishlist",
-        InventoryItem.price.isnot(None)
-    ).scalar()
-    
-    # Count unique categories used
-    categories_used = db.query(
-        func.count(func.distinct(InventoryItem.category))
-    ).scalar()
-    
+@cached("inventory")
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
+    def count(status):
+        return func.count(case((InventoryItem.status == status, 1)))
+
+    def value(status):
+        return func.sum(case((InventoryItem.status == status, InventoryItem.price)))
+
+    rows = (await db.execute(
+        select(
+            InventoryItem.category,
+            func.count(),
+            count("owned"),
+            count("wishlist"),
+            count("ai_suggested"),
+            value("owned"),
+            value("wishlist"),
+        ).group_by(InventoryItem.category)
+    )).all()
+
     return InventoryStats(
-        total_owned=total_owned,
-        wishlist_count=wishlist_count,
-        ai_suggested_count=ai_suggested_count,
-        total_wishlist_value=wishlist_value_result,
-        categories_used=categories_used or 0
+        total_owned=sum(r[2] for r in rows),
+        wishlist_count=sum(r[3] for r in rows),
+        ai_suggested_count=sum(r[4] for r in rows),
+        total_owned_value=_sum_present(r[5] for r in rows),
+        total_wishlist_value=_sum_present(r[6] for r in rows),
+        categories_used=len(rows),
+        by_category={r[0]: r[1] for r in rows},
     )
 
 
+def _sum_present(values) -> Optional[float]:
+    present = [v for v in values if v is not None]
+    return sum(present) if present else None
+
+
+@router.get("/tags", response_model=list[TagCount])
+async def list_tags(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Tag facet: how many items carry each tag, most used first."""
+    count = func.count().label("count")
+    query = select(InventoryItemTag.tag, count).group_by(InventoryItemTag.tag)
+    if status or category:
+        query = query.join(InventoryItem, InventoryItem.id == InventoryItemTag.item_id)
+        if status:
+            query = query.where(InventoryItem.status == status)
+        if category:
+            query = query.where(InventoryItem.category == category)
+    rows = await db.execute(query.order_by(count.desc(), InventoryItemTag.tag))
+    return [TagCount(tag=tag, count=n) for tag, n in rows]
+
+
+def _tagged_item_ids(tags: list[str], mode: str):
+    """Ids of items carrying all (or any) of ``tags``."""
+    query = select(InventoryItemTag.item_id).where(InventoryItemTag.tag.in_(tags))
+    if mode == "all":
+        query = query.group_by(InventoryItemTag.item_id).having(func.count() == len(tags))
+    return query
+
+
 # Category endpoints
 @router.get("/categories", response_model=list[CategoryResponse])
-async def list_categories(db: Session = Depends(get_db)):
-    return db.query(InventoryCategory).order_by(InventoryCategory.name).all()
+async def list_categories(db: AsyncSession = Depends(get_read_db)):
+    result = await db.scalars(select(InventoryCategory).order_by(InventoryCategory.name))
+    return result.all()
 
 
 @router.post("/categories", response_model=CategoryResponse, status_code=201)
-async def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
+@invalidates("inventory")
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_db)):
     # Check if already exists
-    existing = db.query(InventoryCategory).filter(
-        InventoryCategory.name == category.name
-    ).first()
+    existing = await db.scalar(
+        select(InventoryCategory).where(InventoryCategory.name == category.name)
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Category already exists")
     
     db_category = InventoryCategory(**category.model_dump())
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    await db.refresh(db_category)
     return db_category
 
 
 @router.patch("/categories/{category_id}", response_model=CategoryResponse)
+@invalidates("inventory")
 async def update_category(
     category_id: int,
     update: CategoryUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    category = db.query(InventoryCategory).filter(
-        InventoryCategory.id == category_id
-    ).first()
+    category = await db.get(InventoryCategory, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
@@ -224,28 +266,29 @@ async def update_category(
     for key, value in update_data.items():
         setattr(category, key, value)
 
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
     return category
 
 
 @router.delete("/categories/{category_id}", status_code=204)
-async def delete_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(InventoryCategory).filter(
-        InventoryCategory.id == category_id
-    ).first()
+@invalidates("inventory")
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_db)):
+    category = await db.get(InventoryCategory, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
     # Check if any items use this category
-    items_count = db.query(InventoryItem).filter(
-        InventoryItem.category == category.name
-    ).count()
+    items_count = await db.scalar(
+        select(func.count()).select_from(InventoryItem).where(
+            InventoryItem.category == category.name
+        )
+    )
     if items_count > 0:
         raise HTTPException(
             status_code=400,
             detail=f"Cannot delete category: {items_count} item(s) still use it"
         )
     
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
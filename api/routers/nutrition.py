@@ -3,14 +3,16 @@
 from datetime import datetime, date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_db, get_read_db
+from etags import versioned
 from models import MealEntry, WaterIntake
+from pagination import Page, PageParams, DateRange, paginate
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(MealEntry, WaterIntake))])
 
 
 # Pydantic models
@@ -76,40 +78,45 @@ class WaterUpdate(BaseModel):
 
 # Meal endpoints
 @router.post("/", response_model=MealResponse, status_code=201)
-async def log_meal(meal: MealCreate, db: Session = Depends(get_db)):
+async def log_meal(meal: MealCreate, db: AsyncSession = Depends(get_db)):
     db_meal = MealEntry(**meal.model_dump())
     db.add(db_meal)
-    db.commit()
-    db.refresh(db_meal)
+    await db.commit()
+    await db.refresh(db_meal)
     return db_meal
 
 
-@router.get("/", response_model=list[MealResponse])
+@router.get("/", response_model=Page[MealResponse])
 async def list_meals(
     date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    dates: DateRange = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(MealEntry)
+    """Newest day first, latest logged first within a day."""
+    query = dates.apply(select(MealEntry), MealEntry.date)
     if date:
-        query = query.filter(MealEntry.date == date)
-    return query.order_by(MealEntry.date.desc(), MealEntry.created_at.desc()).all()
+        query = query.where(MealEntry.date == date)
+    return await paginate(db, query, MealEntry, [("date", True), ("id", True)], page)
 
 
 @router.get("/daily-totals", response_model=DailyTotals)
 async def get_daily_totals(
     date: date = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     if date is None:
         from datetime import date as date_cls
         date = date_cls.today()
 
-    result = db.query(
-        func.coalesce(func.sum(MealEntry.calories), 0).label("total_calories"),
-        func.coalesce(func.sum(MealEntry.protein_g), 0).label("total_protein"),
-        func.coalesce(func.sum(MealEntry.carbs_g), 0).label("total_carbs"),
-        func.coalesce(func.sum(MealEntry.fat_g), 0).label("total_fat"),
-    ).filter(MealEntry.date == date).first()
+    result = (await db.execute(
+        select(
+            func.coalesce(func.sum(MealEntry.calories), 0).label("total_calories"),
+            func.coalesce(func.sum(MealEntry.protein_g), 0).label("total_protein"),
+            func.coalesce(func.sum(MealEntry.carbs_g), 0).label("total_carbs"),
+            func.coalesce(func.sum(MealEntry.fat_g), 0).label("total_fat"),
+        ).where(MealEntry.date == date)
+    )).first()
 
     return DailyTotals(
         total_calories=int(result.total_calories),
@@ -120,22 +127,21 @@ async def get_daily_totals(
 
 
 @router.get("/trends", response_model=list[DailyAverage])
-async def get_trends(days: int = 7, db: Session = Depends(get_db)):
+async def get_trends(days: int = 7, db: AsyncSession = Depends(get_read_db)):
     start_date = date.today() - timedelta(days=days)
 
-    results = (
-        db.query(
+    results = (await db.execute(
+        select(
             MealEntry.date,
             func.coalesce(func.sum(MealEntry.calories), 0).label("avg_calories"),
             func.coalesce(func.sum(MealEntry.protein_g), 0).label("avg_protein"),
             func.coalesce(func.sum(MealEntry.carbs_g), 0).label("avg_carbs"),
             func.coalesce(func.sum(MealEntry.fat_g), 0).label("avg_fat"),
         )
-        .filter(MealEntry.date >= start_date)
+        .where(MealEntry.date >= start_date)
         .group_by(MealEntry.date)
         .order_by(MealEntry.date)
-        .all()
-    )
+    )).all()
 
     return [
         DailyAverage(
@@ -151,33 +157,33 @@ async def get_trends(days: int = 7, db: Session = Depends(get_db)):
 
 # Water intake endpoints
 @router.post("/water", response_model=WaterResponse, status_code=201)
-async def log_water(water: WaterCreate, db: Session = Depends(get_db)):
+async def log_water(water: WaterCreate, db: AsyncSession = Depends(get_db)):
     # Upsert: update if exists for this date, create otherwise
-    existing = db.query(WaterIntake).filter(WaterIntake.date == water.date).first()
+    existing = await db.scalar(select(WaterIntake).where(WaterIntake.date == water.date))
     if existing:
         existing.glasses = water.glasses
         existing.target = water.target
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
+        await db.refresh(existing)
         return existing
 
     db_water = WaterIntake(**water.model_dump())
     db.add(db_water)
-    db.commit()
-    db.refresh(db_water)
+    await db.commit()
+    await db.refresh(db_water)
     return db_water
 
 
 @router.get("/water", response_model=WaterResponse)
 async def get_water(
     date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     if date is None:
         from datetime import date as date_cls
         date = date_cls.today()
 
-    entry = db.query(WaterIntake).filter(WaterIntake.date == date).first()
+    entry = await db.scalar(select(WaterIntake).where(WaterIntake.date == date))
     if not entry:
         # Return default response
         return WaterResponse(
@@ -191,8 +197,8 @@ async def get_water(
 
 
 @router.put("/water/{date}", response_model=WaterResponse)
-async def update_water(date: date, update: WaterUpdate, db: Session = Depends(get_db)):
-    entry = db.query(WaterIntake).filter(WaterIntake.date == date).first()
+async def update_water(date: date, update: WaterUpdate, db: AsyncSession = Depends(get_db)):
+    entry = await db.scalar(select(WaterIntake).where(WaterIntake.date == date))
     if not entry:
         raise HTTPException(status_code=404, detail="Water intake entry not found for this date")
 
@@ -200,6 +206,6 @@ async def update_water(date: date, update: WaterUpdate, db: Session = Depends(ge
     for key, value in update_data.items():
         setattr(entry, key, value)
 
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
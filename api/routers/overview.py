@@ -0,0 +1,199 @@
+"""Dashboard overview — everything the Overview page needs in one request."""
+
+import json
+from datetime import datetime, date, time, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+
+from database import get_read_db
+from etags import versioned
+from models import (
+    Task, SleepEntry, SleepSettings, DailyNote, Habit, HabitLog,
+    HabitStreak, WaterIntake, MealEntry, UserSettings,
+)
+from routers.tasks import TaskResponse
+from routers.sleep import SleepResponse, SleepScore, compute_sleep_score
+from routers.daily import DailyResponse
+from routers.habits import calculate_streaks
+from routers.nutrition import DailyTotals
+from routers.settings import DEFAULT_SETTINGS
+
+router = APIRouter(dependencies=[Depends(versioned(Task, SleepEntry, SleepSettings, DailyNote, Habit, HabitLog, HabitStreak, WaterIntake, MealEntry, UserSettings))])
+
+# Tasks has no toggle in Settings, so the dashboard always shows it
+CORE_MODULES = ["tasks"]
+
+
+class OverviewTasks(BaseModel):
+    items: list[TaskResponse]  # open tasks due within the next 7 days (incl. overdue) + done today
+    overdue_count: int
+    completed_today: int
+
+
+class OverviewSleep(BaseModel):
+    score: SleepScore
+    entries: list[SleepResponse]  # last 7 days, newest first
+
+
+class OverviewHabit(BaseModel):
+    id: int
+    name: str
+    category: Optional[str]
+    icon: Optional[str]
+    target_frequency: Optional[str]
+    completed_today: bool
+    current_streak: int
+    longest_streak: int
+
+
+class OverviewHabits(BaseModel):
+    items: list[OverviewHabit]
+    completion_rate_7d: Optional[float]
+
+
+class OverviewNutrition(BaseModel):
+    water_glasses: int
+    water_target: int
+    totals: DailyTotals
+
+
+class Overview(BaseModel):
+    date: date
+    enabled_modules: list[str]
+    tasks: Optional[OverviewTasks] = None
+    sleep: Optional[OverviewSleep] = None
+    journal: Optional[DailyResponse] = None
+    habits: Optional[OverviewHabits] = None
+    nutrition: Optional[OverviewNutrition] = None
+
+
+@router.get("/", response_model=Overview)
+async def get_overview(db: AsyncSession = Depends(get_read_db)):
+    """Today's dashboard data for every enabled module, from one session."""
+    today = date.today()
+    enabled = await _enabled_modules(db)
+
+    overview = Overview(date=today, enabled_modules=enabled)
+    if "tasks" in enabled:
+        overview.tasks = await _tasks(db, today)
+    if "sleep" in enabled:
+        overview.sleep = await _sleep(db, today)
+    if "journal" in enabled:
+        note = await db.scalar(select(DailyNote).where(DailyNote.date == today))
+        overview.journal = DailyResponse.model_validate(note) if note else None
+    if "habits" in enabled:
+        overview.habits = await _habits(db, today)
+    if "nutrition" in enabled:
+        overview.nutrition = await _nutrition(db, today)
+    return overview
+
+
+async def _enabled_modules(db: AsyncSession) -> list[str]:
+    raw = await db.scalar(
+        select(UserSettings.value).where(UserSettings.key == "enabled_modules")
+    )
+    try:
+        modules = json.loads(raw or DEFAULT_SETTINGS["enabled_modules"])
+    except ValueError:
+        modules = json.loads(DEFAULT_SETTINGS["enabled_modules"])
+    return CORE_MODULES + [m for m in modules if m not in CORE_MODULES]
+
+
+async def _tasks(db: AsyncSession, today: date) -> OverviewTasks:
+    week_end = today + timedelta(days=6)
+    start_of_day = datetime.combine(today, time.min)
+    tasks = (await db.scalars(
+        select(Task)
+        .where(or_(
+            and_(Task.is_open, Task.due_date <= week_end),
+            and_(Task.status == "done", Task.completed_at >= start_of_day),
+        ))
+        .order_by(Task.due_date.asc(), Task.created_at.desc())
+    )).all()
+
+    return OverviewTasks(
+        items=[TaskResponse.model_validate(t) for t in tasks],
+        overdue_count=sum(1 for t in tasks if t.status != "done" and t.due_date < today),
+        completed_today=sum(1 for t in tasks if t.status == "done"),
+    )
+
+
+async def _sleep(db: AsyncSession, today: date) -> OverviewSleep:
+    target_hours = await db.scalar(select(SleepSettings.target_hours).limit(1))
+    entries = (await db.scalars(
+        select(SleepEntry)
+        .where(SleepEntry.date >= today - timedelta(days=7))
+        .order_by(SleepEntry.date.desc())
+    )).all()
+
+    return OverviewSleep(
+        score=compute_sleep_score(entries, target_hours or 8.0),
+        entries=[SleepResponse.model_validate(e) for e in entries],
+    )
+
+
+async def _habits(db: AsyncSession, today: date) -> OverviewHabits:
+    habits = (await db.scalars(
+        select(Habit).where(Habit.active == True).order_by(Habit.created_at.desc())
+    )).all()
+    if not habits:
+        return OverviewHabits(items=[], completion_rate_7d=None)
+
+    habit_ids = [h.id for h in habits]
+    done_today = set((await db.scalars(
+        select(HabitLog.habit_id).where(
+            HabitLog.habit_id.in_(habit_ids),
+            HabitLog.date == today,
+            HabitLog.completed == True,
+        )
+    )).all())
+    completions_7d = await db.scalar(
+        select(func.count()).select_from(HabitLog).where(
+            HabitLog.habit_id.in_(habit_ids),
+            HabitLog.date >= today - timedelta(days=7),
+            HabitLog.completed == True,
+        )
+    )
+    streaks = await calculate_streaks(db, habit_ids)
+
+    return OverviewHabits(
+        items=[
+            OverviewHabit(
+                id=h.id,
+                name=h.name,
+                category=h.category,
+                icon=h.icon,
+                target_frequency=h.target_frequency,
+                completed_today=h.id in done_today,
+                **streaks[h.id],
+            )
+            for h in habits
+        ],
+        completion_rate_7d=round(completions_7d / (len(habits) * 7) * 100, 1),
+    )
+
+
+async def _nutrition(db: AsyncSession, today: date) -> OverviewNutrition:
+    water = await db.scalar(select(WaterIntake).where(WaterIntake.date == today))
+    totals = (await db.execute(
+        select(
+            func.coalesce(func.sum(MealEntry.calories), 0),
+            func.coalesce(func.sum(MealEntry.protein_g), 0),
+            func.coalesce(func.sum(MealEntry.carbs_g), 0),
+            func.coalesce(func.sum(MealEntry.fat_g), 0),
+        ).where(MealEntry.date == today)
+    )).one()
+
+    return OverviewNutrition(
+        water_glasses=water.glasses if water else 0,
+        water_target=water.target if water else 8,
+        totals=DailyTotals(
+            total_calories=int(totals[0]),
+            total_protein=float(totals[1]),
+            total_carbs=float(totals[2]),
+            total_fat=float(totals[3]),
+        ),
+    )
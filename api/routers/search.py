@@ -0,0 +1,42 @@
+"""Full-text search across modules."""
+
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+
+from database import get_read_db
+from etags import versioned
+from fulltext import SOURCES, search as run_search
+from models import Task, DailyNote, MealEntry, InventoryItem, Transaction
+
+# The tables search_index is built from (see fulltext.SOURCES)
+router = APIRouter(dependencies=[Depends(versioned(Task, DailyNote, MealEntry, InventoryItem, Transaction))])
+
+
+class SearchResult(BaseModel):
+    module: str  # tasks, journal, nutrition, inventory, finance
+    id: int
+    date: Optional[date]
+    title: Optional[str]
+    snippet: str  # matched terms wrapped in <mark></mark>
+    score: float
+
+
+@router.get("/", response_model=list[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1),
+    module: Optional[list[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Ranked matches for ``q``, best first, optionally limited to some modules."""
+    modules = [m for m in module or [] if m in SOURCES] if module else None
+    if modules == []:
+        return []
+    rows = await run_search(db, q, modules, limit)
+    return [
+        SearchResult(module=m, id=ref_id, date=day, title=title, snippet=snippet or "", score=score)
+        for m, ref_id, day, title, snippet, score in rows
+    ]
@@ -3,13 +3,15 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_db, get_read_db
+from etags import versioned
 from models import UserSettings
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(UserSettings))])
 
 
 class SettingValue(BaseModel):
@@ -33,9 +35,9 @@ DEFAULT_SETTINGS = {
 
 
 @router.get("/")
-async def get_all_settings(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def get_all_settings(db: AsyncSession = Depends(get_read_db)) -> Dict[str, Any]:
     """Get all settings as a dictionary."""
-    settings = db.query(UserSettings).all()
+    settings = (await db.scalars(select(UserSettings))).all()
     result = {}
 
     # Start with defaults
@@ -52,30 +54,30 @@ async def get_all_settings(db: Session = Depends(get_db)) -> Dict[str, Any]:
 @router.put("/")
 async def update_settings(
     settings_dict: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Update multiple settings (upserts each key)."""
     for key, value in settings_dict.items():
         # Convert value to string for storage
         str_value = str(value) if value is not None else None
 
-        existing = db.query(UserSettings).filter(UserSettings.key == key).first()
+        existing = await db.scalar(select(UserSettings).where(UserSettings.key == key))
         if existing:
             existing.value = str_value
         else:
             new_setting = UserSettings(key=key, value=str_value)
             db.add(new_setting)
 
-    db.commit()
+    await db.commit()
 
     # Return all settings
     return await get_all_settings(db)
 
 
 @router.get("/{key}")
-async def get_setting(key: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def get_setting(key: str, db: AsyncSession = Depends(get_read_db)) -> Dict[str, Any]:
     """Get a single setting by key."""
-    setting = db.query(UserSettings).filter(UserSettings.key == key).first()
+    setting = await db.scalar(select(UserSettings).where(UserSettings.key == key))
 
     if setting:
         return {"key": setting.key, "value": setting.value}
@@ -91,10 +93,10 @@ async def get_setting(key: str, db: Session = Depends(get_db)) -> Dict[str, Any]
 async def set_setting(
     key: str,
     setting: SettingValue,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Set a single setting."""
-    existing = db.query(UserSettings).filter(UserSettings.key == key).first()
+    existing = await db.scalar(select(UserSettings).where(UserSettings.key == key))
 
     if existing:
         existing.value = setting.value
@@ -102,6 +104,6 @@ async def set_setting(
         new_setting = UserSettings(key=key, value=setting.value)
         db.add(new_setting)
 
-    db.commit()
+    await db.commit()
 
     return {"key": key, "value": setting.value}
@@ -3,14 +3,16 @@
 from datetime import datetime, date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from pydantic import BaseModel
 
-from database import get_db
+from cache import cached, invalidates
+from database import get_db, get_read_db
+from etags import versioned
 from models import SleepEntry, SleepSettings
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(SleepEntry, SleepSettings))])
 
 
 class SleepCreate(BaseModel):
@@ -68,18 +70,19 @@ class TargetHours(BaseModel):
 @router.get("/", response_model=list[SleepResponse])
 async def list_sleep(
     limit: int = 30,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return (
-        db.query(SleepEntry)
+    result = await db.scalars(
+        select(SleepEntry)
         .order_by(SleepEntry.date.desc())
         .limit(limit)
-        .all()
     )
+    return result.all()
 
 
 @router.post("/", response_model=SleepResponse, status_code=201)
-async def log_sleep(entry: SleepCreate, db: Session = Depends(get_db)):
+@invalidates("sleep")
+async def log_sleep(entry: SleepCreate, db: AsyncSession = Depends(get_db)):
     # Calculate duration if both times provided
     data = entry.model_dump()
     if data["bedtime"] and data["wake_time"] and not data["duration_hours"]:
@@ -88,21 +91,21 @@ async def log_sleep(entry: SleepCreate, db: Session = Depends(get_db)):
 
     db_entry = SleepEntry(**data)
     db.add(db_entry)
-    db.commit()
-    db.refresh(db_entry)
+    await db.commit()
+    await db.refresh(db_entry)
     return db_entry
 
 
 @router.get("/chart-data", response_model=list[ChartDataEntry])
-async def get_chart_data(days: int = 30, db: Session = Depends(get_db)):
+@cached("sleep")
+async def get_chart_data(days: int = 30, db: AsyncSession = Depends(get_read_db)):
     """Get sleep data for charting."""
     start_date = date.today() - timedelta(days=days)
-    entries = (
-        db.query(SleepEntry)
-        .filter(SleepEntry.date >= start_date)
+    entries = (await db.scalars(
+        select(SleepEntry)
+        .where(SleepEntry.date >= start_date)
         .order_by(SleepEntry.date.asc())
-        .all()
-    )
+    )).all()
 
     return [
         ChartDataEntry(
@@ -115,21 +118,26 @@ async def get_chart_data(days: int = 30, db: Session = Depends(get_db)):
 
 
 @router.get("/score", response_model=SleepScore)
-async def get_sleep_score(db: Session = Depends(get_db)):
+@cached("sleep")
+async def get_sleep_score(db: AsyncSession = Depends(get_read_db)):
     """Calculate composite sleep score based on recent duration, quality, and consistency."""
     # Get target hours
-    settings = db.query(SleepSettings).first()
+    settings = await db.scalar(select(SleepSettings).limit(1))
     target_hours = settings.target_hours if settings else 8.0
 
     # Get last 7 days of sleep data
     week_ago = date.today() - timedelta(days=7)
-    entries = (
-        db.query(SleepEntry)
-        .filter(SleepEntry.date >= week_ago)
+    entries = (await db.scalars(
+        select(SleepEntry)
+        .where(SleepEntry.date >= week_ago)
         .order_by(SleepEntry.date.desc())
-        .all()
-    )
+    )).all()
+
+    return compute_sleep_score(entries, target_hours)
 
+
+def compute_sleep_score(entries: list[SleepEntry], target_hours: float) -> SleepScore:
+    """Score a window of sleep entries (normally the last 7 days)."""
     if not entries:
         return SleepScore(
             score=0,
@@ -201,42 +209,43 @@ async def get_sleep_score(db: Session = Depends(get_db)):
 
 
 @router.get("/target", response_model=TargetHours)
-async def get_sleep_target(db: Session = Depends(get_db)):
+async def get_sleep_target(db: AsyncSession = Depends(get_db)):
     """Get sleep target hours."""
-    settings = db.query(SleepSettings).first()
+    settings = await db.scalar(select(SleepSettings).limit(1))
     if not settings:
         # Create default settings
         settings = SleepSettings(target_hours=8.0)
         db.add(settings)
-        db.commit()
-        db.refresh(settings)
+        await db.commit()
+        await db.refresh(settings)
     return TargetHours(target_hours=settings.target_hours)
 
 
 @router.put("/target", response_model=TargetHours)
-async def set_sleep_target(target: TargetHours, db: Session = Depends(get_db)):
+@invalidates("sleep")
+async def set_sleep_target(target: TargetHours, db: AsyncSession = Depends(get_db)):
     """Set sleep target hours."""
-    settings = db.query(SleepSettings).first()
+    settings = await db.scalar(select(SleepSettings).limit(1))
     if not settings:
         settings = SleepSettings(target_hours=target.target_hours)
         db.add(settings)
     else:
         settings.target_hours = target.target_hours
-    db.commit()
-    db.refresh(settings)
+    await db.commit()
+    await db.refresh(settings)
     return TargetHours(target_hours=settings.target_hours)
 
 
 @router.get("/stats/weekly")
-async def weekly_stats(db: Session = Depends(get_db)):
+@cached("sleep")
+async def weekly_stats(db: AsyncSession = Depends(get_read_db)):
     """Get sleep stats for the last 7 days."""
     week_ago = date.today() - timedelta(days=7)
-    entries = (
-        db.query(SleepEntry)
-        .filter(SleepEntry.date >= week_ago)
+    entries = (await db.scalars(
+        select(SleepEntry)
+        .where(SleepEntry.date >= week_ago)
         .order_by(SleepEntry.date.desc())
-        .all()
-    )
+    )).all()
 
     if not entries:
         return {"entries": 0, "avg_duration": None, "avg_quality": None}
@@ -254,16 +263,17 @@ async def weekly_stats(db: Session = Depends(get_db)):
 
 # Parameterized routes MUST come after static routes
 @router.get("/{entry_date}", response_model=SleepResponse)
-async def get_sleep(entry_date: date, db: Session = Depends(get_db)):
-    entry = db.query(SleepEntry).filter(SleepEntry.date == entry_date).first()
+async def get_sleep(entry_date: date, db: AsyncSession = Depends(get_read_db)):
+    entry = await db.scalar(select(SleepEntry).where(SleepEntry.date == entry_date))
     if not entry:
         raise HTTPException(status_code=404, detail="Sleep entry not found")
     return entry
 
 
 @router.patch("/{entry_date}", response_model=SleepResponse)
-async def update_sleep(entry_date: date, update: SleepUpdate, db: Session = Depends(get_db)):
-    entry = db.query(SleepEntry).filter(SleepEntry.date == entry_date).first()
+@invalidates("sleep")
+async def update_sleep(entry_date: date, update: SleepUpdate, db: AsyncSession = Depends(get_db)):
+    entry = await db.scalar(select(SleepEntry).where(SleepEntry.date == entry_date))
     if not entry:
         raise HTTPException(status_code=404, detail="Sleep entry not found")
 
@@ -276,6 +286,6 @@ async def update_sleep(entry_date: date, update: SleepUpdate, db: Session = Depe
         delta = entry.wake_time - entry.bedtime
         entry.duration_hours = round(delta.total_seconds() / 3600, 2)
 
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
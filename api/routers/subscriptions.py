@@ -3,13 +3,17 @@
 from datetime import datetime, date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from database import get_db
+from cache import cached, invalidates
+from database import get_db, get_read_db
+from etags import versioned
 from models import Subscription
+from pagination import Page, PageParams, DateRange, paginate
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(Subscription))])
 
 
 # Pydantic models
@@ -56,8 +60,9 @@ class SubscriptionStats(BaseModel):
 
 # Endpoints
 @router.get("/stats", response_model=SubscriptionStats)
-async def get_stats(db: Session = Depends(get_db)):
-    active_subs = db.query(Subscription).filter(Subscription.active == True).all()
+@cached("subscriptions")
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
+    active_subs = (await db.scalars(select(Subscription).where(Subscription.active == True))).all()
 
     monthly_total = 0.0
     for sub in active_subs:
@@ -72,16 +77,15 @@ async def get_stats(db: Session = Depends(get_db)):
 
     # Upcoming renewals (within 30 days)
     thirty_days = date.today() + timedelta(days=30)
-    upcoming = (
-        db.query(Subscription)
-        .filter(
+    upcoming = (await db.scalars(
+        select(Subscription)
+        .where(
             Subscription.active == True,
             Subscription.next_renewal <= thirty_days,
             Subscription.next_renewal >= date.today(),
         )
         .order_by(Subscription.next_renewal)
-        .all()
-    )
+    )).all()
 
     return SubscriptionStats(
         monthly_total=round(monthly_total, 2),
@@ -92,28 +96,33 @@ async def get_stats(db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=SubscriptionResponse, status_code=201)
-async def create_subscription(sub: SubscriptionCreate, db: Session = Depends(get_db)):
+@invalidates("subscriptions")
+async def create_subscription(sub: SubscriptionCreate, db: AsyncSession = Depends(get_db)):
     db_sub = Subscription(**sub.model_dump())
     db.add(db_sub)
-    db.commit()
-    db.refresh(db_sub)
+    await db.commit()
+    await db.refresh(db_sub)
     return db_sub
 
 
-@router.get("/", response_model=list[SubscriptionResponse])
+@router.get("/", response_model=Page[SubscriptionResponse])
 async def list_subscriptions(
     active: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    renewal: DateRange = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Subscription)
+    """Alphabetical; from/to bound the next renewal date."""
+    query = renewal.apply(select(Subscription), Subscription.next_renewal)
     if active is not None:
-        query = query.filter(Subscription.active == active)
-    return query.order_by(Subscription.name).all()
+        query = query.where(Subscription.active == active)
+    return await paginate(db, query, Subscription, [("name", False), ("id", False)], page)
 
 
 @router.put("/{sub_id}", response_model=SubscriptionResponse)
-async def update_subscription(sub_id: int, update: SubscriptionUpdate, db: Session = Depends(get_db)):
-    sub = db.query(Subscription).filter(Subscription.id == sub_id).first()
+@invalidates("subscriptions")
+async def update_subscription(sub_id: int, update: SubscriptionUpdate, db: AsyncSession = Depends(get_db)):
+    sub = await db.get(Subscription, sub_id)
     if not sub:
         raise HTTPException(status_code=404, detail="Subscription not found")
 
@@ -121,15 +130,16 @@ async def update_subscription(sub_id: int, update: SubscriptionUpdate, db: Sessi
     for key, value in update_data.items():
         setattr(sub, key, value)
 
-    db.commit()
-    db.refresh(sub)
+    await db.commit()
+    await db.refresh(sub)
     return sub
 
 
 @router.delete("/{sub_id}", status_code=204)
-async def delete_subscription(sub_id: int, db: Session = Depends(get_db)):
-    sub = db.query(Subscription).filter(Subscription.id == sub_id).first()
+@invalidates("subscriptions")
+async def delete_subscription(sub_id: int, db: AsyncSession = Depends(get_db)):
+    sub = await db.get(Subscription, sub_id)
     if not sub:
         raise HTTPException(status_code=404, detail="Subscription not found")
-    db.delete(sub)
-    db.commit()
+    await db.delete(sub)
+    await db.commit()
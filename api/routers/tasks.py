@@ -2,14 +2,17 @@
 
 from datetime import datetime, date
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_db, get_read_db
+from etags import versioned
 from models import Task
+from pagination import Page, PageParams, DateRange, paginate
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(versioned(Task))])
 
 
 class TaskCreate(BaseModel):
@@ -49,54 +52,57 @@ class TaskResponse(BaseModel):
 
 
 @router.get("/overdue", response_model=list[TaskResponse])
-async def list_overdue_tasks(db: Session = Depends(get_db)):
+async def list_overdue_tasks(db: AsyncSession = Depends(get_read_db)):
     """Get all tasks that are overdue (due_date < today and status != done)."""
     today = date.today()
-    return (
-        db.query(Task)
-        .filter(Task.due_date < today, Task.status != "done")
+    result = await db.scalars(
+        select(Task)
+        .where(Task.is_open, Task.due_date < today)
         .order_by(Task.due_date.asc())
-        .all()
     )
+    return result.all()
 
 
-@router.get("/", response_model=list[TaskResponse])
+@router.get("/", response_model=Page[TaskResponse])
 async def list_tasks(
-    status: Optional[str] = None,
+    status: Optional[list[str]] = Query(None),  # repeat for several, e.g. todo + in_progress
     priority: Optional[str] = None,
     due_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    created: DateRange = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Task)
+    """Newest first; from/to bound the creation date."""
+    query = created.apply(select(Task), Task.created_at)
     if status:
-        query = query.filter(Task.status == status)
+        query = query.where(Task.status.in_(status))
     if priority:
-        query = query.filter(Task.priority == priority)
+        query = query.where(Task.priority == priority)
     if due_date:
-        query = query.filter(Task.due_date == due_date)
-    return query.order_by(Task.created_at.desc()).all()
+        query = query.where(Task.due_date == due_date)
+    return await paginate(db, query, Task, [("created_at", True), ("id", True)], page)
 
 
 @router.post("/", response_model=TaskResponse, status_code=201)
-async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_db)):
     db_task = Task(**task.model_dump())
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
     return db_task
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+async def get_task(task_id: int, db: AsyncSession = Depends(get_read_db)):
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
-async def update_task(task_id: int, update: TaskUpdate, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+async def update_task(task_id: int, update: TaskUpdate, db: AsyncSession = Depends(get_db)):
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -111,15 +117,15 @@ async def update_task(task_id: int, update: TaskUpdate, db: Session = Depends(ge
     for key, value in update_data.items():
         setattr(task, key, value)
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     return task
 
 
 @router.delete("/{task_id}", status_code=204)
-async def delete_task(task_id: int, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)):
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
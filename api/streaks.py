@@ -0,0 +1,75 @@
+"""Streak queries — consecutive-day runs computed in SQL (gaps and islands).
+
+Consecutive dates minus their row number within a partition are constant, so
+grouping on that difference yields one row per unbroken run ("island").
+Callers fold the islands into current/longest streaks without ever loading
+the full date history into Python.
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import select, func
+from sqlalchemy.sql import Select
+
+from sqlfuncs import day_number
+
+
+def islands(days: Select) -> Select:
+    """Group a ``(key, day)`` select into runs of consecutive days.
+
+    ``days`` must yield each (key, day) pair at most once. The result has one
+    row per run: ``key, start, end, length``.
+    """
+    d = days.subquery()
+    key, day = d.c[0], d.c[1]
+    numbered = select(
+        key.label("key"),
+        day.label("day"),
+        (day_number(day) - func.row_number().over(partition_by=key, order_by=day)).label("grp"),
+    ).subquery()
+    return select(
+        numbered.c.key,
+        func.min(numbered.c.day).label("start"),
+        func.max(numbered.c.day).label("end"),
+        func.count().label("length"),
+    ).group_by(numbered.c.key, numbered.c.grp)
+
+
+def summarize_islands(rows, keys, today: Optional[date] = None) -> dict:
+    """Reduce island rows to each key's latest run and longest run.
+
+    The latest run is the most recent one that started on or before today;
+    runs made only of future-dated logs never count as current.
+    """
+    today = today or date.today()
+    runs = {k: _empty_run() for k in keys}
+    for key, start, end, length in rows:
+        run = runs.setdefault(key, _empty_run())
+        run["longest_streak"] = max(run["longest_streak"], length)
+        if start <= today and (run["run_start"] is None or start > run["run_start"]):
+            run.update(run_start=start, last_completed=end, run_length=length)
+    return runs
+
+
+def current_streak(run_start: Optional[date], last_completed: Optional[date],
+                   today: Optional[date] = None) -> int:
+    """Length of a run that is still alive, i.e. logged today or yesterday."""
+    today = today or date.today()
+    if last_completed is None or last_completed < today - timedelta(days=1):
+        return 0
+    return (min(last_completed, today) - run_start).days + 1
+
+
+def fold_islands(rows, keys, today: Optional[date] = None) -> dict:
+    """Reduce island rows into ``{key: {"current_streak", "longest_streak"}}``."""
+    return {
+        key: {
+            "current_streak": current_streak(run["run_start"], run["last_completed"], today),
+            "longest_streak": run["longest_streak"],
+        }
+        for key, run in summarize_islands(rows, keys, today).items()
+    }
+
+
+def _empty_run() -> dict:
+    return {"run_start": None, "last_completed": None, "run_length": 0, "longest_streak": 0}
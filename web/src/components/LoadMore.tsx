@@ -0,0 +1,29 @@
+interface LoadMoreProps {
+  hasMore: boolean
+  loading: boolean
+  onClick: () => void
+}
+
+export default function LoadMore({ hasMore, loading, onClick }: LoadMoreProps) {
+  if (!hasMore) return null
+  return (
+    <button
+      onClick={onClick}
+      disabled={loading}
+      style={{
+        display: 'block',
+        margin: '12px auto 0',
+        padding: '8px 16px',
+        borderRadius: '8px',
+        border: '1px solid #1a1a24',
+        backgroundColor: 'transparent',
+        color: '#94949e',
+        cursor: loading ? 'default' : 'pointer',
+        fontSize: '12px',
+        opacity: loading ? 0.6 : 1,
+      }}
+    >
+      {loading ? 'Loading...' : 'Load more'}
+    </button>
+  )
+}
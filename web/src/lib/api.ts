@@ -12,10 +12,30 @@ async function request<T>(path: string, options?: RequestInit): Promise<T> {
   return res.json()
 }
 
+// Keyset pagination shared by list endpoints: `cursor` is the previous page's next_cursor
+export interface PageQuery {
+  limit?: number
+  cursor?: string
+  from?: string
+  to?: string
+}
+
+function withPage(params: URLSearchParams, page: PageQuery = {}) {
+  if (page.limit) params.append('limit', String(page.limit))
+  if (page.cursor) params.append('cursor', page.cursor)
+  if (page.from) params.append('from', page.from)
+  if (page.to) params.append('to', page.to)
+  const query = params.toString()
+  return query ? `?${query}` : ''
+}
+
 // Tasks
 export const tasks = {
-  list: (status?: string) =>
-    request<import('../types').Task[]>(`/tasks/${status ? `?status=${status}` : ''}`),
+  list: (statuses?: string[], page?: PageQuery) => {
+    const params = new URLSearchParams()
+    statuses?.forEach(status => params.append('status', status))
+    return request<import('../types').Page<import('../types').Task>>(`/tasks/${withPage(params, page)}`)
+  },
   create: (data: Partial<import('../types').Task>) =>
     request<import('../types').Task>('/tasks/', { method: 'POST', body: JSON.stringify(data) }),
   update: (id: number, data: Partial<import('../types').Task>) =>
@@ -60,13 +80,23 @@ export const daily = {
 
 // Inventory
 export const inventory = {
-  list: (status?: string, category?: string, tag?: string) => {
+  list: (filters: {
+    status?: string
+    category?: string
+    tags?: string[]
+    tagMode?: 'all' | 'any'
+    limit?: number
+    cursor?: string
+  } = {}) => {
     const params = new URLSearchParams()
-    if (status) params.append('status', status)
-    if (category) params.append('category', category)
-    if (tag) params.append('tag', tag)
+    if (filters.status) params.append('status', filters.status)
+    if (filters.category) params.append('category', filters.category)
+    filters.tags?.forEach(tag => params.append('tag', tag))
+    if (filters.tagMode) params.append('tag_mode', filters.tagMode)
+    if (filters.limit) params.append('limit', String(filters.limit))
+    if (filters.cursor) params.append('cursor', filters.cursor)
     const query = params.toString()
-    return request<import('../types').InventoryItem[]>(`/inventory/${query ? `?${query}` : ''}`)
+    return request<import('../types').Page<import('../types').InventoryItem>>(`/inventory/${query ? `?${query}` : ''}`)
   },
   create: (data: Partial<import('../types').InventoryItem>) =>
     request<import('../types').InventoryItem>('/inventory/', { method: 'POST', body: JSON.stringify(data) }),
@@ -76,6 +106,8 @@ export const inventory = {
     request<void>(`/inventory/${id}`, { method: 'DELETE' }),
   stats: () =>
     request<import('../types').InventoryStats>('/inventory/stats'),
+  tags: (status?: string) =>
+    request<import('../types').InventoryTagCount[]>(`/inventory/tags${status ? `?status=${status}` : ''}`),
   categories: () =>
     request<import('../types').InventoryCategory[]>('/inventory/categories'),
   createCategory: (data: { name: string; color?: string }) =>
@@ -102,11 +134,10 @@ export const settings = {
 export const nutrition = {
   logMeal: (data: Record<string, unknown>) =>
     request<import('../types').MealEntry>('/nutrition/', { method: 'POST', body: JSON.stringify(data) }),
-  getMeals: (date?: string) => {
+  getMeals: (date?: string, page?: PageQuery) => {
     const params = new URLSearchParams()
     if (date) params.append('date', date)
-    const query = params.toString()
-    return request<import('../types').MealEntry[]>(`/nutrition/${query ? `?${query}` : ''}`)
+    return request<import('../types').Page<import('../types').MealEntry>>(`/nutrition/${withPage(params, page)}`)
   },
   getDailyTotals: (date?: string) => {
     const params = new URLSearchParams()
@@ -154,12 +185,19 @@ export const fitness = {
 export const finance = {
   createTransaction: (data: Record<string, unknown>) =>
     request<import('../types').FinanceTransaction>('/finance/transactions', { method: 'POST', body: JSON.stringify(data) }),
-  listTransactions: (month?: string, category?: string) => {
+  listTransactions: (month?: string, category?: string, page?: PageQuery) => {
     const params = new URLSearchParams()
     if (month) params.append('month', month)
     if (category) params.append('category', category)
-    const query = params.toString()
-    return request<import('../types').FinanceTransaction[]>(`/finance/transactions${query ? `?${query}` : ''}`)
+    return request<import('../types').Page<import('../types').FinanceTransaction>>(`/finance/transactions${withPage(params, page)}`)
+  },
+  importTransactions: (file: File | Blob, options: Record<string, string> = {}) => {
+    const query = new URLSearchParams(options).toString()
+    return request<import('../types').FinanceImportResult>(`/finance/transactions/import${query ? `?${query}` : ''}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'text/csv' },
+      body: file,
+    })
   },
   deleteTransaction: (id: number) =>
     request<void>(`/finance/transactions/${id}`, { method: 'DELETE' }),
@@ -185,12 +223,11 @@ export const finance = {
 export const goals = {
   create: (data: Record<string, unknown>) =>
     request<import('../types').Goal>('/goals/', { method: 'POST', body: JSON.stringify(data) }),
-  list: (status?: string, category?: string) => {
+  list: (status?: string, category?: string, page?: PageQuery) => {
     const params = new URLSearchParams()
     if (status) params.append('status', status)
     if (category) params.append('category', category)
-    const query = params.toString()
-    return request<import('../types').Goal[]>(`/goals/${query ? `?${query}` : ''}`)
+    return request<import('../types').Page<import('../types').Goal>>(`/goals/${withPage(params, page)}`)
   },
   get: (id: number) =>
     request<import('../types').GoalWithMilestones>(`/goals/${id}`),
@@ -212,11 +249,10 @@ export const goals = {
 export const subscriptions = {
   create: (data: Record<string, unknown>) =>
     request<import('../types').Subscription>('/subscriptions/', { method: 'POST', body: JSON.stringify(data) }),
-  list: (active?: boolean) => {
+  list: (active?: boolean, page?: PageQuery) => {
     const params = new URLSearchParams()
     if (active !== undefined) params.append('active', String(active))
-    const query = params.toString()
-    return request<import('../types').Subscription[]>(`/subscriptions/${query ? `?${query}` : ''}`)
+    return request<import('../types').Page<import('../types').Subscription>>(`/subscriptions/${withPage(params, page)}`)
   },
   update: (id: number, data: Record<string, unknown>) =>
     request<import('../types').Subscription>(`/subscriptions/${id}`, { method: 'PUT', body: JSON.stringify(data) }),
@@ -245,8 +281,27 @@ export const habits = {
     request<import('../types').HabitLog>(`/habits/${id}/log`, { method: 'POST', body: JSON.stringify(data) }),
   streak: (id: number) =>
     request<import('../types').HabitStreak>(`/habits/${id}/streak`),
+  streaks: (active?: boolean) =>
+    request<import('../types').HabitStreak[]>(`/habits/streaks${active !== undefined ? `?active=${active}` : ''}`),
   heatmap: () =>
     request<import('../types').HeatmapData[]>('/habits/heatmap'),
   stats: () =>
     request<import('../types').HabitStats>('/habits/stats'),
 }
+
+// Overview (dashboard, single request)
+export const overview = {
+  get: () =>
+    request<import('../types').Overview>('/overview/'),
+}
+
+// Search
+export type SearchModule = 'tasks' | 'journal' | 'nutrition' | 'inventory' | 'finance'
+
+export const search = {
+  query: (q: string, modules?: SearchModule[], limit = 20) => {
+    const params = new URLSearchParams({ q, limit: String(limit) })
+    modules?.forEach(m => params.append('module', m))
+    return request<import('../types').SearchResult[]>(`/search/?${params}`)
+  },
+}
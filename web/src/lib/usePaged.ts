@@ -0,0 +1,39 @@
+import { useEffect, useState } from 'react'
+import type { Page } from '../types'
+
+/**
+ * Keyset-paginated list state. Loads the first page whenever `deps` change;
+ * `loadMore` appends the next page, `reload` starts over (e.g. after a write).
+ */
+export function usePaged<T>(fetchPage: (cursor?: string) => Promise<Page<T>>, deps: unknown[] = []) {
+  const [items, setItems] = useState<T[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+
+  const reload = async () => {
+    try {
+      const page = await fetchPage()
+      setItems(page.items)
+      setNextCursor(page.next_cursor)
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return
+    setLoadingMore(true)
+    try {
+      const page = await fetchPage(nextCursor)
+      setItems(prev => [...prev, ...page.items])
+      setNextCursor(page.next_cursor)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  useEffect(() => { reload() }, deps)
+
+  return { items, setItems, loading, loadingMore, hasMore: nextCursor !== null, loadMore, reload }
+}
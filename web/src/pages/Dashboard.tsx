@@ -2,29 +2,30 @@ import { useEffect, useState } from 'react'
 import { format, addDays, isToday, isPast, parseISO, startOfDay } from 'date-fns'
 import Card from '../components/Card'
 import StatCard from '../components/StatCard'
-import { tasks, sleep, daily, habits } from '../lib/api'
-import type { Task, WeeklySleepStats, DailyNote, Habit, HabitStats, SleepChartData } from '../types'
+import { tasks, habits, overview } from '../lib/api'
+import type { Task, DailyNote, OverviewSleep, OverviewHabit } from '../types'
 
 export default function Dashboard() {
   const [taskList, setTaskList] = useState<Task[]>([])
-  const [sleepStats, setSleepStats] = useState<WeeklySleepStats | null>(null)
-  const [sleepChartData, setSleepChartData] = useState<SleepChartData[]>([])
+  const [sleepStats, setSleepStats] = useState<OverviewSleep | null>(null)
   const [todayNote, setTodayNote] = useState<DailyNote | null>(null)
-  const [habitList, setHabitList] = useState<Habit[]>([])
-  const [habitStats, setHabitStats] = useState<HabitStats | null>(null)
+  const [habitList, setHabitList] = useState<OverviewHabit[]>([])
+  const [habitRate, setHabitRate] = useState<number | null>(null)
   const [loading, setLoading] = useState(true)
   const [newTaskTitle, setNewTaskTitle] = useState('')
   const [addingTask, setAddingTask] = useState(false)
 
   const loadData = () => {
-    Promise.allSettled([
-      tasks.list().then(setTaskList),
-      sleep.weeklyStats().then(setSleepStats),
-      sleep.chartData(7).then(setSleepChartData),
-      daily.today().then(setTodayNote),
-      habits.list(undefined, true).then(setHabitList),
-      habits.stats().then(setHabitStats),
-    ]).finally(() => setLoading(false))
+    overview.get()
+      .then(data => {
+        setTaskList(data.tasks?.items ?? [])
+        setSleepStats(data.sleep ?? null)
+        setTodayNote(data.journal ?? null)
+        setHabitList(data.habits?.items ?? [])
+        setHabitRate(data.habits?.completion_rate_7d ?? null)
+      })
+      .catch(err => console.error('Failed to load overview:', err))
+      .finally(() => setLoading(false))
   }
 
   useEffect(() => {
@@ -96,7 +97,7 @@ export default function Dashboard() {
   })
 
   // Sleep sparkline data (last 7 days)
-  const sparklineData = sleepChartData.slice(-7).map(d => d.duration)
+  const sparklineData = (sleepStats?.entries ?? []).slice(0, 7).reverse().map(d => d.duration_hours ?? 0)
   const maxSleep = Math.max(...sparklineData, 10)
   const minSleep = Math.min(...sparklineData.filter(d => d > 0), 0)
 
@@ -152,7 +153,7 @@ export default function Dashboard() {
         />
         <StatCard
           label="Sleep Avg"
-          value={sleepStats?.avg_duration ? `${sleepStats.avg_duration}h` : '--'}
+          value={sleepStats?.score.avg_duration ? `${sleepStats.score.avg_duration}h` : '--'}
           subtitle="Last 7 days"
           accent="#6d5ed6"
         />
@@ -282,10 +283,10 @@ export default function Dashboard() {
         </Card>
 
         {/* Last Night's Sleep + Sparkline */}
-        <Card title="Sleep" subtitle={sleepStats?.avg_quality ? `Quality avg: ${sleepStats.avg_quality}/5` : undefined}>
+        <Card title="Sleep" subtitle={sleepStats?.score.avg_quality ? `Quality avg: ${sleepStats.score.avg_quality}/5` : undefined}>
           <div style={{ display: 'flex', flexDirection: 'column', gap: '16px' }}>
             {/* Last night summary */}
-            {sleepStats?.data?.[0] ? (
+            {sleepStats?.entries?.[0] ? (
               <div style={{
                 display: 'flex', alignItems: 'center', justifyContent: 'space-between',
                 padding: '12px 16px', borderRadius: '8px', backgroundColor: '#0f0f13',
@@ -295,7 +296,7 @@ export default function Dashboard() {
                     Last Night
                   </div>
                   <div style={{ fontSize: '24px', fontWeight: 600, color: '#f0f0f2', marginTop: '4px' }}>
-                    {sleepStats.data[0].duration_hours || '--'}h
+                    {sleepStats.entries[0].duration_hours || '--'}h
                   </div>
                 </div>
                 <div style={{ textAlign: 'right' }}>
@@ -303,7 +304,7 @@ export default function Dashboard() {
                     Quality
                   </div>
                   <div style={{ fontSize: '24px', fontWeight: 600, color: '#f0f0f2', marginTop: '4px' }}>
-                    {sleepStats.data[0].quality || '--'}/5
+                    {sleepStats.entries[0].quality || '--'}/5
                   </div>
                 </div>
               </div>
@@ -370,7 +371,7 @@ export default function Dashboard() {
           )}
 
           {/* Habit Completion Rate */}
-          {habitStats && habitStats.completion_rate_7d >= 0 && (
+          {habitRate !== null && (
             <div style={{ marginTop: '16px' }}>
               <div style={{ fontSize: '11px', color: '#5a5a66', textTransform: 'uppercase', letterSpacing: '0.04em', marginBottom: '8px' }}>
                 Habit Completion (7 days)
@@ -381,15 +382,15 @@ export default function Dashboard() {
                 }}>
                   <div style={{
                     height: '100%',
-                    width: `${Math.min(habitStats.completion_rate_7d, 100)}%`,
-                    backgroundColor: habitStats.completion_rate_7d >= 80 ? '#4ade80' :
-                                    habitStats.completion_rate_7d >= 50 ? '#fbbf24' : '#f87171',
+                    width: `${Math.min(habitRate, 100)}%`,
+                    backgroundColor: habitRate >= 80 ? '#4ade80' :
+                                    habitRate >= 50 ? '#fbbf24' : '#f87171',
                     borderRadius: '4px',
                     transition: 'width 0.3s ease',
                   }} />
                 </div>
                 <span style={{ fontSize: '14px', fontWeight: 600, color: '#f0f0f2', minWidth: '40px', textAlign: 'right' }}>
-                  {Math.round(habitStats.completion_rate_7d)}%
+                  {Math.round(habitRate)}%
                 </span>
               </div>
             </div>
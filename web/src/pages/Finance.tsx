@@ -2,14 +2,15 @@ import { useEffect, useState } from 'react'
 import { format } from 'date-fns'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
 import Card from '../components/Card'
+import LoadMore from '../components/LoadMore'
 import StatCard from '../components/StatCard'
 import { finance as financeApi } from '../lib/api'
-import type { FinanceTransaction, FinanceBudget, FinanceSummary, FinanceTrend } from '../types'
+import { usePaged } from '../lib/usePaged'
+import type { FinanceBudget, FinanceSummary, FinanceTrend } from '../types'
 
 const CATEGORIES = ['Food', 'Transport', 'Entertainment', 'Shopping', 'Bills', 'Health', 'Other'] as const
 
 export default function Finance() {
-  const [transactions, setTransactions] = useState<FinanceTransaction[]>([])
   const [summary, setSummary] = useState<FinanceSummary | null>(null)
   const [trends, setTrends] = useState<FinanceTrend[]>([])
   const [budgets, setBudgets] = useState<FinanceBudget[]>([])
@@ -18,6 +19,10 @@ export default function Finance() {
   // Current month for filtering
   const [currentMonth, setCurrentMonth] = useState(format(new Date(), 'yyyy-MM'))
   const [filterCategory, setFilterCategory] = useState('')
+  const transactions = usePaged(
+    cursor => financeApi.listTransactions(currentMonth, filterCategory || undefined, { cursor }),
+    [currentMonth, filterCategory],
+  )
 
   // Transaction form state
   const [txDate, setTxDate] = useState(format(new Date(), 'yyyy-MM-dd'))
@@ -34,13 +39,11 @@ export default function Finance() {
 
   const fetchData = async () => {
     try {
-      const [txList, summaryData, trendsData, budgetList] = await Promise.all([
-        financeApi.listTransactions(currentMonth, filterCategory || undefined),
+      const [summaryData, trendsData, budgetList] = await Promise.all([
         financeApi.getSummary(currentMonth),
         financeApi.getTrends(6),
         financeApi.listBudgets(),
       ])
-      setTransactions(txList)
       setSummary(summaryData)
       setTrends(trendsData)
       setBudgets(budgetList)
@@ -51,7 +54,12 @@ export default function Finance() {
     }
   }
 
-  useEffect(() => { fetchData() }, [currentMonth, filterCategory])
+  useEffect(() => { fetchData() }, [currentMonth])
+
+  const refresh = () => {
+    transactions.reload()
+    fetchData()
+  }
 
   const handleCreateTransaction = async () => {
     const amount = parseFloat(txAmount)
@@ -70,7 +78,7 @@ export default function Finance() {
       setTxDate(format(new Date(), 'yyyy-MM-dd'))
       setTxCategory('Food')
       setTxType('expense')
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to create transaction:', err)
     } finally {
@@ -81,7 +89,7 @@ export default function Finance() {
   const handleDeleteTransaction = async (id: number) => {
     try {
       await financeApi.deleteTransaction(id)
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to delete transaction:', err)
     }
@@ -173,7 +181,7 @@ export default function Finance() {
     ? Math.max(...categoryBreakdown.map(([, v]) => v))
     : 0
 
-  if (loading) {
+  if (loading || transactions.loading) {
     return (
       <div style={{ display: 'flex', alignItems: 'center', justifyContent: 'center', height: '60vh' }}>
         <span style={{ fontSize: '13px', color: '#5a5a66' }}>Loading</span>
@@ -334,13 +342,13 @@ export default function Finance() {
         </div>
 
         {/* Transaction rows */}
-        {transactions.length === 0 ? (
+        {transactions.items.length === 0 ? (
           <p style={{ fontSize: '13px', color: '#5a5a66', padding: '12px 0' }}>
             No transactions for this period.
           </p>
         ) : (
           <div style={{ display: 'flex', flexDirection: 'column', gap: '4px' }}>
-            {[...transactions]
+            {[...transactions.items]
               .sort((a, b) => b.date.localeCompare(a.date))
               .map(tx => (
                 <div
@@ -407,6 +415,7 @@ export default function Finance() {
                   </button>
                 </div>
               ))}
+            <LoadMore hasMore={transactions.hasMore} loading={transactions.loadingMore} onClick={transactions.loadMore} />
           </div>
         )}
       </Card>
@@ -1,8 +1,10 @@
-import { useEffect, useState, useMemo } from 'react'
+import { useEffect, useState } from 'react'
 import { format } from 'date-fns'
 import Card from '../components/Card'
+import LoadMore from '../components/LoadMore'
 import StatCard from '../components/StatCard'
 import { goals as goalsApi } from '../lib/api'
+import { usePaged } from '../lib/usePaged'
 import type { Goal, GoalWithMilestones, GoalStats, Milestone } from '../types'
 
 const CATEGORIES = ['all', 'health', 'career', 'personal', 'financial'] as const
@@ -16,10 +18,13 @@ const categoryColors: Record<string, string> = {
 }
 
 export default function Goals() {
-  const [goalList, setGoalList] = useState<Goal[]>([])
   const [stats, setStats] = useState<GoalStats | null>(null)
   const [loading, setLoading] = useState(true)
   const [activeCategory, setActiveCategory] = useState<CategoryFilter>('all')
+  const goals = usePaged(
+    cursor => goalsApi.list(undefined, activeCategory === 'all' ? undefined : activeCategory, { cursor }),
+    [activeCategory],
+  )
   const [expandedGoalId, setExpandedGoalId] = useState<number | null>(null)
   const [expandedGoal, setExpandedGoal] = useState<GoalWithMilestones | null>(null)
 
@@ -32,12 +37,7 @@ export default function Goals() {
 
   const fetchData = async () => {
     try {
-      const [goals, statsData] = await Promise.all([
-        goalsApi.list(),
-        goalsApi.getStats(),
-      ])
-      setGoalList(goals)
-      setStats(statsData)
+      setStats(await goalsApi.getStats())
     } catch (err) {
       console.error('Failed to fetch goals data:', err)
     } finally {
@@ -47,10 +47,10 @@ export default function Goals() {
 
   useEffect(() => { fetchData() }, [])
 
-  const filteredGoals = useMemo(() => {
-    if (activeCategory === 'all') return goalList
-    return goalList.filter(g => g.category === activeCategory)
-  }, [goalList, activeCategory])
+  const refresh = () => {
+    goals.reload()
+    fetchData()
+  }
 
   const handleCreate = async () => {
     if (!newTitle.trim()) return
@@ -68,7 +68,7 @@ export default function Goals() {
       setNewDescription('')
       setNewCategory('health')
       setNewTargetDate('')
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to create goal:', err)
     } finally {
@@ -96,7 +96,7 @@ export default function Goals() {
       await goalsApi.delete(goalId)
       setExpandedGoalId(null)
       setExpandedGoal(null)
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to delete goal:', err)
     }
@@ -105,7 +105,7 @@ export default function Goals() {
   const handleProgressUpdate = async (goalId: number, progress: number) => {
     try {
       await goalsApi.update(goalId, { progress_pct: progress })
-      fetchData()
+      refresh()
       if (expandedGoal && expandedGoal.id === goalId) {
         setExpandedGoal({ ...expandedGoal, progress_pct: progress })
       }
@@ -119,7 +119,7 @@ export default function Goals() {
       await goalsApi.updateMilestone(goalId, milestone.id, { completed: !milestone.completed })
       const full = await goalsApi.get(goalId)
       setExpandedGoal(full)
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to toggle milestone:', err)
     }
@@ -185,7 +185,7 @@ export default function Goals() {
     paddingRight: '36px',
   }
 
-  if (loading) {
+  if (loading || goals.loading) {
     return (
       <div style={{ display: 'flex', alignItems: 'center', justifyContent: 'center', height: '60vh' }}>
         <span style={{ fontSize: '13px', color: '#5a5a66' }}>Loading</span>
@@ -299,13 +299,13 @@ export default function Goals() {
 
       {/* Goal List */}
       <Card title="Your Goals">
-        {filteredGoals.length === 0 ? (
+        {goals.items.length === 0 ? (
           <p style={{ fontSize: '13px', color: '#5a5a66', padding: '12px 0' }}>
             {activeCategory === 'all' ? 'No goals yet. Create one above.' : `No ${activeCategory} goals.`}
           </p>
         ) : (
           <div style={{ display: 'flex', flexDirection: 'column', gap: '4px' }}>
-            {filteredGoals.map(goal => (
+            {goals.items.map(goal => (
               <GoalRow
                 key={goal.id}
                 goal={goal}
@@ -319,6 +319,7 @@ export default function Goals() {
                 onDeleteMilestone={(mid) => handleDeleteMilestone(goal.id, mid)}
               />
             ))}
+            <LoadMore hasMore={goals.hasMore} loading={goals.loadingMore} onClick={goals.loadMore} />
           </div>
         )}
       </Card>
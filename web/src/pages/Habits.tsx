@@ -29,23 +29,19 @@ export default function Habits() {
 
   const fetchData = async () => {
     try {
-      const [habitsList, statsData, heatmap] = await Promise.all([
+      const [habitsList, statsData, heatmap, streaks] = await Promise.all([
         habitsApi.list(undefined, true),
         habitsApi.stats(),
         habitsApi.heatmap(),
+        habitsApi.streaks(true),
       ])
 
-      // Fetch streaks for each habit
-      const habitsWithStreaks = await Promise.all(
-        habitsList.map(async (habit) => {
-          try {
-            const streak = await habitsApi.streak(habit.id)
-            return { ...habit, streak }
-          } catch {
-            return { ...habit, streak: { current_streak: 0, longest_streak: 0 } }
-          }
-        })
-      )
+      // Attach streaks from the bulk endpoint
+      const streakById = new Map(streaks.map(s => [s.habit_id, s]))
+      const habitsWithStreaks = habitsList.map(habit => ({
+        ...habit,
+        streak: streakById.get(habit.id) ?? { habit_id: habit.id, current_streak: 0, longest_streak: 0 },
+      }))
 
       setHabitList(habitsWithStreaks)
       setStats(statsData)
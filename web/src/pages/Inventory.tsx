@@ -1,14 +1,15 @@
 import { useEffect, useState } from 'react'
 import { Plus, X, Edit2, Package } from 'lucide-react'
 import Card from '../components/Card'
+import LoadMore from '../components/LoadMore'
 import StatCard from '../components/StatCard'
 import { inventory as inventoryApi } from '../lib/api'
+import { usePaged } from '../lib/usePaged'
 import type { InventoryItem, InventoryCategory, InventoryStats } from '../types'
 
 type TabType = 'owned' | 'wishlist' | 'ai_suggested'
 
 export default function Inventory() {
-  const [items, setItems] = useState<InventoryItem[]>([])
   const [categories, setCategories] = useState<InventoryCategory[]>([])
   const [stats, setStats] = useState<InventoryStats | null>(null)
   const [loading, setLoading] = useState(true)
@@ -17,6 +18,10 @@ export default function Inventory() {
   const [editingItem, setEditingItem] = useState<InventoryItem | null>(null)
   const [searchQuery, setSearchQuery] = useState('')
   const [categoryFilter, setCategoryFilter] = useState('')
+  const items = usePaged(
+    cursor => inventoryApi.list({ status: activeTab, category: categoryFilter || undefined, cursor }),
+    [activeTab, categoryFilter],
+  )
 
   // Form state
   const [formData, setFormData] = useState({
@@ -33,12 +38,10 @@ export default function Inventory() {
 
   const fetchData = async () => {
     try {
-      const [itemsData, categoriesData, statsData] = await Promise.all([
-        inventoryApi.list(),
+      const [categoriesData, statsData] = await Promise.all([
         inventoryApi.categories(),
         inventoryApi.stats(),
       ])
-      setItems(itemsData)
       setCategories(categoriesData)
       setStats(statsData)
     } finally {
@@ -50,6 +53,11 @@ export default function Inventory() {
     fetchData()
   }, [])
 
+  const refresh = () => {
+    items.reload()
+    fetchData()
+  }
+
   const handleSubmit = async () => {
     if (!formData.name.trim()) return
 
@@ -84,7 +92,7 @@ export default function Inventory() {
       ai_reason: '',
       tags: '',
     })
-    fetchData()
+    refresh()
   }
 
   const handleEdit = (item: InventoryItem) => {
@@ -106,7 +114,7 @@ export default function Inventory() {
   const handleDelete = async (id: number) => {
     if (!confirm('Delete this item?')) return
     await inventoryApi.delete(id)
-    fetchData()
+    refresh()
   }
 
   const handleCancelForm = () => {
@@ -125,18 +133,10 @@ export default function Inventory() {
     })
   }
 
-  // Filter items
-  const filteredItems = items
-    .filter(item => item.status === activeTab)
-    .filter(item => {
-      if (searchQuery && !item.name.toLowerCase().includes(searchQuery.toLowerCase())) {
-        return false
-      }
-      if (categoryFilter && item.category !== categoryFilter) {
-        return false
-      }
-      return true
-    })
+  // Status and category are filtered server-side; search applies to loaded pages
+  const filteredItems = items.items.filter(
+    item => !searchQuery || item.name.toLowerCase().includes(searchQuery.toLowerCase())
+  )
 
   const inputStyle: React.CSSProperties = {
     padding: '10px 14px',
@@ -358,7 +358,7 @@ export default function Inventory() {
 
       {/* Items List */}
       <Card>
-        {loading ? (
+        {loading || items.loading ? (
           <p style={{ fontSize: '13px', color: '#5a5a66', padding: '20px 0', textAlign: 'center' }}>
             Loading...
           </p>
@@ -477,6 +477,7 @@ export default function Inventory() {
                 </div>
               </div>
             ))}
+            <LoadMore hasMore={items.hasMore} loading={items.loadingMore} onClick={items.loadMore} />
           </div>
         )}
       </Card>
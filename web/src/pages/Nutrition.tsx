@@ -30,13 +30,13 @@ export default function Nutrition() {
   const fetchData = async () => {
     try {
       const [mealsData, totalsData, trendsData, waterData] = await Promise.allSettled([
-        nutritionApi.getMeals(today),
+        nutritionApi.getMeals(today, { limit: 200 }),
         nutritionApi.getDailyTotals(today),
         nutritionApi.getTrends(chartDays),
         nutritionApi.getWater(today),
       ])
 
-      if (mealsData.status === 'fulfilled') setMeals(mealsData.value)
+      if (mealsData.status === 'fulfilled') setMeals(mealsData.value.items)
       if (totalsData.status === 'fulfilled') setTotals(totalsData.value)
       if (trendsData.status === 'fulfilled') setTrends(trendsData.value)
       if (waterData.status === 'fulfilled') setWater(waterData.value)
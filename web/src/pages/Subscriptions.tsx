@@ -1,8 +1,10 @@
 import { useEffect, useState } from 'react'
 import { format } from 'date-fns'
 import Card from '../components/Card'
+import LoadMore from '../components/LoadMore'
 import StatCard from '../components/StatCard'
 import { subscriptions as subsApi } from '../lib/api'
+import { usePaged } from '../lib/usePaged'
 import type { Subscription, SubscriptionStats } from '../types'
 
 const CYCLE_SHORT: Record<string, string> = {
@@ -16,7 +18,7 @@ function daysUntil(dateStr: string): number {
 }
 
 export default function Subscriptions() {
-  const [subsList, setSubsList] = useState<Subscription[]>([])
+  const subs = usePaged(cursor => subsApi.list(true, { cursor }))
   const [stats, setStats] = useState<SubscriptionStats | null>(null)
   const [loading, setLoading] = useState(true)
 
@@ -30,12 +32,7 @@ export default function Subscriptions() {
 
   const fetchData = async () => {
     try {
-      const [list, statsData] = await Promise.all([
-        subsApi.list(true),
-        subsApi.getStats(),
-      ])
-      setSubsList(list)
-      setStats(statsData)
+      setStats(await subsApi.getStats())
     } catch (err) {
       console.error('Failed to fetch subscriptions data:', err)
     } finally {
@@ -45,6 +42,11 @@ export default function Subscriptions() {
 
   useEffect(() => { fetchData() }, [])
 
+  const refresh = () => {
+    subs.reload()
+    fetchData()
+  }
+
   const handleCreate = async () => {
     if (!newName.trim() || !newCost) return
     setCreating(true)
@@ -62,7 +64,7 @@ export default function Subscriptions() {
       setNewCycle('monthly')
       setNewRenewal('')
       setNewCategory('')
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to create subscription:', err)
     } finally {
@@ -73,7 +75,7 @@ export default function Subscriptions() {
   const handleToggleActive = async (sub: Subscription) => {
     try {
       await subsApi.update(sub.id, { active: !sub.active })
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to toggle subscription:', err)
     }
@@ -82,7 +84,7 @@ export default function Subscriptions() {
   const handleDelete = async (id: number) => {
     try {
       await subsApi.delete(id)
-      fetchData()
+      refresh()
     } catch (err) {
       console.error('Failed to delete subscription:', err)
     }
@@ -119,7 +121,7 @@ export default function Subscriptions() {
     paddingRight: '36px',
   }
 
-  if (loading) {
+  if (loading || subs.loading) {
     return (
       <div style={{ display: 'flex', alignItems: 'center', justifyContent: 'center', height: '60vh' }}>
         <span style={{ fontSize: '13px', color: '#5a5a66' }}>Loading</span>
@@ -218,13 +220,13 @@ export default function Subscriptions() {
 
       {/* Active Subscriptions */}
       <Card title="Active Subscriptions">
-        {subsList.length === 0 ? (
+        {subs.items.length === 0 ? (
           <p style={{ fontSize: '13px', color: '#5a5a66', padding: '12px 0' }}>
             No subscriptions yet. Add one above.
           </p>
         ) : (
           <div style={{ display: 'flex', flexDirection: 'column', gap: '4px' }}>
-            {subsList.map(sub => (
+            {subs.items.map(sub => (
               <div
                 key={sub.id}
                 style={{
@@ -304,6 +306,7 @@ export default function Subscriptions() {
                 </button>
               </div>
             ))}
+            <LoadMore hasMore={subs.hasMore} loading={subs.loadingMore} onClick={subs.loadMore} />
           </div>
         )}
       </Card>
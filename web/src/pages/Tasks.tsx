@@ -1,12 +1,14 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import { Plus, X, Check, RefreshCw } from 'lucide-react'
 import Card from '../components/Card'
+import LoadMore from '../components/LoadMore'
 import { tasks as tasksApi } from '../lib/api'
+import { usePaged } from '../lib/usePaged'
 import type { Task } from '../types'
 
 export default function Tasks() {
-  const [taskList, setTaskList] = useState<Task[]>([])
-  const [loading, setLoading] = useState(true)
+  const active = usePaged(cursor => tasksApi.list(['todo', 'in_progress'], { cursor }))
+  const done = usePaged(cursor => tasksApi.list(['done'], { cursor, limit: 10 }))
   const [newTask, setNewTask] = useState('')
   const [newPriority, setNewPriority] = useState<string>('medium')
   const [newDueDate, setNewDueDate] = useState('')
@@ -14,11 +16,10 @@ export default function Tasks() {
   const [newRecurring, setNewRecurring] = useState<string>('none')
 
   const fetchTasks = () => {
-    tasksApi.list().then(setTaskList).finally(() => setLoading(false))
+    active.reload()
+    done.reload()
   }
 
-  useEffect(() => { fetchTasks() }, [])
-
   const handleAdd = async () => {
     if (!newTask.trim()) return
     await tasksApi.create({
@@ -59,7 +60,7 @@ export default function Tasks() {
     low: 3,
   }
 
-  const sortedTasks = [...taskList].sort((a, b) => {
+  const byPriority = (a: Task, b: Task) => {
     // First sort by priority
     const priorityDiff = priorityOrder[a.priority] - priorityOrder[b.priority]
     if (priorityDiff !== 0) return priorityDiff
@@ -71,10 +72,11 @@ export default function Tasks() {
     if (a.due_date && !b.due_date) return -1
     if (!a.due_date && b.due_date) return 1
     return 0
-  })
+  }
 
-  const activeTasks = sortedTasks.filter(t => t.status !== 'done')
-  const doneTasks = sortedTasks.filter(t => t.status === 'done')
+  // Sorted within the pages loaded so far; the server pages newest first
+  const activeTasks = [...active.items].sort(byPriority)
+  const doneTasks = done.items
 
   const priorityColor: Record<string, string> = {
     urgent: '#f87171', high: '#fbbf24', medium: '#8b7cf6', low: '#33333f',
@@ -124,7 +126,7 @@ export default function Tasks() {
       <div>
         <h1 style={{ fontSize: '22px', fontWeight: 600, color: '#f0f0f2', letterSpacing: '-0.02em' }}>Tasks</h1>
         <p style={{ fontSize: '13px', color: '#5a5a66', marginTop: '4px' }}>
-          {activeTasks.length} active / {doneTasks.length} done
+          {activeTasks.length}{active.hasMore ? '+' : ''} active / {doneTasks.length}{done.hasMore ? '+' : ''} done
         </p>
       </div>
 
@@ -178,7 +180,7 @@ export default function Tasks() {
 
       {/* Active */}
       <Card title="Active">
-        {loading ? (
+        {active.loading ? (
           <p style={{ fontSize: '13px', color: '#5a5a66', padding: '12px 0' }}>Loading</p>
         ) : activeTasks.length === 0 ? (
           <p style={{ fontSize: '13px', color: '#5a5a66', padding: '12px 0' }}>All clear</p>
@@ -264,6 +266,7 @@ export default function Tasks() {
                 </button>
               </div>
             ))}
+            <LoadMore hasMore={active.hasMore} loading={active.loadingMore} onClick={active.loadMore} />
           </div>
         )}
       </Card>
@@ -272,7 +275,7 @@ export default function Tasks() {
       {doneTasks.length > 0 && (
         <Card title="Completed">
           <div style={{ display: 'flex', flexDirection: 'column', gap: '4px' }}>
-            {doneTasks.slice(0, 10).map(task => (
+            {doneTasks.map(task => (
               <div key={task.id} style={{
                 display: 'flex', alignItems: 'center', gap: '12px',
                 padding: '8px 12px', borderRadius: '8px', backgroundColor: '#0f0f13', opacity: 0.5,
@@ -342,6 +345,7 @@ export default function Tasks() {
                 )}
               </div>
             ))}
+            <LoadMore hasMore={done.hasMore} loading={done.loadingMore} onClick={done.loadMore} />
           </div>
         </Card>
       )}
@@ -1,3 +1,9 @@
+// Keyset-paginated list; pass next_cursor back as `cursor` for the following page
+export interface Page<T> {
+  items: T[]
+  next_cursor: string | null
+}
+
 export interface Task {
   id: number
   title: string
@@ -71,7 +77,14 @@ export interface InventoryStats {
   wishlist_count: number
   ai_suggested_count: number
   total_wishlist_value: number | null
+  total_owned_value: number | null
   categories_used: number
+  by_category: Record<string, number>
+}
+
+export interface InventoryTagCount {
+  tag: string
+  count: number
 }
 
 export interface Habit {
@@ -94,6 +107,7 @@ export interface HabitLog {
 }
 
 export interface HabitStreak {
+  habit_id: number
   current_streak: number
   longest_streak: number
 }
@@ -207,10 +221,18 @@ export interface WorkoutTemplate {
   exercises_json: string
 }
 
+export interface PeriodCount {
+  period: string
+  count: number
+}
+
 export interface FitnessStats {
   total_workouts: number
   this_week: number
   streak: number
+  longest_streak: number
+  weekly: PeriodCount[]
+  monthly: PeriodCount[]
 }
 
 export interface ExerciseHistory {
@@ -231,6 +253,13 @@ export interface FinanceTransaction {
   created_at: string
 }
 
+export interface FinanceImportResult {
+  rows: number
+  imported: number
+  duplicates: number
+  errors: string[]
+}
+
 export interface FinanceBudget {
   id: number
   category: string
@@ -249,6 +278,7 @@ export interface FinanceTrend {
   month: string
   income: number
   expenses: number
+  by_category: Record<string, number>
 }
 
 // Goals
@@ -304,3 +334,57 @@ export interface SubscriptionStats {
   count: number
   upcoming_renewals: Subscription[]
 }
+
+// Overview
+export interface OverviewTasks {
+  items: Task[]
+  overdue_count: number
+  completed_today: number
+}
+
+export interface OverviewSleep {
+  score: SleepScore
+  entries: SleepEntry[]
+}
+
+export interface OverviewHabit {
+  id: number
+  name: string
+  category: string | null
+  icon: string | null
+  target_frequency: string | null
+  completed_today: boolean
+  current_streak: number
+  longest_streak: number
+}
+
+export interface OverviewHabits {
+  items: OverviewHabit[]
+  completion_rate_7d: number | null
+}
+
+export interface OverviewNutrition {
+  water_glasses: number
+  water_target: number
+  totals: DailyTotals
+}
+
+export interface Overview {
+  date: string
+  enabled_modules: string[]
+  tasks: OverviewTasks | null
+  sleep: OverviewSleep | null
+  journal: DailyNote | null
+  habits: OverviewHabits | null
+  nutrition: OverviewNutrition | null
+}
+
+// Search
+export interface SearchResult {
+  module: 'tasks' | 'journal' | 'nutrition' | 'inventory' | 'finance'
+  id: number
+  date: string | null
+  title: string | null
+  snippet: string // matched terms wrapped in <mark></mark>; escape the rest before rendering
+  score: number
+}